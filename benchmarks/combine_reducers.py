@@ -0,0 +1,55 @@
+# times UI only actions (that leave the saved state alone) followed by the
+# selectors on the saved state, and counts how many times the saved state
+# changed identity, which is what the selector caches are keyed on. Run with:
+#
+#   poetry run python benchmarks/combine_reducers.py [ASSETS=10000]
+import sys
+from dataclasses import replace
+from datetime import datetime
+from decimal import Decimal
+from time import perf_counter
+from uuid import uuid1
+
+from urwid_assets.lib.redux.list_reducer import EntityList
+from urwid_assets.lib.redux.reducer import Action, INIT_ACTION
+from urwid_assets.lib.redux.store import Store
+from urwid_assets.selectors.selectors import select_assets, select_symbols, select_snapshots, select_rates, \
+    select_assets_with_rates, select_saved
+from urwid_assets.state.saved.assets.assets import Asset
+from urwid_assets.state.saved.snapshots.snapshots import Snapshot, SnapshotAsset
+from urwid_assets.state.saved.symbols.symbols import Symbol
+from urwid_assets.state.state import reducer
+from urwid_assets.state.ui.ui import SET_LAST_UPDATE_TIME, SET_TIMESTAMP
+
+_REPEATS = 200
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    symbols = EntityList(Symbol(uuid=uuid1(), name=u'S%d' % index) for index in range(10))
+    assets = EntityList(Asset(uuid=uuid1(), name=u'A%d' % index, amount=Decimal(index),
+                              symbol=symbols[index % len(symbols)].uuid) for index in range(count))
+    snapshots = EntityList(Snapshot(uuid=uuid1(), name=u'S%d' % index, timestamp=None,
+                                    assets=EntityList(SnapshotAsset(uuid=uuid1(), name=u'x', amount=Decimal(1),
+                                                                    rate=Decimal(2)) for _ in range(10)))
+                           for index in range(count // 10))
+    state = reducer(None, INIT_ACTION)
+    state = replace(state, saved=replace(state.saved, symbols=symbols, assets=assets, snapshots=snapshots))
+    store = Store(reducer, state)
+    selectors = (select_assets, select_symbols, select_snapshots, select_rates, select_assets_with_rates)
+    for selector in selectors:
+        selector(store.get_state())
+    saved = set()
+    start = perf_counter()
+    for repeat in range(_REPEATS):
+        store.dispatch(Action(SET_TIMESTAMP if repeat % 2 else SET_LAST_UPDATE_TIME, datetime.now()))
+        saved.add(id(select_saved(store.get_state())))
+        for selector in selectors:
+            selector(store.get_state())
+    elapsed = perf_counter() - start
+    print('%d assets: %.3f ms per UI only action including the selectors, %d saved state(s) over %d actions' % (
+        count, elapsed / _REPEATS * 1e3, len(saved), _REPEATS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# compares updating the conversion matrix, which repairs the shortest path
+# trees one changed edge at a time, with building a new matrix from
+# scratch. First as the rates are loaded one by one, then for single
+# changes to a large graph. Run with:
+#
+#   poetry run python benchmarks/conversion_matrix.py
+from decimal import Decimal
+from random import Random
+from time import perf_counter
+from uuid import UUID
+
+from urwid_assets.lib.dijkstra.conversion_matrix import ConversionMatrix
+from urwid_assets.lib.dijkstra.dijkstra import Edge
+
+_UNIT = Decimal(1)
+_CHANGES = 20
+
+
+def _create_rates(random: Random, symbols: int, rates: int) -> tuple[list[UUID], tuple[Edge | None, ...]]:
+    uuids = [UUID(int=random.getrandbits(128)) for _ in range(symbols)]
+    return uuids, tuple(Edge(source=random.choice(uuids),
+                             target=random.choice(uuids),
+                             cost=random.randint(1, 5),
+                             ref=Decimal(str(round(random.uniform(0.01, 100), 6))))
+                        for _ in range(rates))
+
+
+def _load(rates: tuple[Edge | None, ...], target: UUID, incremental: bool) -> float:
+    edges: list[Edge | None] = [None] * len(rates)
+    matrix = ConversionMatrix(tuple(edges), _UNIT)
+    matrix.get_factors(target)
+    start = perf_counter()
+    for key in Random(2).sample(range(len(rates)), len(rates)):
+        edges[key] = rates[key]
+        if incremental:
+            matrix = matrix.update(tuple(edges))
+        else:
+            matrix = ConversionMatrix(tuple(edges), _UNIT)
+        matrix.get_factors(target)
+    return perf_counter() - start
+
+
+def _change(random: Random, rate: Edge, kind: str) -> Edge | None:
+    if kind == 'rate':
+        return Edge(source=rate.source, target=rate.target, cost=rate.cost, ref=rate.ref * Decimal('1.01'))
+    if kind == 'cost':
+        return Edge(source=rate.source, target=rate.target, cost=random.randint(1, 5), ref=rate.ref)
+    return None
+
+
+def main() -> None:
+    random = Random(1)
+    uuids, rates = _create_rates(random, 300, 1000)
+    print('loading %d rates over %d symbols one at a time' % (len(rates), len(uuids)))
+    print('  from scratch %8.0f ms' % (_load(rates, uuids[0], False) * 1e3))
+    print('  incremental  %8.0f ms' % (_load(rates, uuids[0], True) * 1e3))
+    uuids, rates = _create_rates(random, 10000, 50000)
+    start = perf_counter()
+    matrix = ConversionMatrix(rates, _UNIT)
+    matrix.get_factors(uuids[0])
+    print('single changes with %d symbols and %d rates' % (len(uuids), len(rates)))
+    print('  from scratch %8.1f ms' % ((perf_counter() - start) * 1e3))
+    for kind in ('rate', 'cost', 'removal'):
+        elapsed = 0.0
+        for _ in range(_CHANGES):
+            key = random.choice([key for key, rate in enumerate(rates) if rate is not None])
+            edges = list(rates)
+            edges[key] = _change(random, rates[key], kind)
+            rates = tuple(edges)
+            start = perf_counter()
+            matrix = matrix.update(rates)
+            matrix.get_factors(uuids[0])
+            elapsed += perf_counter() - start
+        print('  %-12s %8.1f ms' % (kind, elapsed / _CHANGES * 1e3))
+
+
+if __name__ == '__main__':
+    main()
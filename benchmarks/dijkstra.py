@@ -0,0 +1,34 @@
+# times building the shortest path tree from a target symbol, which runs
+# Dijkstra over the heap queue, for growing random rate graphs. The time
+# per edge should only grow with log V. Run with:
+#
+#   poetry run python benchmarks/dijkstra.py
+from random import Random
+from time import perf_counter
+
+from urwid_assets.lib.dijkstra.dijkstra import Edge
+from urwid_assets.lib.dijkstra.shortest_path_tree import Graph, ShortestPathTree
+
+_SIZES = ((1000, 5000), (10000, 50000), (50000, 250000))
+_REPEATS = 5
+
+
+def main() -> None:
+    random = Random(1)
+    print('%8s %8s %12s %16s' % ('symbols', 'edges', 'ms per tree', 'us per edge'))
+    for symbols, edges in _SIZES:
+        graph = Graph()
+        for key in range(edges):
+            graph.add(key, Edge(source=random.randrange(symbols),
+                                target=random.randrange(symbols),
+                                cost=random.randint(1, 5),
+                                ref=key))
+        start = perf_counter()
+        for repeat in range(_REPEATS):
+            ShortestPathTree(graph, repeat)
+        elapsed = (perf_counter() - start) / _REPEATS
+        print('%8d %8d %12.1f %16.2f' % (symbols, edges, elapsed * 1e3, elapsed / edges * 1e6))
+
+
+if __name__ == '__main__':
+    main()
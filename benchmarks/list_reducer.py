@@ -0,0 +1,87 @@
+# times uuid lookups and the list reducer helpers on entity lists against the
+# same lookups and edits made to plain tuples (as the helpers used to), run with:
+#
+#   poetry run python benchmarks/list_reducer.py
+from time import perf_counter
+from typing import Callable
+from uuid import uuid1
+
+from urwid_assets.lib.redux.list_reducer import ListItem, EntityList, append_item, replace_item, move_item_up, \
+    remove_item
+
+_SIZES = (1000, 10000, 100000)
+_REPEATS = 200
+
+
+def _get_index(items: tuple[ListItem, ...], item: ListItem) -> int:
+    for index, other in enumerate(items):
+        if other.uuid == item.uuid:
+            return index
+
+
+def _append_to_tuple(item: ListItem, items: tuple[ListItem, ...]) -> tuple[ListItem, ...]:
+    return items + (item,)
+
+
+def _replace_in_tuple(item: ListItem, items: tuple[ListItem, ...]) -> tuple[ListItem, ...]:
+    index = _get_index(items, item)
+    return items[:index] + (item,) + items[index + 1:]
+
+
+def _move_up_in_tuple(item: ListItem, items: tuple[ListItem, ...]) -> tuple[ListItem, ...]:
+    index = _get_index(items, item)
+    if index == 0:
+        return items
+    return items[:index - 1] + (item, items[index - 1]) + items[index + 1:]
+
+
+def _remove_from_tuple(item: ListItem, items: tuple[ListItem, ...]) -> tuple[ListItem, ...]:
+    index = _get_index(items, item)
+    return items[:index] + items[index + 1:]
+
+
+def _get_from_tuple(item: ListItem, items: tuple[ListItem, ...]) -> tuple[ListItem, ...]:
+    assert items[_get_index(items, item)] is item
+    return items
+
+
+def _get_from_entity_list(item: ListItem, items: EntityList[ListItem]) -> EntityList[ListItem]:
+    assert items.get_item(item.uuid) is item
+    return items
+
+
+def _time(edit: Callable, items, pick: Callable[[int], ListItem]) -> float:
+    start = perf_counter()
+    for repeat in range(_REPEATS):
+        items = edit(pick(repeat), items)
+    return (perf_counter() - start) / _REPEATS
+
+
+def main() -> None:
+    print('microseconds per call, averaged over %d calls' % _REPEATS)
+    print('%-8s %7s %10s %10s %10s %10s %10s' % ('', 'items', 'get', 'append', 'replace', 'move up', 'remove'))
+    for size in _SIZES:
+        items = tuple(ListItem(uuid1()) for _ in range(size))
+        entity_list = EntityList(items)
+        # build the uuid index up front, as the first lookup would
+        entity_list.get_index(items[0].uuid)
+
+        def pick(repeat: int) -> ListItem:
+            return items[(repeat * 7919) % size]
+
+        def pick_new(_: int) -> ListItem:
+            return ListItem(uuid1())
+
+        for name, sequence, edits in (
+                ('tuple', items, (_get_from_tuple, _append_to_tuple, _replace_in_tuple, _move_up_in_tuple,
+                                  _remove_from_tuple)),
+                ('entity', entity_list, (_get_from_entity_list, append_item, replace_item, move_item_up,
+                                         remove_item)),
+        ):
+            times = tuple(_time(edit, sequence, pick_new if index == 1 else pick)
+                          for index, edit in enumerate(edits))
+            print('%-8s %7d %10.1f %10.1f %10.1f %10.1f %10.1f' % ((name, size) + tuple(time * 1e6 for time in times)))
+
+
+if __name__ == '__main__':
+    main()
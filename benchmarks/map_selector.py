@@ -0,0 +1,55 @@
+# times selectors that map over their first argument, which take the fast
+# path, against the same selection through the general arguments tree (by
+# mapping over the second argument instead). Run with:
+#
+#   poetry run python benchmarks/map_selector.py
+from time import perf_counter
+
+from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions
+
+_SIZES = (100, 10000)
+_REPEATS = 20
+
+
+class _Item:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
+def _select(item: _Item, offset: int) -> int:
+    return item.value + offset
+
+
+def _time(selector, state) -> tuple[float, float]:
+    items, offset = state
+    # all miss: the unmapped argument changes so every item is recomputed
+    start = perf_counter()
+    for repeat in range(_REPEATS):
+        selector((items, repeat))
+    cold = (perf_counter() - start) / _REPEATS
+    # one changed: a new list with one new item, the rest hit the level 2 cache
+    start = perf_counter()
+    for repeat in range(_REPEATS):
+        items = items[:-1] + (_Item(repeat),)
+        selector((items, offset))
+    warm = (perf_counter() - start) / _REPEATS
+    return cold, warm
+
+
+def main() -> None:
+    print('milliseconds per computation')
+    print('%7s %8s %10s %12s' % ('items', 'path', 'all miss', 'one changed'))
+    for size in _SIZES:
+        items = tuple(_Item(index) for index in range(size))
+        select_map = create_selector((lambda state: state[0], lambda state: state[1]), _select,
+                                     SelectorOptions(dimensions=(1,)))
+        select_tree = create_selector((lambda state: state[1], lambda state: state[0]),
+                                      lambda offset, item: _select(item, offset),
+                                      SelectorOptions(dimensions=(0, 1)))
+        for name, selector in (('map', select_map), ('tree', select_tree)):
+            cold, warm = _time(selector, (items, -1))
+            print('%7d %8s %10.2f %12.2f' % (size, name, cold * 1e3, warm * 1e3))
+
+
+if __name__ == '__main__':
+    main()
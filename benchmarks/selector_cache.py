@@ -0,0 +1,55 @@
+# times selector cache lookups keyed by the identities of the arguments
+# against lookups keyed by their values as the number of snapshots grows.
+# Each lookup follows an edit to one snapshot, so keying by value has to
+# hash the new snapshots list all the way down. Run with:
+#
+#   poetry run python benchmarks/selector_cache.py
+from dataclasses import replace
+from decimal import Decimal
+from time import perf_counter
+from uuid import uuid1
+
+from urwid_assets.lib.redux.list_reducer import EntityList
+from urwid_assets.lib.redux.reducer import INIT_ACTION, Action
+from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions, SelectorCacheOptions
+from urwid_assets.selectors.selectors import select_saved
+from urwid_assets.state.saved.snapshots.snapshots import Snapshot, SnapshotAsset, UPDATE_SNAPSHOT
+from urwid_assets.state.state import reducer
+
+_SIZES = (100, 1000, 10000)
+_REPEATS = 100
+
+
+def _select_snapshots_count(saved) -> int:
+    return len(saved.snapshots)
+
+
+def main() -> None:
+    print('microseconds per lookup after an edit')
+    print('%10s %10s %10s' % ('snapshots', 'identity', 'value'))
+    for size in _SIZES:
+        snapshots = EntityList(Snapshot(uuid=uuid1(), name=u'S%d' % index, timestamp=None,
+                                        assets=EntityList(SnapshotAsset(uuid=uuid1(), name=u'A', amount=Decimal(index),
+                                                                        rate=Decimal(1)) for _ in range(10)))
+                               for index in range(size))
+        state = reducer(None, INIT_ACTION)
+        state = replace(state, saved=replace(state.saved, snapshots=snapshots))
+        times = []
+        for identity in (True, False):
+            selector = create_selector((select_saved,), _select_snapshots_count,
+                                       SelectorOptions(cache=SelectorCacheOptions(identity=identity)))
+            edited = state
+            selector(edited)
+            elapsed = 0.0
+            for repeat in range(_REPEATS):
+                snapshot = snapshots[repeat]
+                edited = reducer(edited, Action(UPDATE_SNAPSHOT, replace(snapshot, name=u'S%d' % repeat)))
+                start = perf_counter()
+                selector(edited)
+                elapsed += perf_counter() - start
+            times.append(elapsed / _REPEATS)
+        print('%10d %10.1f %10.1f' % ((size,) + tuple(time * 1e6 for time in times)))
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ from urwid_assets.cli.import_ import import_
 from urwid_assets.cli.ui import ui
 from urwid_assets.data_sources.crypto_compare.crypto_compare import CryptoCompare
 from urwid_assets.data_sources.tiingo.tiingo import Tiingo
+from urwid_assets.lib.redux.reselect import set_selector_cache_budget
 
 _DOT_FOLDER = '.urwid-assets'
 _DATA_FILE = 'data'
@@ -21,6 +22,8 @@ _DEFAULT_DATA_FILE: Path = Path.home() / _DOT_FOLDER / _DATA_FILE
 _DEFAULT_SALT_FILE: Path = Path.home() / _DOT_FOLDER / _SALT_FILE
 _DEFAULT_LOG_FILE: Path = Path.home() / _DOT_FOLDER / _LOG_FILE
 _DEFAULT_LOG_LEVEL: str = 'INFO'
+_DEFAULT_COALESCE_WINDOW: float = 0.0
+_DEFAULT_SELECTOR_CACHE_BUDGET: int = 16
 
 _LOG_LEVELS = ['CRITICAL', 'ERROR', 'WARNING', 'INFO', 'DEBUG']
 
@@ -63,21 +66,67 @@ def _setup_logger(log_level: str, log_file: Path) -> None:
 @click.option('-i', '--init-with-test-data',
               help=u'Initialise with test data',
               is_flag=True)
+@click.option('-w', '--coalesce-window',
+              help=u'Seconds over which to coalesce state change notifications, by default '
+                   u'notifications are coalesced until the next iteration of the event loop',
+              show_default=True,
+              type=click.FloatRange(min=0.0),
+              default=_DEFAULT_COALESCE_WINDOW)
+@click.option('-b', '--selector-cache-budget',
+              help=u'Approximate number of megabytes that the selector caches can use to hold '
+                   u'results for previous states, the least recently used results are evicted first',
+              show_default=True,
+              type=click.IntRange(min=0),
+              default=_DEFAULT_SELECTOR_CACHE_BUDGET)
+@click.option('-t', '--time-dispatch',
+              help=u'Record the time spent in reducers and subscribers for each action type, the '
+                   u'timings are logged on exit and can be logged from the log panel',
+              is_flag=True)
+@click.option('-r', '--profile-selectors',
+              help=u'Record the calls, cache hits and time spent in each selector, the profile '
+                   u'is logged on exit and can be logged from the log panel',
+              is_flag=True)
+@click.option('-g', '--push-selectors',
+              help=u'Push state changes through the graph of selectors so that only the selectors '
+                   u'downstream of a change are recomputed, rather than each view pulling its selectors',
+              is_flag=True)
+@click.option('-u', '--skip-unneeded-rates',
+              help=u'Only fetch the rates on the cheapest paths from the asset symbols to the target symbol, '
+                   u'the other rates are not loaded (refresh after changing the target symbol)',
+              is_flag=True)
 @click.pass_context
 def cli(ctx: click.Context,
         data_file: Path,
         salt_file: Path,
         log_file: Path,
         log_level: str,
-        init_with_test_data: bool) -> None:
+        init_with_test_data: bool,
+        coalesce_window: float,
+        selector_cache_budget: int,
+        time_dispatch: bool,
+        profile_selectors: bool,
+        push_selectors: bool,
+        skip_unneeded_rates: bool) -> None:
     _setup_logger(log_level, log_file)
     _LOGGER.info('data_file: %s', data_file)
     _LOGGER.info('salt_file: %s', salt_file)
     _LOGGER.info('init_with_test_data: %s', init_with_test_data)
+    _LOGGER.info('coalesce_window: %s', coalesce_window)
+    _LOGGER.info('selector_cache_budget: %s', selector_cache_budget)
+    set_selector_cache_budget(selector_cache_budget * 1024 * 1024)
+    _LOGGER.info('time_dispatch: %s', time_dispatch)
+    _LOGGER.info('profile_selectors: %s', profile_selectors)
+    _LOGGER.info('push_selectors: %s', push_selectors)
+    _LOGGER.info('skip_unneeded_rates: %s', skip_unneeded_rates)
     ctx.obj = CLIModule(
         salt_file=salt_file,
         data_file=data_file,
         init_with_test_data=init_with_test_data,
+        coalesce_window=coalesce_window,
+        time_dispatch=time_dispatch,
+        profile_selectors=profile_selectors,
+        push_selectors=push_selectors,
+        skip_unneeded_rates=skip_unneeded_rates,
         data_sources=(Tiingo(), CryptoCompare()),
     )
 
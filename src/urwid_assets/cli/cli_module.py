@@ -1,4 +1,5 @@
 from asyncio import AbstractEventLoop, get_event_loop
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from injector import Module, singleton, provider
@@ -7,19 +8,50 @@ from urwid_assets.cli.cli_types import SaltFile, DataFile
 from urwid_assets.data.data import INITIAL_STATE
 from urwid_assets.lib.data_sources.data_source import DataSource
 from urwid_assets.lib.data_sources.data_source_registry import DataSourceRegistry
-from urwid_assets.lib.redux.store import Store
+from urwid_assets.lib.redux.dispatch_timer import DispatchTimer
+from urwid_assets.lib.redux.history import History
+from urwid_assets.lib.redux.offload import Offloader
+from urwid_assets.lib.redux.reducer import Action
+from urwid_assets.lib.redux.reselect import set_selector_tracer
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
+from urwid_assets.lib.redux.selector_registry import SelectorRegistry
+from urwid_assets.lib.redux.store import Store, StoreOptions, CoalesceOptions
+from urwid_assets.selectors.selectors import select_saved
+from urwid_assets.state.saved.saved import SET_SAVED, Saved
 from urwid_assets.state.state import State, reducer
 
+# the undo history is bounded by the memory retained by the saved
+# states that it holds rather than the number of states
+_UNDO_BUDGET = 16 * 1024 * 1024
+
+# the offloaded selectors are mostly bound by the GIL so more
+# workers would not finish them any sooner
+_OFFLOAD_WORKERS = 1
+
+
+def _restore_saved(saved: Saved) -> Action:
+    return Action(SET_SAVED, saved)
+
 
 class CLIModule(Module):
     def __init__(self,
                  salt_file: Path,
                  data_file: Path,
                  init_with_test_data: bool,
+                 coalesce_window: float,
+                 time_dispatch: bool,
+                 profile_selectors: bool,
+                 push_selectors: bool,
+                 skip_unneeded_rates: bool,
                  data_sources: tuple[DataSource, ...]):
         self._salt_file = salt_file
         self._data_file = data_file
         self._init_with_test_data = init_with_test_data
+        self._coalesce_window = coalesce_window
+        self._time_dispatch = time_dispatch
+        self._profile_selectors = profile_selectors
+        self._push_selectors = push_selectors
+        self._skip_unneeded_rates = skip_unneeded_rates
         self._data_sources = data_sources
 
     @singleton
@@ -39,13 +71,60 @@ class CLIModule(Module):
 
     @singleton
     @provider
-    def provide_store(self) -> Store[State]:
-        return Store(reducer, INITIAL_STATE if self._init_with_test_data else None)
+    def provide_dispatch_timer(self) -> DispatchTimer:
+        return DispatchTimer()
+
+    @singleton
+    @provider
+    def provide_selector_registry(self) -> SelectorRegistry:
+        selector_registry = SelectorRegistry()
+        if self._profile_selectors:
+            # the selectors are created on import so they find
+            # the registry through a global rather than injection
+            set_selector_tracer(selector_registry)
+        return selector_registry
+
+    @singleton
+    @provider
+    def provide_offloader(self) -> Offloader:
+        # the offloader is only installed while the UI runs
+        return Offloader(ThreadPoolExecutor(max_workers=_OFFLOAD_WORKERS, thread_name_prefix='offload'))
+
+    @singleton
+    @provider
+    def provide_selector_graph(self) -> SelectorGraph:
+        return SelectorGraph()
+
+    @singleton
+    @provider
+    def provide_history(self) -> History:
+        # loading (or importing) saved state starts a new history
+        return History(select_saved, _restore_saved, _UNDO_BUDGET, barriers=(SET_SAVED,))
+
+    @singleton
+    @provider
+    def provide_store(self,
+                      loop: AbstractEventLoop,
+                      history: History,
+                      dispatch_timer: DispatchTimer,
+                      offloader: Offloader,
+                      selector_graph: SelectorGraph,
+                      _: SelectorRegistry) -> Store[State]:
+        # the selector registry is requested so that profiling
+        # starts before anything is selected from the state
+        return Store(reducer,
+                     INITIAL_STATE if self._init_with_test_data else None,
+                     StoreOptions(coalesce=CoalesceOptions(window=self._coalesce_window),
+                                  queue=True,
+                                  middleware=(history, offloader)
+                                             + ((dispatch_timer,) if self._time_dispatch else tuple())
+                                             + ((selector_graph,) if self._push_selectors else tuple())),
+                     loop)
 
     @singleton
     @provider
     def provide_data_source_registry(self, store: Store[State]) -> DataSourceRegistry:
-        data_source_registry = DataSourceRegistry(store)
+        data_source_registry = DataSourceRegistry(store, self._skip_unneeded_rates)
         for data_source in self._data_sources:
             data_source_registry.register(data_source)
         return data_source_registry
@@ -5,6 +5,8 @@ from injector import Injector
 
 from urwid_assets.cli.ui.ui_module import UIModule
 from urwid_assets.cli.ui.ui_types import ContentView, ShowLogPanel
+from urwid_assets.lib.redux.dispatch_timer import DispatchTimer
+from urwid_assets.lib.redux.selector_registry import SelectorRegistry
 from urwid_assets.ui.ui import UI
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,3 +22,7 @@ def ui(ctx: click.Context, show_log_panel: bool) -> None:
     cli_module = ctx.obj
     injector = Injector([cli_module, UIModule(show_log_panel)])
     injector.get(UI)
+    # nothing is logged unless the timer was enabled with --time-dispatch
+    injector.get(DispatchTimer).log_report()
+    # likewise nothing is logged unless --profile-selectors was given
+    injector.get(SelectorRegistry).log_report()
@@ -5,6 +5,7 @@ from uuid import uuid1
 
 from dateutil.relativedelta import relativedelta
 
+from urwid_assets.lib.redux.list_reducer import EntityList
 from urwid_assets.state.saved.snapshots.snapshots import SnapshotAsset, Snapshot
 
 
@@ -22,7 +23,7 @@ def _create_snapshot(index: int) -> Snapshot:
         uuid=uuid1(),
         name=u'Snapshot %s' % index,
         timestamp=datetime.now() - relativedelta(years=index),
-        assets=tuple(_create_asset_snapshot(index, asset_index) for asset_index in range(10)),
+        assets=EntityList(_create_asset_snapshot(index, asset_index) for asset_index in range(10)),
     )
 
 
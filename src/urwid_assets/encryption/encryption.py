@@ -8,6 +8,7 @@ from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from injector import singleton, inject
 
 from urwid_assets.cli.cli_types import SaltFile, DataFile
+from urwid_assets.lib.redux.equality import is_equal
 from urwid_assets.lib.redux.reducer import Action
 from urwid_assets.lib.redux.store import Store
 from urwid_assets.lib.serialization.serialization import serialize, deserialize
@@ -48,7 +49,8 @@ class Encryption:
     def init_passphrase(self, passphrase: str):
         self._set_passphrase(passphrase)
         self._decrypt()
-        self._store.subscribe(self._update)
+        # only persist when the saved state has actually changed
+        self._store.subscribe(self._update, select_saved, is_equal)
 
     def change_passphrase(self, passphrase: str):
         self._set_passphrase(passphrase)
@@ -2,7 +2,7 @@ import logging
 from asyncio import Task, TaskGroup, create_task
 from dataclasses import dataclass
 from datetime import datetime
-from uuid import uuid1
+from uuid import uuid1, UUID
 
 from injector import singleton, inject
 
@@ -11,7 +11,7 @@ from urwid_assets.lib.data_sources.models import QueryResult, Query
 from urwid_assets.lib.redux.reducer import Action
 from urwid_assets.lib.redux.store import Store
 from urwid_assets.selectors.selectors import select_timestamp, \
-    select_rates_by_data_source
+    select_rates_by_data_source, select_needed_rates, get_needed_rates
 from urwid_assets.state.saved.data_sources.data_sources import DataSourceInstance
 from urwid_assets.state.saved.rates.rates import Rate
 from urwid_assets.state.state import State
@@ -39,9 +39,13 @@ class Group:
 class DataSourceRegistry:
 
     @inject
-    def __init__(self, store: Store[State]):
+    def __init__(self, store: Store[State], skip_unneeded_rates: bool = False):
         self._data_sources: dict[str, DataSource] = {}
         self._store = store
+        # rates that are not on the cheapest path that loads from an asset's
+        # symbol to the target symbol are not fetched at all, so they are not
+        # loaded after the target symbol changes until the next refresh
+        self._skip_unneeded_rates = skip_unneeded_rates
 
     def register(self, data_source: DataSource) -> None:
         self._data_sources[data_source.get_name()] = data_source
@@ -55,22 +59,25 @@ class DataSourceRegistry:
         except KeyError:
             raise UnknownDataSource(name)
 
-    async def _set_loaded_rate(self, rate: Rate, task: Task[QueryResult]) -> None:
+    async def _set_loaded_rate(self, rate: Rate, task: Task[QueryResult], failed: set[UUID]) -> None:
         result = await task
         if result.error is None:
             new_loaded_rate = LoadedRate(uuid=rate.uuid, rate=result.price, error=None)
         else:
             new_loaded_rate = LoadedRate(uuid=rate.uuid, rate=None, error=result.error)
+            failed.add(rate.uuid)
         self._store.dispatch(Action(SET_LOADED_RATE, new_loaded_rate))
 
-    async def refresh_rates(self) -> None:
-        _LOGGER.info('refresh rates')
-        self._store.dispatch(Action(START_LOADING_RATES), Action(SET_LAST_UPDATE_TIME, datetime.now()))
-        groups = select_rates_by_data_source(self._store.get_state())
-        timestamp = select_timestamp(self._store.get_state())
+    async def _fetch_rates(self,
+                           groups: tuple[tuple[DataSourceInstance, tuple[Rate, ...]], ...],
+                           timestamp: datetime | None) -> set[UUID]:
+        # returns the rates that failed to load
+        failed: set[UUID] = set()
         async with TaskGroup() as data_source_queries:
             for group in groups:
                 data_source_instance, rates = group
+                if len(rates) == 0:
+                    continue
                 data_source = self._data_sources[data_source_instance.type]
                 aggregate = data_source.create_aggregate(
                     data_source_instance.config
@@ -79,9 +86,40 @@ class DataSourceRegistry:
                     data_source_instance.config
                 )
                 for rate in rates:
-                    create_task(self._set_loaded_rate(rate, create_task(aggregate.select(Query(
+                    data_source_queries.create_task(self._set_loaded_rate(rate, create_task(aggregate.select(Query(
                         uuid=uuid1(),
                         endpoint=rate.endpoint,
                         config=rate.config,
-                    )))))
+                    ))), failed))
                 data_source_queries.create_task(aggregate.run())
+        return failed
+
+    async def refresh_rates(self) -> None:
+        _LOGGER.info('refresh rates')
+        self._store.dispatch(Action(START_LOADING_RATES), Action(SET_LAST_UPDATE_TIME, datetime.now()))
+        groups = select_rates_by_data_source(self._store.get_state())
+        timestamp = select_timestamp(self._store.get_state())
+        needed_rates = select_needed_rates(self._store.get_state())
+        _LOGGER.info('%d of %d rates are needed to value the assets',
+                     len(needed_rates),
+                     sum(len(rates) for _, rates in groups))
+        if not self._skip_unneeded_rates:
+            # still a single batch for each data source but with the rates
+            # that are needed to value the assets at the front
+            await self._fetch_rates(tuple((data_source_instance,
+                                           tuple(sorted(rates, key=lambda rate: rate.uuid not in needed_rates)))
+                                          for data_source_instance, rates in groups), timestamp)
+            return
+        fetched: set[UUID] = set()
+        excluded: set[UUID] = set()
+        while len(needed_rates) > 0:
+            fetched |= needed_rates
+            failed = await self._fetch_rates(tuple((data_source_instance,
+                                                    tuple(rate for rate in rates if rate.uuid in needed_rates))
+                                                   for data_source_instance, rates in groups), timestamp)
+            if len(failed) == 0:
+                break
+            # plan again without the rates that failed, so that the assets
+            # they would have valued are valued along the next cheapest path
+            excluded |= failed
+            needed_rates = get_needed_rates(self._store.get_state(), frozenset(excluded)) - fetched
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import Generic, TypeVar, Iterable
+
+from urwid_assets.lib.dijkstra.dijkstra import Edge
+from urwid_assets.lib.dijkstra.shortest_path_tree import Graph, ShortestPathTree, Paths, is_same_path
+from urwid_assets.lib.dijkstra.vectorized import VectorizedGraph, is_available
+
+T = TypeVar('T')
+K = TypeVar('K')
+
+# beyond this many changed edges it is quicker to start again than
+# to repair the trees one edge at a time
+_MAX_CHANGES = 32
+
+# with at least this many edges new trees are built with numpy, if it is
+# installed, below this the arrays cost more to build than they save
+_VECTORIZE_THRESHOLD = 1000
+
+
+def _set_factors(factors: dict[K, T], tree: ShortestPathTree[K, T], nodes: Iterable[K], unit: T) -> None:
+    # NB. the tree has paths from the target out to every other key, so the
+    # rate of each step is inverted (this is ok as the shortest paths are
+    # symmetrical, i.e. the shortest path from a to b is the reverse of the
+    # shortest path from b to a).
+    # The nodes have to be given parents first so that each factor is a
+    # single multiplication
+    for node in nodes:
+        parent, edge = tree.get_parent(node)
+        factors[node] = factors[parent] * (edge.ref if edge.target == parent else unit / edge.ref)
+
+
+def _get_factors(tree: ShortestPathTree[K, T], unit: T) -> dict[K, T]:
+    source = tree.get_source()
+    factors = {source: unit}
+    _set_factors(factors, tree, tree.get_subtree(source)[1:], unit)
+    return factors
+
+
+def _update_factors(factors: dict[K, T], tree: ShortestPathTree[K, T], changed: set[K], unit: T) -> dict[K, T]:
+    # the factors dictionaries are shared so changes are made to a copy
+    factors = dict(factors)
+    roots = []
+    for node in changed:
+        if tree.get_distance(node) is None:
+            factors.pop(node, None)
+        else:
+            roots.append(node)
+    # the paths to the descendants of the changed nodes have also changed,
+    # ancestors are nearer the target so start with the nearest
+    updated: set[K] = set()
+    for root in sorted(roots, key=tree.get_distance):
+        if root not in updated:
+            subtree = tree.get_subtree(root)
+            updated.update(subtree)
+            _set_factors(factors, tree, subtree, unit)
+    return factors
+
+
+class ConversionMatrix(Generic[K, T]):
+    # the factors to convert from every reachable key to a target key,
+    # resolved the first time that each target is asked for and then kept
+    # for as long as the matrix, so a matrix should be created for each
+    # set of edges. The edges are keyed by their position and missing
+    # edges are None
+    def __init__(self, edges: tuple[Edge[K, T] | None, ...], unit: T) -> None:
+        self._edges = edges
+        self._unit = unit
+        self._graph: Graph[K, T] | None = None
+        self._vectorized: VectorizedGraph[K, T] | None = None
+        self._trees: dict[K, ShortestPathTree[K, T]] = {}
+        self._factors: dict[K, dict[K, T]] = {}
+
+    def get_factors(self, target: K) -> dict[K, T]:
+        try:
+            return self._factors[target]
+        except KeyError:
+            if self._graph is None:
+                # either new or its trees have been handed on to an update
+                self._graph = Graph()
+                self._trees = {}
+                for key, edge in enumerate(self._edges):
+                    if edge is not None:
+                        self._graph.add(key, edge)
+            tree = ShortestPathTree(self._graph, target, self._get_paths(target))
+            factors = _get_factors(tree, self._unit)
+            self._trees[target] = tree
+            self._factors[target] = factors
+            return factors
+
+    def _get_paths(self, target: K) -> Paths | None:
+        if len(self._edges) < _VECTORIZE_THRESHOLD or not is_available():
+            return None
+        if self._vectorized is None:
+            self._vectorized = VectorizedGraph(self._edges)
+        return self._vectorized.get_paths(target)
+
+    def get_factor(self, source: K, target: K) -> T | None:
+        return self.get_factors(target).get(source)
+
+    def _get_changes(self, edges: tuple[Edge[K, T] | None, ...]) -> tuple[int, ...]:
+        return tuple(key for key, (edge, other) in enumerate(zip(self._edges, edges))
+                     if edge is not other and edge != other)
+
+    def count_changes(self, edges: tuple[Edge[K, T] | None, ...]) -> int | None:
+        # the number of edges that would change, None if the edges are
+        # keyed differently and an update would have to start again
+        if len(edges) != len(self._edges):
+            return None
+        return len(self._get_changes(edges))
+
+    def update(self, edges: tuple[Edge[K, T] | None, ...]) -> ConversionMatrix[K, T]:
+        # creates a matrix for the new edges, if only a few edges have changed
+        # then the graph and trees are repaired and handed on to the new
+        # matrix. This matrix keeps the factors that it has but will have to
+        # start again for any other target
+        if self._graph is None or len(edges) != len(self._edges):
+            return ConversionMatrix(edges, self._unit)
+        changes = self._get_changes(edges)
+        if len(changes) > _MAX_CHANGES:
+            return ConversionMatrix(edges, self._unit)
+        graph = self._graph
+        trees = self._trees
+        self._graph = None
+        self._trees = {}
+        changed: dict[K, set[K]] = {target: set() for target in trees}
+        for key in changes:
+            edge = self._edges[key]
+            other = edges[key]
+            if edge is not None and other is not None and is_same_path(edge, other):
+                graph.replace(key, other)
+                for target, tree in trees.items():
+                    changed[target] |= tree.replaced(key)
+                continue
+            if edge is not None:
+                graph.remove(key)
+                for target, tree in trees.items():
+                    changed[target] |= tree.removed(key, edge)
+            if other is not None:
+                graph.add(key, other)
+                for target, tree in trees.items():
+                    changed[target] |= tree.added(key)
+        matrix = ConversionMatrix(edges, self._unit)
+        matrix._graph = graph
+        matrix._trees = trees
+        for target, tree in trees.items():
+            matrix._factors[target] = _update_factors(self._factors[target], tree, changed[target], self._unit)
+        return matrix
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from typing import Generic, TypeVar, Iterable, Hashable
+
+from urwid_assets.lib.dijkstra.dijkstra import Edge, Queue, QueueEntry
+
+T = TypeVar('T')
+K = TypeVar('K')
+
+# distances are compared by cost and then by the number of steps, and the
+# remaining ties are broken by the edge keys, so that the tree only depends
+# on the edges and not on the order in which they were added or removed.
+# This way a tree that is repaired after each change is always the same as
+# a tree that is built from scratch
+Distance = tuple[int | float, int]
+
+# the distance to each reachable node and the parent of each reachable
+# node (other than the source) with the key of the edge that connects them
+Paths = tuple[dict[K, Distance], dict[K, tuple[K, Hashable]]]
+
+_ZERO: Distance = (0, 0)
+
+
+def is_same_path(edge: Edge[K, T], other: Edge[K, T]) -> bool:
+    # whether replacing one edge with the other leaves the shortest paths
+    # as they are, ie. only the reference differs
+    return {edge.source, edge.target} == {other.source, other.target} and edge.cost == other.cost
+
+
+class Graph(Generic[K, T]):
+    # an undirected multigraph of edges that are identified by (orderable) keys
+    def __init__(self) -> None:
+        self._edges: dict[Hashable, Edge[K, T]] = {}
+        self._adjacent: dict[K, dict[Hashable, Edge[K, T]]] = {}
+
+    def add(self, key: Hashable, edge: Edge[K, T]) -> None:
+        assert key not in self._edges
+        self._edges[key] = edge
+        for node in {edge.source, edge.target}:
+            self._adjacent.setdefault(node, {})[key] = edge
+
+    def remove(self, key: Hashable) -> Edge[K, T]:
+        edge = self._edges.pop(key)
+        for node in {edge.source, edge.target}:
+            adjacent = self._adjacent[node]
+            del adjacent[key]
+            if len(adjacent) == 0:
+                del self._adjacent[node]
+        return edge
+
+    def replace(self, key: Hashable, edge: Edge[K, T]) -> None:
+        assert is_same_path(self._edges[key], edge)
+        self._edges[key] = edge
+        for node in {edge.source, edge.target}:
+            self._adjacent[node][key] = edge
+
+    def get_edge(self, key: Hashable) -> Edge[K, T]:
+        return self._edges[key]
+
+    def get_adjacent(self, node: K) -> dict[Hashable, Edge[K, T]]:
+        return self._adjacent.get(node, {})
+
+
+def _get_other(edge: Edge[K, T], node: K) -> K:
+    return edge.target if edge.source == node else edge.source
+
+
+def _extend(distance: Distance, edge: Edge[K, T]) -> Distance:
+    return distance[0] + edge.cost, distance[1] + 1
+
+
+class ShortestPathTree(Generic[K, T]):
+    # the shortest paths from a source to every reachable node of a graph,
+    # the tree has to be told about each change to the graph (after it has
+    # been made) so that it can repair the affected part of the tree
+    def __init__(self, graph: Graph[K, T], source: K, paths: Paths | None = None) -> None:
+        # the paths can be given if they have been found some other way,
+        # as long as they follow the same rules
+        self._graph = graph
+        self._source = source
+        self._distances: dict[K, Distance] = {source: _ZERO}
+        self._parents: dict[K, tuple[K, Hashable]] = {}
+        self._children: dict[K, set[K]] = {}
+        if paths is None:
+            reached = self._search((source,))
+            self._choose_parents(reached)
+        else:
+            self._distances, self._parents = paths
+            for node, (parent, _) in self._parents.items():
+                self._children.setdefault(parent, set()).add(node)
+
+    def get_source(self) -> K:
+        return self._source
+
+    def get_distance(self, node: K) -> Distance | None:
+        return self._distances.get(node)
+
+    def get_parent(self, node: K) -> tuple[K, Edge[K, T]] | None:
+        try:
+            parent, key = self._parents[node]
+        except KeyError:
+            return None
+        return parent, self._graph.get_edge(key)
+
+    def get_children(self, node: K) -> set[K]:
+        return self._children.get(node, set())
+
+    def get_subtree(self, node: K) -> list[K]:
+        # the node and its descendants, parents before children
+        subtree = [node]
+        index = 0
+        while index < len(subtree):
+            subtree.extend(self.get_children(subtree[index]))
+            index += 1
+        return subtree
+
+    # each of the following returns the nodes that have a new parent (or
+    # edge to their parent) or that are no longer reachable, the paths to
+    # the descendants of these nodes have also changed
+
+    def added(self, key: Hashable) -> set[K]:
+        edge = self._graph.get_edge(key)
+        seeds = []
+        for node, other in ((edge.source, edge.target), (edge.target, edge.source)):
+            distance = self._distances.get(node)
+            if distance is not None:
+                candidate = _extend(distance, edge)
+                current = self._distances.get(other)
+                if current is None or candidate < current:
+                    self._distances[other] = candidate
+                    seeds.append(other)
+        improved = self._search(seeds)
+        # the neighbours of improved nodes may now be reached as cheaply
+        # through them and either end of the edge may be reached as cheaply
+        # through it, with a lower key
+        nodes = set(improved)
+        for node in improved:
+            nodes.update(_get_other(adjacent, node) for adjacent in self._graph.get_adjacent(node).values())
+        nodes.update((edge.source, edge.target))
+        return self._choose_parents(nodes)
+
+    def removed(self, key: Hashable, edge: Edge[K, T]) -> set[K]:
+        child = None
+        for node, other in ((edge.source, edge.target), (edge.target, edge.source)):
+            if self._parents.get(other) == (node, key):
+                child = other
+        if child is None:
+            # the edge was not on a shortest path so nothing changes
+            return set()
+        subtree = self.get_subtree(child)
+        for node in subtree:
+            del self._distances[node]
+        # nodes outside of the subtree keep their distances, so reach back
+        # in to the subtree from them and then search the rest of it
+        seeds = []
+        for node in subtree:
+            best = None
+            for adjacent in self._graph.get_adjacent(node).values():
+                distance = self._distances.get(_get_other(adjacent, node))
+                if distance is not None:
+                    candidate = _extend(distance, adjacent)
+                    if best is None or candidate < best:
+                        best = candidate
+            if best is not None:
+                self._distances[node] = best
+                seeds.append(node)
+        self._search(seeds)
+        return self._choose_parents(subtree)
+
+    def replaced(self, key: Hashable) -> set[K]:
+        # the edge has been replaced by one with the same ends and cost,
+        # so the paths are the same and only the reference has changed
+        edge = self._graph.get_edge(key)
+        for node in (edge.source, edge.target):
+            parent = self._parents.get(node)
+            if parent is not None and parent[1] == key:
+                return {node}
+        return set()
+
+    def _search(self, seeds: Iterable[K]) -> set[K]:
+        # relaxes the edges out from the seeds, which already have their
+        # distances, and returns the nodes that have new distances
+        distances = self._distances
+        queue: Queue[K] = Queue()
+        reached: set[K] = set()
+        for node in seeds:
+            queue.add(QueueEntry(distances[node], node))
+            reached.add(node)
+        while queue.is_not_empty():
+            entry = queue.pop()
+            for adjacent in self._graph.get_adjacent(entry.key).values():
+                other = _get_other(adjacent, entry.key)
+                candidate = _extend(entry.cost, adjacent)
+                current = distances.get(other)
+                if current is None or candidate < current:
+                    distances[other] = candidate
+                    queue.replace(QueueEntry(candidate, other))
+                    reached.add(other)
+        return reached
+
+    def _choose_parents(self, nodes: Iterable[K]) -> set[K]:
+        changed: set[K] = set()
+        for node in nodes:
+            if node == self._source:
+                continue
+            parent = self._choose_parent(node)
+            current = self._parents.get(node)
+            if parent != current:
+                if current is not None:
+                    self._children[current[0]].discard(node)
+                if parent is None:
+                    del self._parents[node]
+                else:
+                    self._parents[node] = parent
+                    self._children.setdefault(parent[0], set()).add(node)
+                changed.add(node)
+        return changed
+
+    def _choose_parent(self, node: K) -> tuple[K, Hashable] | None:
+        distance = self._distances.get(node)
+        if distance is None:
+            return None
+        best = None
+        for key, adjacent in self._graph.get_adjacent(node).items():
+            other = _get_other(adjacent, node)
+            other_distance = self._distances.get(other)
+            if other_distance is not None and _extend(other_distance, adjacent) == distance:
+                if best is None or key < best[1]:
+                    best = (other, key)
+        return best
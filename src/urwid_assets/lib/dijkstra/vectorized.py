@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Generic, TypeVar
+
+from urwid_assets.lib.dijkstra.dijkstra import Edge
+from urwid_assets.lib.dijkstra.shortest_path_tree import Paths
+
+try:
+    import numpy
+except ImportError:
+    # numpy is an optional extra (pip install urwid-assets[numpy])
+    numpy = None
+
+T = TypeVar('T')
+K = TypeVar('K')
+
+# each pass extends the paths by one step, deeper graphs (eg. long chains
+# of cross rates) are left to Dijkstra as the passes would cost more
+_MAX_PASSES = 32
+
+
+def is_available() -> bool:
+    return numpy is not None
+
+
+class VectorizedGraph(Generic[K, T]):
+    # the edges as arrays so that the shortest paths from a source are found
+    # by relaxing all of the edges at once, over and over until nothing
+    # changes, rather than one node at a time. Rate graphs are usually
+    # shallow so there are few passes. The paths follow the same rules as
+    # the shortest path tree so that it can take them over, and the factors
+    # are still calculated in Decimal along them
+    def __init__(self, edges: tuple[Edge[K, T] | None, ...]) -> None:
+        assert numpy is not None
+        # self loops are never on a shortest path
+        keys = [key for key, edge in enumerate(edges) if edge is not None and edge.source != edge.target]
+        indices: dict[K, int] = {}
+        for key in keys:
+            indices.setdefault(edges[key].source, len(indices))
+            indices.setdefault(edges[key].target, len(indices))
+        self._edges = edges
+        self._nodes = tuple(indices)
+        self._indices = indices
+        # the distances (cost and then the number of steps) are packed in to
+        # single integers that compare the same way, paths never have more
+        # steps than there are nodes
+        self._scale = len(indices) + 1
+        sources = numpy.array([indices[edges[key].source] for key in keys], dtype=numpy.int64)
+        targets = numpy.array([indices[edges[key].target] for key in keys], dtype=numpy.int64)
+        weights = numpy.array([edges[key].cost for key in keys], dtype=numpy.int64) * self._scale + 1
+        # each edge can be followed in both directions
+        self._from = numpy.concatenate((sources, targets))
+        self._to = numpy.concatenate((targets, sources))
+        self._weights = numpy.concatenate((weights, weights))
+        self._keys = numpy.tile(numpy.array(keys, dtype=numpy.int64), 2)
+
+    def get_paths(self, source: K) -> Paths | None:
+        index = self._indices.get(source)
+        if index is None:
+            return {source: (0, 0)}, {}
+        # half the maximum so that extending an unreached distance cannot overflow
+        unreached = numpy.iinfo(numpy.int64).max // 2
+        distances = numpy.full(len(self._nodes), unreached, dtype=numpy.int64)
+        distances[index] = 0
+        changed = numpy.zeros(len(self._nodes), dtype=bool)
+        changed[index] = True
+        passes = 0
+        while changed.any():
+            if passes == _MAX_PASSES:
+                return None
+            passes += 1
+            # only edges from nodes that changed in the last pass can improve anything
+            active = changed[self._from]
+            relaxed = distances.copy()
+            numpy.minimum.at(relaxed, self._to[active], distances[self._from[active]] + self._weights[active])
+            changed = relaxed < distances
+            distances = relaxed
+        # of the edges on a shortest path to each node, the parent is
+        # across the one with the lowest key
+        tight = distances[self._from] + self._weights == distances[self._to]
+        lowest = numpy.full(len(self._nodes), numpy.iinfo(numpy.int64).max, dtype=numpy.int64)
+        numpy.minimum.at(lowest, self._to[tight], self._keys[tight])
+        reached_distances = {}
+        parents = {}
+        for node_index in numpy.flatnonzero(distances != unreached).tolist():
+            node = self._nodes[node_index]
+            reached_distances[node] = divmod(int(distances[node_index]), self._scale)
+            if node_index != index:
+                key = int(lowest[node_index])
+                edge = self._edges[key]
+                parents[node] = (edge.source if edge.target == node else edge.target, key)
+        return reached_distances, parents
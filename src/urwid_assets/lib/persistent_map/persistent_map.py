@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from typing import TypeVar, Generic, Iterable, Iterator, Any, Hashable
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+# the map is a hash array mapped trie, each level uses _BITS bits of the
+# hash to pick one of 32 slots and only the slots that are in use are held,
+# along with a bitmap of which ones they are. Edits copy the path to the
+# changed slot and share everything else so lookups and edits are O(log n)
+# (at most 13 levels for 64 bit hashes). A slot holds either a sub node or
+# an entry, which is a (hash, key, value) tuple
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+_Entry = tuple[int, Any, Any]
+
+
+class _Node:
+    __slots__ = ('bitmap', 'slots')
+
+    def __init__(self, bitmap: int, slots: tuple[Any, ...]) -> None:
+        self.bitmap = bitmap
+        self.slots = slots
+
+
+class _Collisions:
+    # the entries of different keys with the same hash, once all of its bits have been used
+    __slots__ = ('entries',)
+
+    def __init__(self, entries: tuple[_Entry, ...]) -> None:
+        self.entries = entries
+
+
+_EMPTY = _Node(0, tuple())
+
+
+def _hash(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _is_key(entry: _Entry, key_hash: int, key: Any) -> bool:
+    return entry[0] == key_hash and (entry[1] is key or entry[1] == key)
+
+
+def _get_slot(node: _Node, key_hash: int, shift: int) -> tuple[int, int]:
+    # the bit for the key at this level and the position of its slot
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    return bit, (node.bitmap & (bit - 1)).bit_count()
+
+
+def _find(node: Any, key_hash: int, key: Any) -> _Entry | None:
+    shift = 0
+    while True:
+        if isinstance(node, _Collisions):
+            for entry in node.entries:
+                if entry[1] is key or entry[1] == key:
+                    return entry
+            return None
+        bit, position = _get_slot(node, key_hash, shift)
+        if not node.bitmap & bit:
+            return None
+        slot = node.slots[position]
+        if isinstance(slot, tuple):
+            return slot if _is_key(slot, key_hash, key) else None
+        node = slot
+        shift += _BITS
+
+
+def _pair(entry: _Entry, other: _Entry, shift: int) -> Any:
+    # a node for two entries whose hashes are the same up to the shift
+    if shift >= _HASH_BITS:
+        return _Collisions((entry, other))
+    node, _ = _set(_EMPTY, entry, shift)
+    node, _ = _set(node, other, shift)
+    return node
+
+
+def _set(node: Any, entry: _Entry, shift: int) -> tuple[Any, bool]:
+    # returns the replacement for the node and whether the key was added
+    key_hash, key, _ = entry
+    if isinstance(node, _Collisions):
+        entries = node.entries
+        for position, other in enumerate(entries):
+            if other[1] is key or other[1] == key:
+                return _Collisions(entries[:position] + (entry,) + entries[position + 1:]), False
+        return _Collisions(entries + (entry,)), True
+    bit, position = _get_slot(node, key_hash, shift)
+    slots = node.slots
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, slots[:position] + (entry,) + slots[position:]), True
+    slot = slots[position]
+    if isinstance(slot, tuple):
+        if _is_key(slot, key_hash, key):
+            replacement, added = entry, False
+        else:
+            replacement, added = _pair(slot, entry, shift + _BITS), True
+    else:
+        replacement, added = _set(slot, entry, shift + _BITS)
+    return _Node(node.bitmap, slots[:position] + (replacement,) + slots[position + 1:]), added
+
+
+def _delete(node: Any, key_hash: int, key: Any, shift: int) -> tuple[Any, bool]:
+    # returns the replacement for the node (an entry if only one is left in
+    # a sub node, None if nothing is left) and whether the key was removed
+    if isinstance(node, _Collisions):
+        entries = tuple(entry for entry in node.entries if not (entry[1] is key or entry[1] == key))
+        if len(entries) == len(node.entries):
+            return node, False
+        return (entries[0] if len(entries) == 1 else _Collisions(entries)), True
+    bit, position = _get_slot(node, key_hash, shift)
+    if not node.bitmap & bit:
+        return node, False
+    slots = node.slots
+    slot = slots[position]
+    if isinstance(slot, tuple):
+        if not _is_key(slot, key_hash, key):
+            return node, False
+        replacement = None
+    else:
+        replacement, removed = _delete(slot, key_hash, key, shift + _BITS)
+        if not removed:
+            return node, False
+    if replacement is None:
+        if node.bitmap == bit:
+            return None, True
+        slots = slots[:position] + slots[position + 1:]
+        if len(slots) == 1 and isinstance(slots[0], tuple) and shift > 0:
+            # pull a lone entry up in to the parent
+            return slots[0], True
+        return _Node(node.bitmap & ~bit, slots), True
+    return _Node(node.bitmap, slots[:position] + (replacement,) + slots[position + 1:]), True
+
+
+def _iter_entries(node: Any) -> Iterator[_Entry]:
+    if isinstance(node, _Collisions):
+        yield from node.entries
+        return
+    for slot in node.slots:
+        if isinstance(slot, tuple):
+            yield slot
+        else:
+            yield from _iter_entries(slot)
+
+
+class PersistentMap(Generic[K, V]):
+    __slots__ = ('_root', '_size', '__weakref__')
+
+    def __init__(self, items: Iterable[tuple[K, V]] = tuple()) -> None:
+        root = _EMPTY
+        size = 0
+        for key, value in items:
+            root, added = _set(root, (_hash(key), key, value), 0)
+            size += added
+        self._root = root
+        self._size = size
+
+    @classmethod
+    def _from_root(cls, root: Any, size: int) -> PersistentMap[K, V]:
+        persistent_map = cls.__new__(cls)
+        persistent_map._root = _EMPTY if root is None else root
+        persistent_map._size = size
+        return persistent_map
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Any) -> bool:
+        return _find(self._root, _hash(key), key) is not None
+
+    def __iter__(self) -> Iterator[K]:
+        return (key for _, key, _ in _iter_entries(self._root))
+
+    def __repr__(self) -> str:
+        return 'PersistentMap(%r)' % (tuple(self.items()),)
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        return ((key, value) for _, key, value in _iter_entries(self._root))
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        entry = _find(self._root, _hash(key), key)
+        if entry is None:
+            return default
+        return entry[2]
+
+    def set(self, key: K, value: V) -> PersistentMap[K, V]:
+        root, added = _set(self._root, (_hash(key), key, value), 0)
+        return PersistentMap._from_root(root, self._size + added)
+
+    def delete(self, key: K) -> PersistentMap[K, V]:
+        root, removed = _delete(self._root, _hash(key), key, 0)
+        if not removed:
+            return self
+        return PersistentMap._from_root(root, self._size - 1)
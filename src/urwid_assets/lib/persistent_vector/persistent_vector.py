@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from bisect import bisect_right, bisect_left
+from collections.abc import Sequence
+from itertools import accumulate, chain
+from typing import TypeVar, Generic, Iterable, Iterator, Any
+
+T = TypeVar('T')
+
+# the vector is a B-tree of tuples, the leaves hold up to _BRANCHING items
+# and the branches hold up to _BRANCHING children along with the running
+# totals of their sizes so that an index is found with a bisect at each
+# level. Edits copy the path to the changed leaf and share everything else
+# so they are O(log n) in both time and memory
+_BRANCHING = 32
+_MIN_LEAF = _BRANCHING // 4
+
+
+class _Branch:
+    __slots__ = ('children', 'ends')
+
+    def __init__(self, children: tuple[Any, ...], ends: tuple[int, ...] | None = None) -> None:
+        self.children = children
+        self.ends = tuple(accumulate(_get_size(child) for child in children)) if ends is None else ends
+
+
+def _get_size(node: Any) -> int:
+    if isinstance(node, _Branch):
+        return node.ends[-1]
+    return len(node)
+
+
+def _locate(branch: _Branch, index: int) -> tuple[int, int]:
+    position = bisect_right(branch.ends, index)
+    if position > 0:
+        index -= branch.ends[position - 1]
+    return position, index
+
+
+def _get(node: Any, index: int) -> Any:
+    while isinstance(node, _Branch):
+        position, index = _locate(node, index)
+        node = node.children[position]
+    return node[index]
+
+
+def _set(node: Any, index: int, value: Any) -> Any:
+    if isinstance(node, _Branch):
+        position, index = _locate(node, index)
+        children = node.children
+        # the sizes do not change so the running totals can be shared
+        return _Branch(children[:position] + (_set(children[position], index, value),) + children[position + 1:],
+                       node.ends)
+    return node[:index] + (value,) + node[index + 1:]
+
+
+def _split(children: tuple[Any, ...], leaf: bool) -> tuple[Any, ...]:
+    if len(children) <= _BRANCHING:
+        return (children,) if leaf else (_Branch(children),)
+    half = len(children) // 2
+    if leaf:
+        return children[:half], children[half:]
+    return _Branch(children[:half]), _Branch(children[half:])
+
+
+def _insert(node: Any, index: int, value: Any) -> tuple[Any, ...]:
+    # returns the replacement for the node, which is 2 nodes if it was split
+    if isinstance(node, _Branch):
+        if index == node.ends[-1]:
+            position = len(node.children) - 1
+            index -= node.ends[position - 1] if position > 0 else 0
+        else:
+            position, index = _locate(node, index)
+        children = node.children
+        return _split(children[:position] + _insert(children[position], index, value) + children[position + 1:],
+                      False)
+    return _split(node[:index] + (value,) + node[index:], True)
+
+
+def _delete(node: Any, index: int) -> Any:
+    if isinstance(node, _Branch):
+        position, index = _locate(node, index)
+        children = node.children
+        child = _delete(children[position], index)
+        if _get_size(child) == 0:
+            replacement = tuple()
+        elif not isinstance(child, _Branch) and len(child) < _MIN_LEAF:
+            # merge small leaves into a neighbour so that they do not
+            # fragment after a lot of deletions
+            replacement = (child,)
+            if position > 0 and not isinstance(children[position - 1], _Branch) and \
+                    len(children[position - 1]) + len(child) <= _BRANCHING:
+                position -= 1
+                replacement = (children[position] + child,)
+                children = children[:position + 1] + children[position + 2:]
+        else:
+            replacement = (child,)
+        children = children[:position] + replacement + children[position + 1:]
+        if len(children) == 0:
+            return tuple()
+        return _Branch(children)
+    return node[:index] + node[index + 1:]
+
+
+def _get_last(node: Any) -> Any:
+    while isinstance(node, _Branch):
+        node = node.children[-1]
+    return node[-1]
+
+
+def _bisect_left(node: Any, value: Any) -> int:
+    # bisects the children of each branch on their last items on the way
+    # down, finding the last item of a child goes down its right edge so
+    # this is O(log^2 n) steps, which is still only a few dozen for 100000 items
+    index = 0
+    while isinstance(node, _Branch):
+        children = node.children
+        low = 0
+        high = len(children) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if _get_last(children[middle]) < value:
+                low = middle + 1
+            else:
+                high = middle
+        if low > 0:
+            index += node.ends[low - 1]
+        node = children[low]
+    return index + bisect_left(node, value)
+
+
+def _collapse(node: Any) -> Any:
+    while isinstance(node, _Branch) and len(node.children) == 1:
+        node = node.children[0]
+    return node
+
+
+def _build(items: tuple[Any, ...]) -> Any:
+    nodes = tuple(items[start:start + _BRANCHING] for start in range(0, len(items), _BRANCHING))
+    while len(nodes) > 1:
+        nodes = tuple(_Branch(nodes[start:start + _BRANCHING]) for start in range(0, len(nodes), _BRANCHING))
+    return nodes[0] if len(nodes) > 0 else tuple()
+
+
+def _iter_leaves(node: Any) -> Iterator[tuple[Any, ...]]:
+    if isinstance(node, _Branch):
+        for child in node.children:
+            yield from _iter_leaves(child)
+    else:
+        yield node
+
+
+def _iter_leaves_reversed(node: Any) -> Iterator[tuple[Any, ...]]:
+    if isinstance(node, _Branch):
+        for child in reversed(node.children):
+            yield from _iter_leaves_reversed(child)
+    else:
+        yield node
+
+
+class PersistentVector(Sequence, Generic[T]):
+    __slots__ = ('_root', '_hash', '__weakref__')
+    _CACHE_SLOTS = ('_hash',)
+
+    def __init__(self, items: Iterable[T] = tuple()) -> None:
+        self._root = _build(tuple(items))
+        self._hash: int | None = None
+
+    @classmethod
+    def _from_root(cls, root: Any) -> PersistentVector[T]:
+        vector = cls.__new__(cls)
+        vector._root = _collapse(root)
+        vector._hash = None
+        return vector
+
+    def _check_index(self, index: int, length: int) -> int:
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError('PersistentVector index out of range')
+        return index
+
+    def __len__(self) -> int:
+        return _get_size(self._root)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return PersistentVector(tuple(self)[index])
+        return _get(self._root, self._check_index(index, len(self)))
+
+    def __iter__(self) -> Iterator[T]:
+        if isinstance(self._root, _Branch):
+            return chain.from_iterable(_iter_leaves(self._root))
+        return iter(self._root)
+
+    def __reversed__(self) -> Iterator[T]:
+        return chain.from_iterable(reversed(leaf) for leaf in _iter_leaves_reversed(self._root))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PersistentVector):
+            return NotImplemented
+        if self._root is other._root:
+            return True
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return 'PersistentVector(%r)' % (tuple(self),)
+
+    def bisect_left(self, value: T) -> int:
+        # for vectors that are sorted, where value would be inserted to keep them sorted
+        return _bisect_left(self._root, value)
+
+    def set(self, index: int, value: T) -> PersistentVector[T]:
+        return PersistentVector._from_root(_set(self._root, self._check_index(index, len(self)), value))
+
+    def insert(self, index: int, value: T) -> PersistentVector[T]:
+        assert 0 <= index <= len(self)
+        nodes = _insert(self._root, index, value)
+        return PersistentVector._from_root(nodes[0] if len(nodes) == 1 else _Branch(nodes))
+
+    def append(self, value: T) -> PersistentVector[T]:
+        return self.insert(len(self), value)
+
+    def delete(self, index: int) -> PersistentVector[T]:
+        return PersistentVector._from_root(_delete(self._root, self._check_index(index, len(self))))
+
+    def move(self, index: int, to: int) -> PersistentVector[T]:
+        length = len(self)
+        index = self._check_index(index, length)
+        to = self._check_index(to, length)
+        if index == to:
+            return self
+        return self.delete(index).insert(to, _get(self._root, index))
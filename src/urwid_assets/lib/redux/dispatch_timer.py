@@ -0,0 +1,114 @@
+import logging
+from time import perf_counter
+
+from urwid_assets.lib.redux.reducer import ReducerTracer, Reducer, Action, ActionType, set_reducer_tracer, STATE
+from urwid_assets.lib.redux.store import Middleware, NextReduce, NextNotify
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _add_time(times: dict[str, float], key: str, elapsed: float) -> None:
+    times[key] = times.get(key, 0.0) + elapsed
+
+
+def _format_times(times: dict[str, float]) -> tuple[str, ...]:
+    return tuple(u'%s %.3fms' % (key, elapsed * 1000)
+                 for key, elapsed in sorted(times.items(), key=lambda item: item[1], reverse=True))
+
+
+class _ActionTimings:
+    def __init__(self) -> None:
+        self.dispatches: int = 0
+        self.reduce_time: float = 0.0
+        self.reducer_times: dict[str, float] = {}
+        self.notifications: int = 0
+        self.notify_time: float = 0.0
+        self.subscriber_times: dict[str, float] = {}
+
+    def get_total_time(self) -> float:
+        return self.reduce_time + self.notify_time
+
+
+class DispatchTimer(Middleware, ReducerTracer):
+    def __init__(self) -> None:
+        self._timings: dict[ActionType, _ActionTimings] = {}
+        self._path: tuple[str, ...] = tuple()
+        self._notifying: _ActionTimings | None = None
+
+    def _get_timings(self, action_type: ActionType) -> _ActionTimings:
+        try:
+            return self._timings[action_type]
+        except KeyError:
+            timings = _ActionTimings()
+            self._timings[action_type] = timings
+            return timings
+
+    def reduce(self, action: Action, next_reduce: NextReduce) -> None:
+        timings = self._get_timings(action.type)
+        previous_tracer = set_reducer_tracer(self)
+        start = perf_counter()
+        try:
+            next_reduce(action)
+        finally:
+            timings.reduce_time += perf_counter() - start
+            timings.dispatches += 1
+            set_reducer_tracer(previous_tracer)
+
+    def trace(self, field: str, reducer: Reducer[STATE], state: STATE, action: Action) -> STATE:
+        previous_path = self._path
+        self._path = previous_path + (field,)
+        start = perf_counter()
+        try:
+            return reducer(state, action)
+        finally:
+            _add_time(self._get_timings(action.type).reducer_times, u'.'.join(self._path), perf_counter() - start)
+            self._path = previous_path
+
+    def notify(self, actions: tuple[Action, ...], next_notify: NextNotify) -> None:
+        if len(actions) == 0:
+            next_notify()
+            return
+        # coalesced notifications are attributed to the last action
+        # in the batch as that is the one that triggered them
+        timings = self._get_timings(actions[-1].type)
+        previous_notifying = self._notifying
+        self._notifying = timings
+        start = perf_counter()
+        try:
+            next_notify()
+        finally:
+            timings.notify_time += perf_counter() - start
+            timings.notifications += 1
+            self._notifying = previous_notifying
+
+    def notify_subscriber(self, name: str, next_notify: NextNotify) -> None:
+        timings = self._notifying
+        start = perf_counter()
+        try:
+            next_notify()
+        finally:
+            if timings is not None:
+                _add_time(timings.subscriber_times, name, perf_counter() - start)
+
+    def get_report(self) -> tuple[str, ...]:
+        report: tuple[str, ...] = tuple()
+        for action_type, timings in sorted(self._timings.items(),
+                                           key=lambda item: item[1].get_total_time(),
+                                           reverse=True):
+            report += (
+                u'%s.%s: %d dispatches, reduce %.3fms, %d notifications, fan out %.3fms' % (
+                    action_type.namespace,
+                    action_type.name,
+                    timings.dispatches,
+                    timings.reduce_time * 1000,
+                    timings.notifications,
+                    timings.notify_time * 1000,
+                ),
+            )
+            report += tuple(u'  reducer %s' % line for line in _format_times(timings.reducer_times))
+            report += tuple(u'  subscriber %s' % line for line in _format_times(timings.subscriber_times))
+        return report
+
+    def log_report(self) -> None:
+        for line in self.get_report():
+            _LOGGER.info(line)
@@ -0,0 +1,29 @@
+from typing import Any, Callable
+
+Equality = Callable[[Any, Any], bool]
+
+
+def is_identical(value1: Any, value2: Any) -> bool:
+    return value1 is value2
+
+
+def is_equal(value1: Any, value2: Any) -> bool:
+    return value1 == value2
+
+
+def are_items_identical(values1: tuple[Any, ...], values2: tuple[Any, ...]) -> bool:
+    if len(values1) != len(values2):
+        return False
+    for value1, value2 in zip(values1, values2):
+        if value1 is not value2:
+            return False
+    return True
+
+
+def are_items_equal(values1: tuple[Any, ...], values2: tuple[Any, ...]) -> bool:
+    if len(values1) != len(values2):
+        return False
+    for value1, value2 in zip(values1, values2):
+        if value1 is not value2 and value1 != value2:
+            return False
+    return True
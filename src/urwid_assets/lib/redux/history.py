@@ -0,0 +1,207 @@
+import logging
+import sys
+from collections import deque
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID
+
+from urwid_assets.lib.redux.reducer import Action, ActionType
+from urwid_assets.lib.redux.store import Middleware, Store, NextReduce, NextNotify
+
+_LOGGER = logging.getLogger(__name__)
+
+# values that have no children, these are counted with the value that
+# holds them rather than by identity so that the counts stay small
+_ATOMS = (str, bytes, int, float, Decimal, UUID, datetime, type(None))
+
+# the first value that is counted replaces this
+_NOTHING = object()
+
+
+def _get_children(value: Any) -> tuple[Any, ...]:
+    if isinstance(value, (tuple, list)):
+        return tuple(value)
+    if isinstance(value, dict):
+        return tuple(value.keys()) + tuple(value.values())
+    try:
+        return tuple(vars(value).values())
+    except TypeError:
+        pass
+    # persistent vector nodes, etc.
+    slots = getattr(type(value), '__slots__', tuple())
+    if isinstance(slots, str):
+        slots = (slots,)
+    # str, int, Decimal, UUID, etc. have no slots that need counting. Caches
+    # are filled in after a value is retained so they are not counted, they
+    # have to be the same on the way out as they were on the way in
+    skipped = ('__weakref__',) + getattr(type(value), '_CACHE_SLOTS', tuple())
+    return tuple(getattr(value, slot) for slot in slots if slot not in skipped and hasattr(value, slot))
+
+
+class _RetainedSize:
+    # reference counts the objects reachable from the retained values so
+    # that objects shared between values (all of the unchanged parts of
+    # the state) are only counted once
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = {}
+        self.size: int = 0
+
+    def retain(self, value: Any) -> None:
+        stack = [value]
+        while len(stack) > 0:
+            value = stack.pop()
+            key = id(value)
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+            if count == 0:
+                # only descend the first time, the children of a value
+                # that is already retained are already counted
+                self.size += sys.getsizeof(value)
+                for child in _get_children(value):
+                    if isinstance(child, _ATOMS):
+                        self.size += sys.getsizeof(child)
+                    else:
+                        stack.append(child)
+
+    def release(self, value: Any) -> None:
+        stack = [value]
+        while len(stack) > 0:
+            value = stack.pop()
+            key = id(value)
+            count = self._counts[key] - 1
+            if count == 0:
+                del self._counts[key]
+                self.size -= sys.getsizeof(value)
+                for child in _get_children(value):
+                    if isinstance(child, _ATOMS):
+                        self.size -= sys.getsizeof(child)
+                    else:
+                        stack.append(child)
+            else:
+                self._counts[key] = count
+
+
+class History(Middleware):
+    # the undo entries share most of their objects with each other and with
+    # the current value, so they are charged only for the objects that the
+    # current value does not also hold: everything the history and current
+    # value hold less everything the current value holds. Counting only
+    # walks the objects that come and go and it is put off until the store
+    # notifies, so that it stays out of the reducers
+    def __init__(self,
+                 select: Callable[[Any], Any],
+                 restore: Callable[[Any], Action],
+                 budget: int,
+                 barriers: tuple[ActionType, ...] = tuple()) -> None:
+        self._select = select
+        self._restore = restore
+        self._budget = budget
+        self._barriers = barriers
+        self._store: Store | None = None
+        self._undo: deque[Any] = deque()
+        self._redo: list[Any] = []
+        self._retained = _RetainedSize()
+        self._current = _RetainedSize()
+        self._counted: Any = _NOTHING
+        self._retains: list[Any] = []
+        self._releases: list[Any] = []
+        self._restore_actions: list[Action] = []
+
+    def attach(self, store: Store) -> None:
+        self._store = store
+
+    def get_retained_size(self) -> int:
+        self._count()
+        return self._retained.size - self._current.size
+
+    def get_undo_depth(self) -> int:
+        self._count()
+        return len(self._undo)
+
+    def can_undo(self) -> bool:
+        return len(self._undo) > 0
+
+    def can_redo(self) -> bool:
+        return len(self._redo) > 0
+
+    def undo(self) -> None:
+        if self.can_undo():
+            value = self._undo.pop()
+            self._redo.append(self._select(self._store.get_state()))
+            self._retains.append(self._redo[-1])
+            self._releases.append(value)
+            self._dispatch_restore(value)
+
+    def redo(self) -> None:
+        if self.can_redo():
+            value = self._redo.pop()
+            self._push_undo(self._select(self._store.get_state()))
+            self._releases.append(value)
+            self._dispatch_restore(value)
+
+    def clear(self) -> None:
+        self._releases.extend(self._undo)
+        self._undo.clear()
+        self._clear_redo()
+
+    def reduce(self, action: Action, next_reduce: NextReduce) -> None:
+        for index, restore_action in enumerate(self._restore_actions):
+            if restore_action is action:
+                # our own undo or redo, the stacks have already been updated
+                del self._restore_actions[index]
+                next_reduce(action)
+                return
+        if action.type in self._barriers:
+            next_reduce(action)
+            self.clear()
+            return
+        previous = self._select(self._store.get_state())
+        next_reduce(action)
+        if self._select(self._store.get_state()) is not previous:
+            self._clear_redo()
+            self._push_undo(previous)
+
+    def notify(self, actions: tuple[Action, ...], next_notify: NextNotify) -> None:
+        self._count()
+        next_notify()
+
+    def _dispatch_restore(self, value: Any) -> None:
+        # the restore action may be queued by the store so it is
+        # recognised by identity when it is eventually reduced
+        action = self._restore(value)
+        self._restore_actions.append(action)
+        self._store.dispatch(action)
+
+    def _clear_redo(self) -> None:
+        self._releases.extend(self._redo)
+        self._redo.clear()
+
+    def _push_undo(self, value: Any) -> None:
+        self._undo.append(value)
+        self._retains.append(value)
+
+    def _count(self) -> None:
+        current = self._select(self._store.get_state())
+        if current is not self._counted:
+            self._retained.retain(current)
+            self._current.retain(current)
+        # retain before releasing so that objects that are still held are
+        # not walked on the way out and then straight back in
+        for value in self._retains:
+            self._retained.retain(value)
+        for value in self._releases:
+            self._retained.release(value)
+        self._retains.clear()
+        self._releases.clear()
+        if current is not self._counted:
+            if self._counted is not _NOTHING:
+                self._retained.release(self._counted)
+                self._current.release(self._counted)
+            self._counted = current
+        # drop the oldest entries until the objects that only they hold fit
+        # the budget, always keeping the latest entry so a change can be undone
+        while self._retained.size - self._current.size > self._budget and len(self._undo) > 1:
+            self._retained.release(self._undo.popleft())
+            _LOGGER.debug('dropped oldest undo entry, retaining %d bytes',
+                          self._retained.size - self._current.size)
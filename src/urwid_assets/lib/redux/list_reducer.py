@@ -1,8 +1,13 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import TypeVar, Type
+from typing import TypeVar, Type, Callable, Generic, Iterable, Iterator
 from uuid import UUID
 
-from urwid_assets.lib.redux.reducer import ActionType, Reducer, Action, INIT
+from urwid_assets.lib.persistent_map.persistent_map import PersistentMap
+from urwid_assets.lib.persistent_vector.persistent_vector import PersistentVector
+from urwid_assets.lib.redux.reducer import ActionType, Reducer, Action, INIT, RoutedReducer, create_reducer
 
 
 @dataclass(frozen=True)
@@ -11,52 +16,271 @@ class ListItem:
 
 
 LIST_ITEM = TypeVar('LIST_ITEM', bound=ListItem)
-LIST = tuple[LIST_ITEM, ...]
+LIST = Sequence[LIST_ITEM]
+
+# the labels of the items increase along a list, with gaps so that an
+# item can usually be given a label between its neighbours
+_LABEL_GAP = 1 << 32
+
+
+def _get_label_between(labels: PersistentVector[int], index: int) -> int | None:
+    # a label for an item inserted at the index, None if there is no gap left
+    if len(labels) == 0:
+        return 0
+    if index == 0:
+        return labels[0] - _LABEL_GAP
+    if index == len(labels):
+        return labels[-1] + _LABEL_GAP
+    lower = labels[index - 1]
+    upper = labels[index]
+    if upper - lower < 2:
+        return None
+    return (lower + upper) // 2
+
+
+class _Index(Generic[LIST_ITEM]):
+    # the uuid index of a list, a persistent map from each uuid to the label
+    # and item and the labels in list order, so the position of an item is
+    # found by bisecting the labels for its label. Both are persistent so an
+    # edit only copies the paths to the changes (O(log n)) and shares the rest
+    # with the index of the list it was derived from. An edit returns None
+    # when there is no gap left for a label, the index is then built again
+    # for the derived list, but only when it is needed
+    __slots__ = ('_labels', '_entries')
+
+    def __init__(self,
+                 labels: PersistentVector[int],
+                 entries: PersistentMap[UUID, tuple[int, LIST_ITEM]]) -> None:
+        self._labels = labels
+        self._entries = entries
+
+    @classmethod
+    def build(cls, items: Iterable[LIST_ITEM]) -> _Index[LIST_ITEM]:
+        entries = tuple((list_item.uuid, (index * _LABEL_GAP, list_item)) for index, list_item in enumerate(items))
+        return _Index(PersistentVector(label for _, (label, _) in entries), PersistentMap(entries))
+
+    def get_index(self, uuid: UUID) -> int | None:
+        entry = self._entries.get(uuid)
+        if entry is None:
+            return None
+        return self._labels.bisect_left(entry[0])
+
+    def get_item(self, uuid: UUID) -> LIST_ITEM | None:
+        entry = self._entries.get(uuid)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def replaced(self, index: int, previous: LIST_ITEM, item: LIST_ITEM) -> _Index[LIST_ITEM]:
+        entries = self._entries
+        if previous.uuid != item.uuid:
+            entries = entries.delete(previous.uuid)
+        return _Index(self._labels, entries.set(item.uuid, (self._labels[index], item)))
+
+    def inserted(self, index: int, item: LIST_ITEM) -> _Index[LIST_ITEM] | None:
+        label = _get_label_between(self._labels, index)
+        if label is None:
+            return None
+        return _Index(self._labels.insert(index, label), self._entries.set(item.uuid, (label, item)))
+
+    def removed(self, index: int, item: LIST_ITEM) -> _Index[LIST_ITEM]:
+        return _Index(self._labels.delete(index), self._entries.delete(item.uuid))
+
+    def moved(self, index: int, to: int, item: LIST_ITEM) -> _Index[LIST_ITEM] | None:
+        return self.removed(index, item).inserted(to, item)
+
+
+class EntityList(Sequence, Generic[LIST_ITEM]):
+    # an ordered list of list items indexed by uuid, the items are held in a
+    # persistent vector so that edits by position share everything but the
+    # changed path (O(log n)). The uuid index is built on the first lookup
+    # and then carried over to the lists derived from this one (see _Index),
+    # so getting an item by uuid is O(log n), finding its position is
+    # O(log^2 n) and the edits that start with a lookup stay O(log n)
+    __slots__ = ('_items', '_index', '__weakref__')
+    _CACHE_SLOTS = ('_index',)
+
+    def __init__(self, items: Iterable[LIST_ITEM] = tuple(), index: _Index[LIST_ITEM] | None = None) -> None:
+        self._items: PersistentVector[LIST_ITEM] = items if isinstance(items, PersistentVector) \
+            else PersistentVector(items)
+        self._index = index
+
+    def _get_index(self) -> _Index[LIST_ITEM]:
+        if self._index is None:
+            self._index = _Index.build(self._items)
+        return self._index
+
+    def _derive(self,
+                items: PersistentVector[LIST_ITEM],
+                update: Callable[[_Index[LIST_ITEM]], _Index[LIST_ITEM] | None]) -> EntityList[LIST_ITEM]:
+        # only carry the index over if it has been built, otherwise it
+        # is built from the derived list when it is first needed
+        index = self._index
+        return EntityList(items, None if index is None else update(index))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int | slice) -> LIST_ITEM | EntityList[LIST_ITEM]:
+        if isinstance(index, slice):
+            return EntityList(self._items[index])
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[LIST_ITEM]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[LIST_ITEM]:
+        return reversed(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EntityList):
+            return NotImplemented
+        return self._items == other._items
+
+    def __hash__(self) -> int:
+        return hash(self._items)
+
+    def __repr__(self) -> str:
+        return 'EntityList(%r)' % (tuple(self._items),)
+
+    def get_ids(self) -> tuple[UUID, ...]:
+        return tuple(list_item.uuid for list_item in self._items)
+
+    def get_index(self, uuid: UUID) -> int | None:
+        return self._get_index().get_index(uuid)
+
+    def get_item(self, uuid: UUID) -> LIST_ITEM | None:
+        return self._get_index().get_item(uuid)
+
+    def append(self, item: LIST_ITEM) -> EntityList[LIST_ITEM]:
+        index = len(self._items)
+        return self._derive(self._items.append(item), lambda uuid_index: uuid_index.inserted(index, item))
+
+    def replace(self, index: int, item: LIST_ITEM) -> EntityList[LIST_ITEM]:
+        previous = self._items[index]
+        return self._derive(self._items.set(index, item), lambda uuid_index: uuid_index.replaced(index, previous, item))
+
+    def insert(self, index: int, item: LIST_ITEM) -> EntityList[LIST_ITEM]:
+        return self._derive(self._items.insert(index, item), lambda uuid_index: uuid_index.inserted(index, item))
+
+    def remove(self, index: int) -> EntityList[LIST_ITEM]:
+        item = self._items[index]
+        return self._derive(self._items.delete(index), lambda uuid_index: uuid_index.removed(index, item))
+
+    def move(self, index: int, to: int) -> EntityList[LIST_ITEM]:
+        item = self._items[index]
+        return self._derive(self._items.move(index, to), lambda uuid_index: uuid_index.moved(index, to, item))
+
+
+def to_entity_list(state: LIST) -> EntityList[LIST_ITEM]:
+    if isinstance(state, EntityList):
+        return state
+    return EntityList(state)
 
 
 def get_list_index(state: LIST, uuid: UUID) -> int | None:
-    for index, list_item in enumerate(state):
-        if list_item.uuid == uuid:
-            return index
-    return None
+    return to_entity_list(state).get_index(uuid)
 
 
-def append_item(item: LIST_ITEM, state: LIST) -> LIST:
-    return state + (item,)
+def get_list_item(state: LIST, uuid: UUID) -> LIST_ITEM | None:
+    return to_entity_list(state).get_item(uuid)
 
 
-def remove_item(item: LIST_ITEM, state: LIST) -> LIST:
-    index = get_list_index(state, item.uuid)
+def append_item(item: LIST_ITEM, state: LIST) -> EntityList[LIST_ITEM]:
+    return to_entity_list(state).append(item)
+
+
+def remove_item(item: LIST_ITEM, state: LIST) -> EntityList[LIST_ITEM]:
+    state = to_entity_list(state)
+    index = state.get_index(item.uuid)
     if index is None:
         return state
-    return state[:index] + state[index + 1:]
+    return state.remove(index)
 
 
-def replace_item(item: LIST_ITEM, state: LIST) -> LIST:
-    index = get_list_index(state, item.uuid)
+def replace_item(item: LIST_ITEM, state: LIST) -> EntityList[LIST_ITEM]:
+    state = to_entity_list(state)
+    index = state.get_index(item.uuid)
     if index is None:
         return state
-    return state[:index] + (item,) + state[index + 1:]
+    return state.replace(index, item)
 
 
-def move_item_up(item: LIST_ITEM, state: LIST) -> LIST:
-    index = get_list_index(state, item.uuid)
+def move_item_up(item: LIST_ITEM, state: LIST) -> EntityList[LIST_ITEM]:
+    state = to_entity_list(state)
+    index = state.get_index(item.uuid)
     if index is None:
         return state
     if index > 0:
-        return state[:index - 1] + (item, state[index - 1]) + state[index + 1:]
+        return state.replace(index, item).move(index, index - 1)
     return state
 
 
-def move_item_down(item: LIST_ITEM, state: LIST) -> LIST:
-    index = get_list_index(state, item.uuid)
+def move_item_down(item: LIST_ITEM, state: LIST) -> EntityList[LIST_ITEM]:
+    state = to_entity_list(state)
+    index = state.get_index(item.uuid)
     if index is None:
         return state
     if index < len(state) - 1:
-        return state[:index] + (state[index + 1], item) + state[index + 2:]
+        return state.replace(index, item).move(index, index + 1)
     return state
 
 
+def remove_items(items: tuple[LIST_ITEM, ...], state: LIST) -> EntityList[LIST_ITEM]:
+    state = to_entity_list(state)
+    for item in items:
+        state = remove_item(item, state)
+    return state
+
+
+def move_items_to(items: tuple[LIST_ITEM, ...], index: int, state: LIST) -> EntityList[LIST_ITEM]:
+    # the items are moved as a block, in the order given, so that the first
+    # of them ends up at the index (clamped to the end of the list)
+    state = to_entity_list(state)
+    items = tuple(item for item in items if state.get_index(item.uuid) is not None)
+    state = remove_items(items, state)
+    index = max(0, min(index, len(state)))
+    for offset, item in enumerate(items):
+        state = state.insert(index + offset, item)
+    return state
+
+
+def _create_item_reducer(list_type: Type[LIST_ITEM],
+                         update: Callable[[LIST_ITEM, LIST], LIST]) -> Reducer[LIST]:
+    def item_reducer(state: LIST, action: Action) -> LIST:
+        item = action.payload
+        assert isinstance(item, list_type)
+        return update(item, state)
+
+    return item_reducer
+
+
+def _create_items_reducer(list_type: Type[LIST_ITEM],
+                          update: Callable[[tuple[LIST_ITEM, ...], LIST], LIST]) -> Reducer[LIST]:
+    def items_reducer(state: LIST, action: Action) -> LIST:
+        items = action.payload
+        assert isinstance(items, tuple)
+        assert all(isinstance(item, list_type) for item in items)
+        return update(items, state)
+
+    return items_reducer
+
+
+def _create_move_to_reducer(list_type: Type[LIST_ITEM]) -> Reducer[LIST]:
+    def move_to_reducer(state: LIST, action: Action) -> LIST:
+        (items, index) = action.payload
+        assert isinstance(items, tuple)
+        assert all(isinstance(item, list_type) for item in items)
+        assert isinstance(index, int)
+        return move_items_to(items, index, state)
+
+    return move_to_reducer
+
+
+def _init(_: LIST, __: Action) -> LIST:
+    return EntityList()
+
+
 def create_list_reducer(
         list_type: Type[LIST_ITEM],
         add: ActionType | None = None,
@@ -64,30 +288,22 @@ def create_list_reducer(
         delete: ActionType | None = None,
         move_up: ActionType | None = None,
         move_down: ActionType | None = None,
-) -> Reducer[LIST]:
-    def reducer(state: LIST, action: Action) -> LIST:
-        if action.type == INIT:
-            return tuple()
-        if add and action.type == add:
-            item = action.payload
-            assert isinstance(item, list_type)
-            return append_item(item, state)
-        if update and action.type == update:
-            item = action.payload
-            assert isinstance(item, list_type)
-            return replace_item(item, state)
-        if delete and action.type == delete:
-            item = action.payload
-            assert isinstance(item, list_type)
-            return remove_item(item, state)
-        if move_up and action.type == move_up:
-            item = action.payload
-            assert isinstance(item, list_type)
-            return move_item_up(item, state)
-        if move_down and action.type == move_down:
-            item = action.payload
-            assert isinstance(item, list_type)
-            return move_item_down(item, state)
-        return state
-
-    return reducer
+        delete_many: ActionType | None = None,
+        move_to: ActionType | None = None,
+) -> RoutedReducer[LIST]:
+    handlers: dict[ActionType, Reducer[LIST]] = {INIT: _init}
+    if add:
+        handlers[add] = _create_item_reducer(list_type, append_item)
+    if update:
+        handlers[update] = _create_item_reducer(list_type, replace_item)
+    if delete:
+        handlers[delete] = _create_item_reducer(list_type, remove_item)
+    if move_up:
+        handlers[move_up] = _create_item_reducer(list_type, move_item_up)
+    if move_down:
+        handlers[move_down] = _create_item_reducer(list_type, move_item_down)
+    if delete_many:
+        handlers[delete_many] = _create_items_reducer(list_type, remove_items)
+    if move_to:
+        handlers[move_to] = _create_move_to_reducer(list_type)
+    return create_reducer(handlers)
@@ -0,0 +1,73 @@
+import logging
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from urwid_assets.lib.redux.reducer import ActionTypeFactory, Action
+from urwid_assets.lib.redux.reselect import SelectorOffloader, MemoizedSelector
+from urwid_assets.lib.redux.store import Middleware, Store, NextReduce
+
+_LOGGER = logging.getLogger(__name__)
+
+_ACTION_TYPE_FACTORY = ActionTypeFactory(__name__)
+
+OFFLOAD_COMPLETED = _ACTION_TYPE_FACTORY.create('OFFLOAD_COMPLETED')
+
+
+@dataclass(frozen=True)
+class OffloadCompletion:
+    selector: MemoizedSelector
+    future: Future
+    complete: Callable[[Any], None]
+    fail: Callable[[], None]
+
+
+def _apply(get_result: Callable[[], Any], complete: Callable[[Any], None], fail: Callable[[], None]) -> None:
+    try:
+        result = get_result()
+    except Exception:
+        _LOGGER.exception('offloaded selector failed')
+        fail()
+    else:
+        complete(result)
+
+
+class Offloader(Middleware, SelectorOffloader):
+    # runs offloaded selectors on an executor and dispatches the results
+    # back to the store, the action leaves the state as it is but the
+    # notification that follows picks up the new results
+    def __init__(self, executor: Executor) -> None:
+        self._executor = executor
+        self._store: Store | None = None
+
+    def attach(self, store: Store) -> None:
+        self._store = store
+
+    def submit(self,
+               selector: MemoizedSelector,
+               select: Callable,
+               args: tuple[Any, ...],
+               complete: Callable[[Any], None],
+               fail: Callable[[], None]) -> None:
+        assert self._store is not None
+        if self._store.get_running_loop() is None:
+            # nothing would apply a result computed in the background
+            # (eg. when the UI has exited) so compute it in place
+            _apply(lambda: select(*args), complete, fail)
+            return
+        future = self._executor.submit(select, *args)
+        # the store marshals actions dispatched from other threads on to
+        # the event loop so the results are applied on the store's thread
+        future.add_done_callback(
+            lambda done: self._store.dispatch(Action(OFFLOAD_COMPLETED,
+                                                     OffloadCompletion(selector, done, complete, fail))))
+
+    def reduce(self, action: Action, next_reduce: NextReduce) -> None:
+        if action.type is OFFLOAD_COMPLETED:
+            completion: OffloadCompletion = action.payload
+            _apply(completion.future.result, completion.complete, completion.fail)
+        next_reduce(action)
+
+    def shutdown(self) -> None:
+        # results that are still pending would not be applied anyway
+        self._executor.shutdown(cancel_futures=True)
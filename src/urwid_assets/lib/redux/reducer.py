@@ -1,21 +1,34 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import TypeVar, Any, Callable
+from typing import TypeVar, Any, Callable, Generic
 
 STATE = TypeVar('STATE')
 
 
-@dataclass(frozen=True)
+# action types are interned (see ActionTypeFactory) so they
+# are compared and hashed by identity
+@dataclass(frozen=True, eq=False)
 class ActionType:
     namespace: str
     name: str
 
 
+_ACTION_TYPES: dict[str, dict[str, ActionType]] = {}
+
+
 class ActionTypeFactory:
     def __init__(self, namespace: str) -> None:
         self._namespace = namespace
+        self._action_types = _ACTION_TYPES.setdefault(namespace, {})
 
     def create(self, name: str) -> ActionType:
-        return ActionType(self._namespace, name)
+        try:
+            return self._action_types[name]
+        except KeyError:
+            action_type = ActionType(self._namespace, name)
+            self._action_types[name] = action_type
+            return action_type
 
 
 @dataclass(frozen=True)
@@ -33,21 +46,106 @@ class ReducerMapping:
     reducer: Reducer
 
 
-INIT = ActionType(__name__, 'INIT')
+INIT = ActionTypeFactory(__name__).create('INIT')
 INIT_ACTION = Action(
     INIT,
     None
 )
 
 
-def combine_reducers(
+class ReducerTracer:
+    def trace(self, field: str, reducer: Reducer[STATE], state: STATE, action: Action) -> STATE:
+        return reducer(state, action)
+
+
+_TRACER: ReducerTracer | None = None
+
+
+def set_reducer_tracer(tracer: ReducerTracer | None) -> ReducerTracer | None:
+    global _TRACER
+    previous = _TRACER
+    _TRACER = tracer
+    return previous
+
+
+class RoutedReducer(Generic[STATE]):
+    def __init__(self,
+                 handlers: dict[ActionType, Reducer[STATE]],
+                 default: Reducer[STATE] | None = None) -> None:
+        self._handlers = handlers
+        self._default = default
+
+    def get_action_types(self) -> tuple[ActionType, ...]:
+        return tuple(self._handlers.keys())
+
+    def is_exhaustive(self) -> bool:
+        # a reducer with a default handler has to see every action
+        return self._default is not None
+
+    def with_handlers(self, handlers: dict[ActionType, Reducer[STATE]]) -> RoutedReducer[STATE]:
+        return RoutedReducer({**self._handlers, **handlers}, self._default)
+
+    def __call__(self, state: STATE, action: Action) -> STATE:
+        handler = self._handlers.get(action.type, self._default)
+        if handler is None:
+            return state
+        return handler(state, action)
+
+
+def create_reducer(handlers: dict[ActionType, Reducer[STATE]]) -> RoutedReducer[STATE]:
+    return RoutedReducer(handlers)
+
+
+def _create_fields_reducer(
         state_class: Callable[[Any, ...], STATE],
-        reducer_map: tuple[ReducerMapping, ...]
+        reducer_map: tuple[ReducerMapping, ...],
+        routed_map: tuple[ReducerMapping, ...],
 ) -> Reducer:
-    def combined_reducer(state: STATE, action: Action) -> STATE:
-        kwargs = {reducer_mapping.field: reducer_mapping.reducer(
-            None if state is None else getattr(state, reducer_mapping.field), action
-        ) for reducer_mapping in reducer_map}
+    def fields_reducer(state: STATE, action: Action) -> STATE:
+        if state is None:
+            return state_class(**{reducer_mapping.field: reducer_mapping.reducer(None, action)
+                                  for reducer_mapping in reducer_map})
+        kwargs = None
+        tracer = _TRACER
+        for reducer_mapping in routed_map:
+            current = getattr(state, reducer_mapping.field)
+            if tracer is None:
+                next_ = reducer_mapping.reducer(current, action)
+            else:
+                next_ = tracer.trace(reducer_mapping.field, reducer_mapping.reducer, current, action)
+            if next_ is not current:
+                if kwargs is None:
+                    kwargs = {mapping.field: getattr(state, mapping.field) for mapping in reducer_map}
+                kwargs[reducer_mapping.field] = next_
+        # keep the identity of the state if nothing changed so that
+        # identity checks further down the line can short circuit
+        if kwargs is None:
+            return state
         return state_class(**kwargs)
 
-    return combined_reducer
+    return fields_reducer
+
+
+def combine_reducers(
+        state_class: Callable[[Any, ...], STATE],
+        reducer_map: tuple[ReducerMapping, ...]
+) -> RoutedReducer:
+    # build a table of the fields that handle each action type so that an
+    # action is only passed to the reducers that are registered for it, plain
+    # function reducers (and routed reducers with defaults) get every action
+    exhaustive_map = tuple(reducer_mapping for reducer_mapping in reducer_map
+                           if not isinstance(reducer_mapping.reducer, RoutedReducer)
+                           or reducer_mapping.reducer.is_exhaustive())
+    routes: dict[ActionType, tuple[ReducerMapping, ...]] = {}
+    for reducer_mapping in reducer_map:
+        if reducer_mapping not in exhaustive_map:
+            for action_type in reducer_mapping.reducer.get_action_types():
+                routes[action_type] = routes.get(action_type, tuple()) + (reducer_mapping,)
+    handlers = {action_type: _create_fields_reducer(
+        state_class,
+        reducer_map,
+        tuple(reducer_mapping for reducer_mapping in reducer_map
+              if reducer_mapping in routed_map or reducer_mapping in exhaustive_map)
+    ) for action_type, routed_map in routes.items()}
+    default = _create_fields_reducer(state_class, reducer_map, exhaustive_map) if len(exhaustive_map) > 0 else None
+    return RoutedReducer(handlers, default)
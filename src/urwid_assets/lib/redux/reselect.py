@@ -1,30 +1,142 @@
 from __future__ import annotations
 
-import itertools
+import logging
+import sys
+from collections import OrderedDict
+from collections.abc import Sequence
 from dataclasses import dataclass
-from functools import reduce
-from typing import Any, Callable
+from time import perf_counter
+from typing import Any, Callable, Hashable, Generic, TypeVar
+from weakref import ref, finalize
+
+from urwid_assets.lib.redux.equality import Equality
+
+_LOGGER = logging.getLogger(__name__)
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
 
 
 @dataclass(frozen=True)
 class SelectorCacheOptions:
     max_age: int = 0
+    # number of results kept by the level 1 cache, defaults to max_age + 1
+    capacity: int | None = None
+    # key the caches by the identities of the resolved arguments rather than
+    # their values, state is immutable so an unchanged argument is the same
+    # object and this saves hashing entire trees of frozen dataclasses
+    identity: bool = True
+    # only hold weak references to the arguments (where possible) so that
+    # the caches do not keep old states alive, requires identity
+    weak: bool = False
+
+    def __post_init__(self) -> None:
+        # the level 1 cache always holds at least the latest result
+        assert self.max_age >= 0
+        assert self.get_capacity() >= 1
+
+    def get_capacity(self) -> int:
+        return self.max_age + 1 if self.capacity is None else self.capacity
+
+
+@dataclass(frozen=True)
+class OffloadOptions:
+    # called with the resolved arguments for a value to return until the
+    # first result is ready, by default the first result is selected in place
+    placeholder: Callable[..., Any] | None = None
 
 
 @dataclass(frozen=True)
 class SelectorOptions:
     cache: SelectorCacheOptions = SelectorCacheOptions()
     dimensions: tuple[int, ...] = tuple()
+    # when a recomputed result is equal to the previous result then the
+    # previous result is returned instead so that selectors and tables
+    # downstream see an unchanged (identical) value
+    equality: Equality | None = None
+    # the name reported to the selector tracer, defaults to the
+    # qualified name of the wrapped selector
+    name: str | None = None
+    # hand recomputations to the selector offloader (if one is set) and
+    # return the last known result until the new result is ready
+    offload: OffloadOptions | None = None
 
 
 def _matches(args1: tuple[Any, ...], args2: tuple[Any, ...]) -> bool:
     if len(args1) == len(args2):
-        zipped = zip(args1, args2)
-        if reduce(lambda acc, args: args[0] is args[1], zipped, True):
-            return True
+        return all(arg1 is arg2 for arg1, arg2 in zip(args1, args2))
     return False
 
 
+def _weak_ref(value: Any, callback: Callable[[ref], None]) -> Callable[[], Any]:
+    try:
+        return ref(value, callback)
+    except TypeError:
+        # eg. None, int, str and tuple cannot be weakly referenced
+        return lambda: value
+
+
+class _ArgsKey:
+    def __init__(self) -> None:
+        # the keys of entries whose arguments may have been collected
+        self.collected: list[Hashable] = []
+
+    def create(self, args: tuple[Any, ...]) -> Hashable:
+        return args
+
+    def hold(self, _: tuple[Any, ...]) -> Any:
+        return None
+
+    def matches(self, _: Any, __: tuple[Any, ...]) -> bool:
+        return True
+
+    def is_alive(self, _: Any) -> bool:
+        return True
+
+
+class _IdentityArgsKey(_ArgsKey):
+    # the entries hold the arguments so that their ids cannot be reused
+    # while they are cached
+    def create(self, args: tuple[Any, ...]) -> Hashable:
+        return tuple(map(id, args))
+
+    def hold(self, args: tuple[Any, ...]) -> Any:
+        return args
+
+    def matches(self, held: Any, args: tuple[Any, ...]) -> bool:
+        return _matches(held, args)
+
+
+class _WeakIdentityArgsKey(_IdentityArgsKey):
+    # an entry whose arguments have been collected can no longer match, its
+    # key is added to collected so that the cache can release the result
+    def hold(self, args: tuple[Any, ...]) -> Any:
+        key = self.create(args)
+        # the callback must not refer to the cache, or this, so
+        # that the weak references do not keep them alive
+        collected = self.collected
+
+        def release(_: ref) -> None:
+            collected.append(key)
+
+        return tuple(_weak_ref(arg, release) for arg in args)
+
+    def matches(self, held: Any, args: tuple[Any, ...]) -> bool:
+        return _matches(tuple(weak_ref() for weak_ref in held), args)
+
+    def is_alive(self, held: Any) -> bool:
+        return not any(isinstance(weak_ref, ref) and weak_ref() is None for weak_ref in held)
+
+
+def _create_args_key(options: SelectorCacheOptions) -> _ArgsKey:
+    if options.weak:
+        assert options.identity
+        return _WeakIdentityArgsKey()
+    if options.identity:
+        return _IdentityArgsKey()
+    return _ArgsKey()
+
+
 # _CacheHit is used to wrap results so that we
 # can distinguish between a None result and
 # a cache miss
@@ -33,72 +145,354 @@ class _CacheHit:
     result: Any
 
 
+def _get_approximate_size(value: Any) -> int:
+    # only the value and its immediate children are counted as anything
+    # deeper is usually shared with the state or other results
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(sys.getsizeof(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(sys.getsizeof(item) for item in value.values())
+    return size
+
+
+class _BudgetedCache:
+    # the most recently used entry of a cache is in use and so is never
+    # evicted, otherwise the selector would have to recompute every time
+    def is_protected(self, key: Any) -> bool:
+        return False
+
+    def evict(self, key: Any) -> None:
+        pass
+
+
+class _BudgetEntry:
+    def __init__(self, cache: _BudgetedCache, key: Any, size: int) -> None:
+        # the budget must not keep the caches of discarded selectors alive
+        self.cache = ref(cache)
+        self.key = key
+        self.size = size
+
+
+class _MemoryBudget:
+    def __init__(self) -> None:
+        # least recently used first
+        self._entries: OrderedDict[_BudgetEntry, None] = OrderedDict()
+        self._budget: int | None = None
+        self.size = 0
+
+    def set_budget(self, budget: int | None) -> None:
+        self._budget = budget
+        self._enforce()
+
+    def add(self, cache: _BudgetedCache, key: Any, size: int) -> _BudgetEntry:
+        entry = _BudgetEntry(cache, key, size)
+        self._entries[entry] = None
+        self.size += size
+        self._enforce()
+        return entry
+
+    def touch(self, entry: _BudgetEntry) -> None:
+        self._entries.move_to_end(entry)
+
+    def remove(self, entry: _BudgetEntry) -> None:
+        del self._entries[entry]
+        self.size -= entry.size
+
+    def release(self, entries: dict[Any, _BudgetEntry]) -> None:
+        # called when a cache is collected
+        for entry in entries.values():
+            self.remove(entry)
+
+    def _enforce(self) -> None:
+        if self._budget is None or self.size <= self._budget:
+            return
+        protected: list[_BudgetEntry] = []
+        evicted = 0
+        released = 0
+        while self.size > self._budget and len(self._entries) > 0:
+            entry, _ = self._entries.popitem(last=False)
+            cache = entry.cache()
+            if cache is not None and cache.is_protected(entry.key):
+                protected.append(entry)
+                continue
+            self.size -= entry.size
+            if cache is not None:
+                cache.evict(entry.key)
+            evicted += 1
+            released += entry.size
+        # put the protected entries back in their original order
+        for entry in reversed(protected):
+            self._entries[entry] = None
+            self._entries.move_to_end(entry, last=False)
+        if evicted > 0:
+            _LOGGER.debug('evicted %d selector cache entries (%d bytes) to stay within %d bytes',
+                          evicted, released, self._budget)
+
+
+# only caches that can hold more than the current result (ie. with a
+# capacity or max_age) are counted as the rest cannot be evicted anyway
+_BUDGET = _MemoryBudget()
+
+
+def set_selector_cache_budget(budget: int | None) -> None:
+    # an approximate limit in bytes on the results held by all of the
+    # selector caches, None for no limit
+    _BUDGET.set_budget(budget)
+
+
 class _Level2Cache:
-    def __init__(self):
-        self._results: dict[tuple[Any, ...], Any] = {}
+    def __init__(self, args_key: _ArgsKey):
+        self._results: dict[Hashable, tuple[Any, Any]] = {}
+        self._args_key = args_key
 
     def push(self, args: tuple[Any, ...], result: Any) -> None:
-        self._results[args] = result
+        self._results[self._args_key.create(args)] = (self._args_key.hold(args), result)
 
     def get(self, args: tuple[Any, ...]) -> _CacheHit | None:
         try:
-            return _CacheHit(self._results[args])
+            held, result = self._results[self._args_key.create(args)]
         except KeyError:
             return None
+        if self._args_key.matches(held, args):
+            return _CacheHit(result)
+        return None
 
     def pop(self, args: tuple[Any, ...]) -> _CacheHit | None:
+        key = self._args_key.create(args)
         try:
-            return _CacheHit(self._results.pop(args))
+            held, result = self._results[key]
         except KeyError:
             return None
+        if self._args_key.matches(held, args):
+            del self._results[key]
+            return _CacheHit(result)
+        return None
 
+    def purge(self, keys: tuple[Hashable, ...]) -> None:
+        for key in keys:
+            entry = self._results.get(key)
+            if entry is not None and not self._args_key.is_alive(entry[0]):
+                del self._results[key]
 
-class _Level2CacheHistory:
+    def get_approximate_size(self) -> int:
+        return sys.getsizeof(self._results) + sum(_get_approximate_size(result) for _, result in self._results.values())
+
+
+class _Level2CacheHistory(_BudgetedCache):
 
     def __init__(self, options: SelectorCacheOptions):
         self._next_cache: _Level2Cache | None = None
         self._caches: tuple[_Level2Cache, ...] = tuple()
         self._options = options
+        self._args_key = _create_args_key(options)
+        self._budget = _BUDGET if options.max_age > 0 else None
+        self._budget_entries: dict[_Level2Cache, _BudgetEntry] = {}
+        if self._budget is not None:
+            finalize(self, self._budget.release, self._budget_entries)
+        self.hits = 0
+        self.misses = 0
 
     def start_next(self):
-        self._next_cache = _Level2Cache()
+        self._next_cache = _Level2Cache(self._args_key)
 
     def commit(self):
-        self._caches = (self._next_cache,) + self._caches[:self._options.max_age]
+        max_age = self._options.max_age
+        collected = self._args_key.collected
+        if len(collected) > 0:
+            keys = tuple(collected)
+            collected.clear()
+            for cache in (self._next_cache,) + self._caches[:max_age]:
+                cache.purge(keys)
+        if self._budget is not None:
+            for cache in self._caches[max_age:]:
+                self._budget.remove(self._budget_entries.pop(cache))
+        self._caches = (self._next_cache,) + self._caches[:max_age]
+        if self._budget is not None:
+            self._budget_entries[self._next_cache] = self._budget.add(self, self._next_cache,
+                                                                     self._next_cache.get_approximate_size())
         self._next_cache = None
 
+    def is_protected(self, key: Any) -> bool:
+        return len(self._caches) > 0 and self._caches[0] is key
+
+    def evict(self, key: Any) -> None:
+        del self._budget_entries[key]
+        self._caches = tuple(cache for cache in self._caches if cache is not key)
+
     def find(self, args: tuple[Any, ...]) -> _CacheHit | None:
         cache_hit = self._next_cache.get(args)
         if cache_hit is not None:
+            self.hits += 1
             return cache_hit
         for cache in self._caches:
             cache_hit = cache.pop(args)
             if cache_hit is not None:
                 self._next_cache.push(args, cache_hit.result)
+                self.hits += 1
                 return cache_hit
+        self.misses += 1
         return None
 
     def add(self, args: tuple[Any, ...], result: Any) -> None:
         self._next_cache.push(args, result)
 
 
-class _Level1Cache:
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+
+
+class _Level1Cache(_BudgetedCache):
 
     def __init__(self, options: SelectorCacheOptions):
-        self._results: dict[tuple[Any, ...], Any] = {}
-        self._options = options
+        # least recently used first
+        self._results: OrderedDict[Hashable, tuple[Any, Any]] = OrderedDict()
+        self._args_key = _create_args_key(options)
+        self._capacity = options.get_capacity()
+        self._budget = _BUDGET if self._capacity > 1 else None
+        self._budget_entries: dict[Hashable, _BudgetEntry] = {}
+        if self._budget is not None:
+            finalize(self, self._budget.release, self._budget_entries)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _purge(self) -> None:
+        # release the results of the entries whose arguments have been collected,
+        # the key may have been reused by a new entry since so check it is dead
+        collected = self._args_key.collected
+        while len(collected) > 0:
+            key = collected.pop()
+            entry = self._results.get(key)
+            if entry is not None and not self._args_key.is_alive(entry[0]):
+                del self._results[key]
+                if self._budget is not None:
+                    self._budget.remove(self._budget_entries.pop(key))
 
     def find(self, args: tuple[Any, ...]) -> _CacheHit | None:
+        if len(self._args_key.collected) > 0:
+            self._purge()
+        key = self._args_key.create(args)
         try:
-            return _CacheHit(self._results[args])
+            held, result = self._results[key]
         except KeyError:
+            self._misses += 1
             return None
+        if not self._args_key.matches(held, args):
+            self._misses += 1
+            return None
+        self._results.move_to_end(key)
+        if self._budget is not None:
+            self._budget.touch(self._budget_entries[key])
+        self._hits += 1
+        return _CacheHit(result)
 
     def add(self, args: tuple[Any, ...], result: Any) -> None:
-        self._results = {
-            **{args: result},
-            **dict(itertools.islice(self._results.items(), None, self._options.max_age))
-        }
+        if len(self._args_key.collected) > 0:
+            self._purge()
+        key = self._args_key.create(args)
+        self._results[key] = (self._args_key.hold(args), result)
+        self._results.move_to_end(key)
+        while len(self._results) > self._capacity:
+            evicted, _ = self._results.popitem(last=False)
+            if self._budget is not None:
+                self._budget.remove(self._budget_entries.pop(evicted))
+            self._evictions += 1
+        if self._budget is not None:
+            if key in self._budget_entries:
+                self._budget.remove(self._budget_entries[key])
+            self._budget_entries[key] = self._budget.add(self, key, _get_approximate_size(result))
+
+    def is_protected(self, key: Any) -> bool:
+        return next(reversed(self._results)) == key
+
+    def evict(self, key: Any) -> None:
+        del self._results[key]
+        del self._budget_entries[key]
+        self._evictions += 1
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(self._hits, self._misses, self._evictions)
+
+
+class SelectorTracer:
+    def trace_hit(self, name: str) -> None:
+        pass
+
+    def trace_compute(self,
+                      name: str,
+                      level_2_hits: int,
+                      level_2_misses: int,
+                      elapsed: float,
+                      result: Any) -> None:
+        pass
+
+
+_TRACER: SelectorTracer | None = None
+
+
+def set_selector_tracer(tracer: SelectorTracer | None) -> SelectorTracer | None:
+    global _TRACER
+    previous = _TRACER
+    _TRACER = tracer
+    return previous
+
+
+class SelectorOffloader:
+    # complete (or fail) must be called on the thread that
+    # selects, the store's thread, once the result is ready
+    def submit(self,
+               selector: MemoizedSelector,
+               select: Callable,
+               args: tuple[Any, ...],
+               complete: Callable[[Any], None],
+               fail: Callable[[], None]) -> None:
+        complete(select(*args))
+
+
+_OFFLOADER: SelectorOffloader | None = None
+
+
+def set_selector_offloader(offloader: SelectorOffloader | None) -> SelectorOffloader | None:
+    global _OFFLOADER
+    previous = _OFFLOADER
+    _OFFLOADER = offloader
+    return previous
+
+
+class MemoizedSelector:
+    def __init__(self,
+                 selectors: tuple[Callable, ...],
+                 select_resolved: Callable[[tuple[Any, ...]], Any],
+                 level_1_cache: _Level1Cache) -> None:
+        self._selectors = selectors
+        self._select_resolved = select_resolved
+        self._level_1_cache = level_1_cache
+
+    def __call__(self, *args: Any) -> Any:
+        return self._select_resolved(tuple(selector(*args) for selector in self._selectors))
+
+    def get_selectors(self) -> tuple[Callable, ...]:
+        return self._selectors
+
+    # select from arguments that have already been resolved by the input
+    # selectors, eg. by a selector graph that pushes changes through
+    def select_resolved(self, resolved_args: tuple[Any, ...]) -> Any:
+        return self._select_resolved(resolved_args)
+
+    def get_cache_stats(self) -> CacheStats:
+        return self._level_1_cache.get_stats()
+
+
+def _get_name(next_selector: Callable) -> str:
+    try:
+        return next_selector.__qualname__
+    except AttributeError:
+        # eg. partials
+        return type(next_selector).__qualname__
 
 
 @dataclass(frozen=True)
@@ -107,9 +501,22 @@ class _ArgumentsTree:
     args: tuple[Any, ...] = None
 
 
-def create_selector(selectors: tuple[Callable, ...], next_selector: Callable, options=SelectorOptions()) -> Callable:
+def create_selector(selectors: tuple[Callable, ...],
+                    next_selector: Callable,
+                    options=SelectorOptions()) -> MemoizedSelector:
     level_1_cache = _Level1Cache(options.cache)
     level_2_cache_history = _Level2CacheHistory(options.cache)
+    equality = options.equality
+    name = options.name if options.name is not None else _get_name(next_selector)
+    previous_result: _CacheHit | None = None
+    offload = options.offload
+    # offloaded selectors are called in one go so they cannot be mapped
+    assert offload is None or len(options.dimensions) == 0
+    latest_result: _CacheHit | None = None
+    pending_args: tuple[Any, ...] | None = None
+    # mapping over just the first argument is by far the most common use
+    # of dimensions so it gets a fast path that skips the arguments tree
+    is_map = len(options.dimensions) > 0 and options.dimensions[0] == 1 and not any(options.dimensions[1:])
 
     def prepend_args(left_args: tuple[Any, ...], right_args: _ArgumentsTree) -> _ArgumentsTree:
         if right_args.sub_trees is None:
@@ -136,7 +543,7 @@ def create_selector(selectors: tuple[Callable, ...], next_selector: Callable, op
             # no dimensions just a single argument
             return _ArgumentsTree(args=(arg,))
         # recurse to expand the next dimension
-        assert isinstance(arg, tuple)
+        assert isinstance(arg, Sequence)
         return _ArgumentsTree(
             sub_trees=tuple(expand_dimensions(dimensions - 1, sub_arg) for sub_arg in arg)
         )
@@ -167,23 +574,136 @@ def create_selector(selectors: tuple[Callable, ...], next_selector: Callable, op
         # need to recurse and construct a (possibly multidimensional) tuple
         return tuple(expand_results(sub_tree) for sub_tree in arguments_tree.sub_trees)
 
-    def memoized_selector(*args: tuple[Any]) -> Any:
-        nonlocal level_2_cache_history
-        resolved_args = tuple(selector(*args) for selector in selectors)
-        cache_hit = level_1_cache.find(resolved_args)
-        if cache_hit is None:
-            level_2_cache_history.start_next()
-            resolved_args_length = len(resolved_args)
-            options_dimensions = options.dimensions
-            options_dimensions_length = len(options_dimensions)
-            dimensions = tuple(options_dimensions[index] if index < options_dimensions_length else 0
-                               for index in range(resolved_args_length))
-            dimensioned_args = tuple(zip(dimensions, resolved_args))
-            expanded_args = expand_args(dimensioned_args)
-            result = expand_results(expanded_args)
+    def map_results(resolved_args: tuple[Any, ...]) -> tuple[Any, ...]:
+        mapped = resolved_args[0]
+        assert isinstance(mapped, Sequence)
+        rest = resolved_args[1:]
+        find = level_2_cache_history.find
+        add = level_2_cache_history.add
+        results = []
+        for item in mapped:
+            args = (item,) + rest
+            cache_hit = find(args)
+            if cache_hit is None:
+                result = next_selector(*args)
+                add(args, result)
+                results.append(result)
+            else:
+                results.append(cache_hit.result)
+        return tuple(results)
+
+    def cut_off(result: Any) -> Any:
+        nonlocal previous_result
+        if equality is None:
+            return result
+        if previous_result is not None and equality(previous_result.result, result):
+            return previous_result.result
+        previous_result = _CacheHit(result)
+        return result
+
+    def compute(resolved_args: tuple[Any, ...]) -> Any:
+        level_2_cache_history.start_next()
+        if is_map:
+            result = cut_off(map_results(resolved_args))
             level_2_cache_history.commit()
             level_1_cache.add(resolved_args, result)
             return result
+        resolved_args_length = len(resolved_args)
+        options_dimensions = options.dimensions
+        options_dimensions_length = len(options_dimensions)
+        dimensions = tuple(options_dimensions[index] if index < options_dimensions_length else 0
+                           for index in range(resolved_args_length))
+        dimensioned_args = tuple(zip(dimensions, resolved_args))
+        expanded_args = expand_args(dimensioned_args)
+        result = cut_off(expand_results(expanded_args))
+        level_2_cache_history.commit()
+        level_1_cache.add(resolved_args, result)
+        return result
+
+    def offload_compute(resolved_args: tuple[Any, ...]) -> Any:
+        nonlocal latest_result, pending_args
+        offloader = _OFFLOADER
+        if offloader is None or (latest_result is None and offload.placeholder is None):
+            latest_result = _CacheHit(compute(resolved_args))
+            return latest_result.result
+        current = latest_result.result if latest_result is not None else offload.placeholder(*resolved_args)
+        if pending_args is not None and _matches(pending_args, resolved_args):
+            return current
+        pending_args = resolved_args
+
+        def complete(result: Any) -> None:
+            nonlocal latest_result, pending_args
+            if pending_args is resolved_args:
+                pending_args = None
+            result = cut_off(result)
+            level_1_cache.add(resolved_args, result)
+            latest_result = _CacheHit(result)
+
+        def fail() -> None:
+            nonlocal pending_args
+            if pending_args is resolved_args:
+                pending_args = None
+            # keep the current value for these arguments so that
+            # the selector is not offloaded again until they change
+            level_1_cache.add(resolved_args, current)
+
+        offloader.submit(memoized, next_selector, resolved_args, complete, fail)
+        if pending_args is resolved_args:
+            return current
+        # the offloader finished in place
+        return latest_result.result if latest_result is not None else current
+
+    miss = compute if offload is None else offload_compute
+
+    def select_resolved(resolved_args: tuple[Any, ...]) -> Any:
+        cache_hit = level_1_cache.find(resolved_args)
+        tracer = _TRACER
+        if cache_hit is None:
+            if tracer is None:
+                return miss(resolved_args)
+            # the input selectors have already been resolved so only the
+            # time spent in this selector is recorded
+            level_2_hits = level_2_cache_history.hits
+            level_2_misses = level_2_cache_history.misses
+            start = perf_counter()
+            result = miss(resolved_args)
+            tracer.trace_compute(name,
+                                 level_2_cache_history.hits - level_2_hits,
+                                 level_2_cache_history.misses - level_2_misses,
+                                 perf_counter() - start,
+                                 result)
+            return result
+        if tracer is not None:
+            tracer.trace_hit(name)
         return cache_hit.result
 
-    return memoized_selector
+    memoized = MemoizedSelector(selectors, select_resolved, level_1_cache)
+    return memoized
+
+
+class ParameterizedSelector(Generic[K, T]):
+    def __init__(self, create: Callable[[K], T], capacity: int) -> None:
+        # least recently used first
+        self._selectors: OrderedDict[K, T] = OrderedDict()
+        self._create = create
+        self._capacity = capacity
+
+    def __call__(self, key: K) -> T:
+        try:
+            selector = self._selectors[key]
+        except KeyError:
+            selector = self._create(key)
+            self._selectors[key] = selector
+            while len(self._selectors) > self._capacity:
+                self._selectors.popitem(last=False)
+            return selector
+        self._selectors.move_to_end(key)
+        return selector
+
+
+def create_parameterized_selector(create: Callable[[K], T], capacity: int) -> ParameterizedSelector[K, T]:
+    # create builds the selectors (or a pipeline of selectors) for a key, eg.
+    # a uuid, they are kept for the most recently used keys so that their
+    # caches are still warm when the key is selected again
+    assert capacity > 0
+    return ParameterizedSelector(create, capacity)
@@ -0,0 +1,142 @@
+import logging
+from heapq import heappush, heappop
+from itertools import count
+from typing import Any, Callable
+
+from urwid_assets.lib.redux.offload import OFFLOAD_COMPLETED
+from urwid_assets.lib.redux.reducer import Action
+from urwid_assets.lib.redux.reselect import MemoizedSelector
+from urwid_assets.lib.redux.store import Middleware, Store, NextNotify, Subscription, Unsubscribe, \
+    get_subscription_name
+
+_LOGGER = logging.getLogger(__name__)
+
+_INDICES = count()
+
+
+class _Node:
+    def __init__(self, selector: Callable, inputs: tuple['_Node', ...]) -> None:
+        self.selector = selector
+        self.inputs = inputs
+        # nodes are recomputed in order of depth so that all of the
+        # inputs of a node are up-to-date before it is recomputed
+        self.depth: int = 1 + max((node.depth for node in inputs), default=-1)
+        self.index: int = next(_INDICES)
+        self.dependents: list[_Node] = []
+        self.references: int = 0
+        self.value: Any = None
+
+    def select(self, state: Any) -> Any:
+        if isinstance(self.selector, MemoizedSelector):
+            return self.selector.select_resolved(tuple(node.value for node in self.inputs))
+        # anything other than a memoized selector is a root
+        # that selects from the state directly
+        return self.selector(state)
+
+
+class _GraphSubscription:
+    def __init__(self, subscription: Subscription, nodes: tuple[_Node, ...]) -> None:
+        self.subscription = subscription
+        self.nodes = nodes
+        self.name = get_subscription_name(subscription)
+
+
+class SelectorGraph(Middleware):
+    # builds a dependency graph from the input selectors of the memoized
+    # selectors that are subscribed to and, once per notification, pushes
+    # changes from the roots (eg. select_saved and select_ui) through it so
+    # that only the nodes downstream of a changed slice are recomputed
+    def __init__(self) -> None:
+        self._store: Store | None = None
+        self._state: Any = None
+        self._nodes: dict[Callable, _Node] = {}
+        self._roots: tuple[_Node, ...] = tuple()
+        self._subscriptions: tuple[_GraphSubscription, ...] = tuple()
+
+    def attach(self, store: Store) -> None:
+        self._store = store
+        self._state = store.get_state()
+
+    def is_attached(self) -> bool:
+        return self._store is not None
+
+    def subscribe(self, subscription: Subscription, selectors: tuple[Callable, ...]) -> Unsubscribe:
+        # the subscription is called when any of the selected values change
+        assert self._store is not None
+        entry = _GraphSubscription(subscription, tuple(self._retain(selector) for selector in selectors))
+        self._subscriptions += (entry,)
+
+        def unsubscribe() -> None:
+            self._subscriptions = tuple(x for x in self._subscriptions if x is not entry)
+            for node in entry.nodes:
+                self._release(node)
+
+        return unsubscribe
+
+    def get_node_count(self) -> int:
+        return len(self._nodes)
+
+    def _retain(self, selector: Callable) -> _Node:
+        try:
+            node = self._nodes[selector]
+        except KeyError:
+            if isinstance(selector, MemoizedSelector):
+                inputs = tuple(self._retain(input_selector) for input_selector in selector.get_selectors())
+            else:
+                inputs = tuple()
+            node = _Node(selector, inputs)
+            node.value = node.select(self._state)
+            for input_node in inputs:
+                input_node.dependents.append(node)
+            if len(inputs) == 0:
+                self._roots += (node,)
+            self._nodes[selector] = node
+        node.references += 1
+        return node
+
+    def _release(self, node: _Node) -> None:
+        node.references -= 1
+        if node.references == 0:
+            del self._nodes[node.selector]
+            if len(node.inputs) == 0:
+                self._roots = tuple(x for x in self._roots if x is not node)
+            for input_node in node.inputs:
+                input_node.dependents.remove(node)
+                self._release(input_node)
+
+    def notify(self, actions: tuple[Action, ...], next_notify: NextNotify) -> None:
+        state = self._store.get_state()
+        # offloaded selectors have new results even though the state is the same
+        completed = tuple(self._nodes[action.payload.selector] for action in actions
+                          if action.type is OFFLOAD_COMPLETED and action.payload.selector in self._nodes)
+        if state is not self._state or len(completed) > 0:
+            self._state = state
+            changed = self._propagate(state, completed)
+            for subscription in self._subscriptions:
+                if any(node in changed for node in subscription.nodes):
+                    # through the middleware as for the store's own subscribers
+                    self._store.notify_subscriber(subscription.name, subscription.subscription)
+        next_notify()
+
+    def _propagate(self, state: Any, completed: tuple[_Node, ...]) -> set[_Node]:
+        changed: set[_Node] = set()
+        queued: set[_Node] = set()
+        dirty: list[tuple[int, int, _Node]] = []
+        for node in self._roots + completed:
+            if node not in queued:
+                heappush(dirty, (node.depth, node.index, node))
+                queued.add(node)
+        recomputed = 0
+        while len(dirty) > 0:
+            _, _, node = heappop(dirty)
+            value = node.select(state)
+            recomputed += 1
+            if value is not node.value:
+                node.value = value
+                changed.add(node)
+                for dependent in node.dependents:
+                    if dependent not in queued:
+                        heappush(dirty, (dependent.depth, dependent.index, dependent))
+                        queued.add(dependent)
+        _LOGGER.debug('recomputed %d of %d selectors, %d changed', recomputed, len(self._nodes), len(changed))
+        return changed
@@ -0,0 +1,74 @@
+import logging
+from collections.abc import Sized
+from typing import Any
+
+from urwid_assets.lib.redux.reselect import SelectorTracer
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _format_rate(hits: int, total: int) -> str:
+    if total == 0:
+        return u'-'
+    return u'%.0f%%' % (hits * 100 / total)
+
+
+class _SelectorProfile:
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.level_1_hits: int = 0
+        self.level_2_hits: int = 0
+        self.level_2_misses: int = 0
+        self.compute_time: float = 0.0
+        self.result_size: int | None = None
+
+
+class SelectorRegistry(SelectorTracer):
+    def __init__(self) -> None:
+        # selectors created for each instance of a view share a name
+        # and so they are reported together
+        self._profiles: dict[str, _SelectorProfile] = {}
+
+    def _get_profile(self, name: str) -> _SelectorProfile:
+        try:
+            return self._profiles[name]
+        except KeyError:
+            profile = _SelectorProfile()
+            self._profiles[name] = profile
+            return profile
+
+    def trace_hit(self, name: str) -> None:
+        profile = self._get_profile(name)
+        profile.calls += 1
+        profile.level_1_hits += 1
+
+    def trace_compute(self,
+                      name: str,
+                      level_2_hits: int,
+                      level_2_misses: int,
+                      elapsed: float,
+                      result: Any) -> None:
+        profile = self._get_profile(name)
+        profile.calls += 1
+        profile.level_2_hits += level_2_hits
+        profile.level_2_misses += level_2_misses
+        profile.compute_time += elapsed
+        profile.result_size = len(result) if isinstance(result, Sized) and not isinstance(result, str) else None
+
+    def get_report(self) -> tuple[str, ...]:
+        return tuple(
+            u'%s: %d calls, level 1 hits %s, level 2 hits %s, compute %.3fms, last size %s' % (
+                name,
+                profile.calls,
+                _format_rate(profile.level_1_hits, profile.calls),
+                _format_rate(profile.level_2_hits, profile.level_2_hits + profile.level_2_misses),
+                profile.compute_time * 1000,
+                u'-' if profile.result_size is None else profile.result_size,
+            ) for name, profile in sorted(self._profiles.items(),
+                                          key=lambda item: item[1].compute_time,
+                                          reverse=True)
+        )
+
+    def log_report(self) -> None:
+        for line in self.get_report():
+            _LOGGER.info(line)
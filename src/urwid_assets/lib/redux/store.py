@@ -1,37 +1,282 @@
-from typing import Callable, Generic, TypeVar
+import logging
+from asyncio import AbstractEventLoop, TimerHandle, get_running_loop
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from threading import get_ident
+from typing import Any, Callable, Generic, TypeVar
 
+from urwid_assets.lib.redux.equality import Equality, is_identical
 from urwid_assets.lib.redux.reducer import Reducer, INIT_ACTION, Action
 
+_LOGGER = logging.getLogger(__name__)
+
 STATE = TypeVar('STATE')
 
 Subscription = Callable[[], None]
 Unsubscribe = Callable[[], None]
+Selector = Callable[[STATE], Any]
+NextReduce = Callable[[Action], None]
+NextNotify = Callable[[], None]
+
+
+@dataclass(frozen=True)
+class CoalesceOptions:
+    # number of seconds to hold back notifications after a dispatch,
+    # 0 holds them until the next iteration of the event loop
+    window: float = 0.0
+
+
+class Middleware:
+    def attach(self, store: 'Store') -> None:
+        pass
+
+    def reduce(self, action: Action, next_reduce: NextReduce) -> None:
+        next_reduce(action)
+
+    # actions are all those reduced since the last notification
+    def notify(self, actions: tuple[Action, ...], next_notify: NextNotify) -> None:
+        next_notify()
+
+    def notify_subscriber(self, name: str, next_notify: NextNotify) -> None:
+        next_notify()
+
+
+@dataclass(frozen=True)
+class StoreOptions:
+    coalesce: CoalesceOptions | None = None
+    # queue actions dispatched while reducing or notifying and marshal
+    # actions dispatched from other threads on to the event loop
+    queue: bool = False
+    middleware: tuple[Middleware, ...] = tuple()
+
+
+def get_subscription_name(subscription: Subscription) -> str:
+    return getattr(subscription, '__qualname__', repr(subscription))
+
+
+class _Subscription(Generic[STATE]):
+    def __init__(self, subscription: Subscription):
+        self._subscription = subscription
+        self.name: str = get_subscription_name(subscription)
+
+    def notify(self, _: STATE) -> None:
+        self._subscription()
+
+
+class _SelectorSubscription(_Subscription[STATE]):
+    def __init__(self,
+                 subscription: Subscription,
+                 selector: Selector,
+                 equality: Equality,
+                 state: STATE):
+        super().__init__(subscription)
+        self._selector = selector
+        self._equality = equality
+        self._value = selector(state)
+
+    def notify(self, state: STATE) -> None:
+        value = self._selector(state)
+        if not self._equality(self._value, value):
+            self._value = value
+            self._subscription()
 
 
 class Store(Generic[STATE]):
-    def __init__(self, reducer: Reducer, initial_state: STATE | None = None):
-        self._subscriptions: tuple[Subscription, ...] = tuple()
+    def __init__(self,
+                 reducer: Reducer,
+                 initial_state: STATE | None = None,
+                 options: StoreOptions = StoreOptions(),
+                 loop: AbstractEventLoop | None = None):
+        self._subscriptions: tuple[_Subscription[STATE], ...] = tuple()
         self._state: STATE = None
         self._reducing: bool = False
         self._reducer = reducer
+        self._options = options
+        self._loop = loop
+        self._notify_handle: TimerHandle | None = None
+        self._pending_folded_notifications: int = 0
+        self._folded_notifications: int = 0
+        self._queue: deque[Action] = deque()
+        self._draining: bool = False
+        self._thread_id = get_ident()
+        self._unnotified_actions: list[Action] = []
+        self._reduce = self._create_reduce_chain()
         self._state = reducer(None, INIT_ACTION) if initial_state is None else initial_state
+        for middleware in options.middleware:
+            middleware.attach(self)
 
-    def subscribe(self, subscription: Subscription) -> Unsubscribe:
-        self._subscriptions += (subscription,)
+    def subscribe(self,
+                  subscription: Subscription,
+                  selector: Selector | None = None,
+                  equality: Equality = is_identical) -> Unsubscribe:
+        # with a selector the subscription is only called when the selected
+        # value changes (according to the equality policy) since the last call
+        entry = _Subscription(subscription) if selector is None else _SelectorSubscription(subscription,
+                                                                                          selector,
+                                                                                          equality,
+                                                                                          self._state)
+        self._subscriptions += (entry,)
 
         def unsubscribe() -> None:
-            self._subscriptions = tuple(x for x in self._subscriptions if x is not subscription)
+            self._subscriptions = tuple(x for x in self._subscriptions if x is not entry)
 
         return unsubscribe
 
     def dispatch(self, *actions: Action):
+        if self._options.queue:
+            self._enqueue(actions)
+            return
         assert not self._reducing
         self._reducing = True
         for action in actions:
-            self._state = self._reducer(self._state, action)
+            self._reduce(action)
         self._reducing = False
-        for subscription in self._subscriptions:
-            subscription()
+        self._request_notify()
+
+    def _create_reduce_chain(self) -> NextReduce:
+        next_reduce = self._reduce_action
+        for middleware in reversed(self._options.middleware):
+            next_reduce = _chain_reduce(middleware, next_reduce)
+        return next_reduce
+
+    def _reduce_action(self, action: Action) -> None:
+        self._state = self._reducer(self._state, action)
+        self._unnotified_actions.append(action)
+
+    def _enqueue(self, actions: tuple[Action, ...]) -> None:
+        if get_ident() != self._thread_id:
+            assert self._loop is not None
+            self._loop.call_soon_threadsafe(self._enqueue, actions)
+            return
+        self._queue.extend(actions)
+        if not self._draining:
+            self._drain()
+
+    def _drain(self) -> None:
+        self._draining = True
+        failure: Exception | None = None
+        try:
+            # actions dispatched by subscribers are queued up behind
+            # the current batch and reduced once it has been notified
+            while len(self._queue) > 0:
+                self._reducing = True
+                while len(self._queue) > 0:
+                    action = self._queue.popleft()
+                    try:
+                        self._reduce(action)
+                    except Exception as exception:
+                        # only the failing action is dropped, the others (eg.
+                        # dispatched from other threads) are still reduced
+                        _LOGGER.exception('dropped action %s.%s, %d actions still queued',
+                                          action.type.namespace, action.type.name, len(self._queue))
+                        if failure is None:
+                            failure = exception
+                self._reducing = False
+                self._request_notify()
+        finally:
+            self._reducing = False
+            self._draining = False
+        if failure is not None:
+            # as without the queue, the dispatcher sees the failure
+            raise failure
 
     def get_state(self):
         return self._state
+
+    def get_folded_notifications(self) -> int:
+        return self._folded_notifications
+
+    def flush(self) -> None:
+        if self._notify_handle is not None:
+            self._notify_handle.cancel()
+            self._notify_coalesced()
+
+    def get_running_loop(self) -> AbstractEventLoop | None:
+        if self._loop is not None:
+            return self._loop if self._loop.is_running() else None
+        try:
+            return get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _request_notify(self) -> None:
+        coalesce = self._options.coalesce
+        if coalesce is None:
+            self._notify()
+            return
+        if self._notify_handle is not None:
+            # a notification is already pending so fold this one into it
+            self._pending_folded_notifications += 1
+            self._folded_notifications += 1
+            return
+        loop = self.get_running_loop()
+        if loop is None:
+            # nothing would run a deferred notification (eg. the export
+            # and import commands) so notify straight away
+            self._notify()
+            return
+        self._notify_handle = loop.call_later(coalesce.window, self._notify_coalesced)
+
+    def _notify_coalesced(self) -> None:
+        if self._pending_folded_notifications > 0:
+            _LOGGER.debug('coalesced %d notifications', self._pending_folded_notifications)
+        self._notify_handle = None
+        self._pending_folded_notifications = 0
+        if self._options.queue and not self._draining:
+            # hold back actions dispatched by the subscribers until they
+            # have all been notified
+            self._draining = True
+            try:
+                self._notify()
+            finally:
+                self._draining = False
+            self._drain()
+        else:
+            self._notify()
+
+    def _notify(self) -> None:
+        actions = tuple(self._unnotified_actions)
+        self._unnotified_actions.clear()
+        next_notify = self._notify_subscriptions
+        for middleware in reversed(self._options.middleware):
+            next_notify = _chain_notify(middleware, actions, next_notify)
+        next_notify()
+
+    def notify_subscriber(self, name: str, notify: NextNotify) -> None:
+        # calls a subscriber through the middleware, this is also used by
+        # middleware that keeps its own subscribers (eg. the selector graph)
+        middleware = self._options.middleware
+        if len(middleware) == 0:
+            notify()
+            return
+        next_notify = notify
+        for entry in reversed(middleware):
+            next_notify = _chain_notify_subscriber(entry, name, next_notify)
+        next_notify()
+
+    def _notify_subscriptions(self) -> None:
+        state = self._state
+        for subscription in self._subscriptions:
+            self.notify_subscriber(subscription.name, partial(subscription.notify, state))
+
+
+def _chain_reduce(middleware: Middleware, next_reduce: NextReduce) -> NextReduce:
+    def reduce(action: Action) -> None:
+        middleware.reduce(action, next_reduce)
+
+    return reduce
+
+
+def _chain_notify(middleware: Middleware, actions: tuple[Action, ...], next_notify: NextNotify) -> NextNotify:
+    def notify() -> None:
+        middleware.notify(actions, next_notify)
+
+    return notify
+
+
+def _chain_notify_subscriber(middleware: Middleware, name: str, next_notify: NextNotify) -> NextNotify:
+    def notify() -> None:
+        middleware.notify_subscriber(name, next_notify)
+
+    return notify
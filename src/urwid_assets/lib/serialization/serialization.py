@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime
 from decimal import Decimal
 from types import UnionType
@@ -20,7 +21,7 @@ class UnknownSubType(Exception):
 def _serialize(value: T) -> Any:
     if value is None:
         return None
-    if isinstance(value, tuple):
+    if isinstance(value, Sequence) and not isinstance(value, str):
         return tuple(_serialize(item) for item in value)
     if isinstance(value, (Decimal, UUID)):
         return str(value)
@@ -38,9 +39,10 @@ def _deserialize(arg: Any, field_type: Type[T]) -> Any:
     type_args = get_args(field_type)
     if type_origin is UnionType:
         return _deserialize(arg, type_args[0])
-    if type_origin is tuple:
+    if isinstance(type_origin, type) and issubclass(type_origin, Sequence):
+        # also constructs other sequence types such as indexed lists
         assert isinstance(arg, list)
-        return tuple(_deserialize(item, type_args[0]) for item in arg)
+        return type_origin(_deserialize(item, type_args[0]) for item in arg)
     if issubclass(field_type, Decimal):
         assert isinstance(arg, str)
         return Decimal(arg)
@@ -1,10 +1,13 @@
 from datetime import datetime
 from decimal import Decimal
-from functools import reduce
 from uuid import UUID
+from weakref import WeakSet
 
-from urwid_assets.lib.dijkstra.dijkstra import Edge, dijkstra, Resolved, get_steps, UnreachableTarget
-from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions
+from urwid_assets.lib.dijkstra.conversion_matrix import ConversionMatrix
+from urwid_assets.lib.dijkstra.dijkstra import Edge
+from urwid_assets.lib.dijkstra.shortest_path_tree import Graph, ShortestPathTree
+from urwid_assets.lib.redux.equality import are_items_equal
+from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions, SelectorCacheOptions
 from urwid_assets.state.saved.assets.assets import Asset
 from urwid_assets.state.saved.data_sources.data_sources import DataSourceInstance
 from urwid_assets.state.saved.rates.rates import Rate
@@ -15,6 +18,11 @@ from urwid_assets.state.state import State
 from urwid_assets.state.ui.ui import UI, LoadedRate, get_loaded_rate, UnknownLoadedRate
 from urwid_assets.ui.views.helpers.format import format_timestamp
 
+# keep the results for a few base symbols so that switching
+# back and forth between them does not resolve the rates again,
+# weakly so that the asset lists of old states are not kept alive
+_BASE_SYMBOL_CACHE = SelectorCacheOptions(capacity=8, weak=True)
+
 
 def select_saved(state: State) -> Saved:
     return state.saved
@@ -128,47 +136,71 @@ def _select_rate_edge(rate: Rate,
                 ref=loaded_rate.rate)
 
 
-def _select_resolved_rates(edges: tuple[Edge[UUID, Decimal], ...], target_symbol: UUID) -> Resolved[UUID, Decimal]:
-    return dijkstra(
-        source=target_symbol,
-        edges=filter(lambda edge: edge is not None, edges)
-    )
-
-
 select_rate_edges = create_selector((
     select_rates,
     select_loaded_rates,
-), _select_rate_edge, SelectorOptions(dimensions=(1,)))
-
-select_resolved_rates = create_selector((
+), _select_rate_edge, SelectorOptions(dimensions=(1,), equality=are_items_equal))
+
+
+# the matrices that are still cached (or otherwise in use), each store (or
+# undone state) has its own so a new matrix is updated from the one with
+# the closest edges rather than from whichever was created last
+_CONVERSION_MATRICES: WeakSet[ConversionMatrix[UUID, Decimal]] = WeakSet()
+# keep the matrices of a few stores so that they do not replace each other
+_CONVERSION_MATRIX_CACHE = SelectorCacheOptions(capacity=4)
+
+
+def _select_conversion_matrix(edges: tuple[Edge[UUID, Decimal] | None, ...]) -> ConversionMatrix[UUID, Decimal]:
+    # rates are loaded (and reloaded) one at a time so each new matrix is
+    # updated from the previous one, which only repairs the paths that
+    # go through the changed edges
+    previous = None
+    fewest_changes = None
+    for matrix in tuple(_CONVERSION_MATRICES):
+        changes = matrix.count_changes(edges)
+        if changes is not None and (fewest_changes is None or changes < fewest_changes):
+            previous = matrix
+            fewest_changes = changes
+    if fewest_changes == 0:
+        # eg. the edges of another store, or an undone state, selected again
+        return previous
+    matrix = ConversionMatrix(edges, Decimal(1.0)) if previous is None else previous.update(edges)
+    _CONVERSION_MATRICES.add(matrix)
+    return matrix
+
+
+# a new matrix is only created when the edges change (which, thanks to
+# the equality check on the edges, is only when a rate really changes)
+# so switching the target symbol does not resolve the graph again for
+# any target that has been resolved before
+select_conversion_matrix = create_selector((
     select_rate_edges,
-    select_target_symbol_uuid,
-), _select_resolved_rates)
+), _select_conversion_matrix, SelectorOptions(cache=_CONVERSION_MATRIX_CACHE))
 
 
-def _select_rate_from_source_symbol(source_symbol: UUID, resolved: Resolved[UUID, Decimal]) -> Decimal | None:
-    # NB. the Dijkstra resolved list has paths from target to source here,
-    # so we need to reverse the steps (this is ok as the shortest paths
-    # are symmetrical, i.e. the shortest path from a to b is the reverse
-    # of the shortest path from b to a)
-    try:
-        steps = get_steps(source_symbol, resolved)
-    except UnreachableTarget:
-        # the symbol is not reachable from the source
-        return None
-    return reduce(lambda acc, rate: acc * rate,
-                  [step.ref if step.reversed else Decimal(1.0) / step.ref for step in reversed(steps)],
-                  Decimal(1.0))
+def _select_conversion_factors(matrix: ConversionMatrix[UUID, Decimal], target_symbol: UUID) -> dict[UUID, Decimal]:
+    return matrix.get_factors(target_symbol)
 
 
-def _select_asset_with_rate(asset: Asset, resolved: Resolved[UUID, Decimal]) -> tuple[Asset, Decimal | None]:
-    return asset, _select_rate_from_source_symbol(asset.symbol, resolved)
+# not offloaded, resolving the factors extends the shortest path trees
+# that the matrix shares with the matrices updated from it so it must
+# stay on the store's thread, and the last known factors would value
+# the assets in the previous target symbol until the new ones are ready
+select_conversion_factors = create_selector((
+    select_conversion_matrix,
+    select_target_symbol_uuid,
+), _select_conversion_factors)
+
+
+def _select_asset_with_rate(asset: Asset, factors: dict[UUID, Decimal]) -> tuple[Asset, Decimal | None]:
+    # symbols that are not reachable from the target symbol have no rate
+    return asset, factors.get(asset.symbol)
 
 
 select_assets_with_rates = create_selector((
     select_assets,
-    select_resolved_rates,
-), _select_asset_with_rate, SelectorOptions(dimensions=(1,)))
+    select_conversion_factors,
+), _select_asset_with_rate, SelectorOptions(cache=_BASE_SYMBOL_CACHE, dimensions=(1,), equality=are_items_equal))
 
 
 def _select_rates_by_data_source(data_source: DataSourceInstance,
@@ -185,6 +217,55 @@ select_rates_by_data_source = create_selector((
 ), _select_rates_by_data_source, SelectorOptions(dimensions=(1,)))
 
 
+def _select_needed_rates(rates: tuple[Rate, ...],
+                         assets: tuple[Asset, ...],
+                         target_symbol: UUID | None,
+                         excluded: frozenset[UUID] = frozenset()) -> frozenset[UUID]:
+    # the costs are known before any rates are loaded, so the rates on the
+    # shortest paths from the asset symbols to the target symbol are the
+    # only ones that will be used to value the assets (as long as they load)
+    if target_symbol is None:
+        return frozenset()
+    graph = Graph()
+    for key, rate in enumerate(rates):
+        if rate.to_symbol is not None and rate.uuid not in excluded:
+            graph.add(key, Edge(source=rate.from_symbol,
+                                target=rate.to_symbol,
+                                cost=rate.cost,
+                                ref=rate.uuid))
+    tree = ShortestPathTree(graph, target_symbol)
+    needed: set[UUID] = set()
+    visited: set[UUID] = set()
+    for asset in assets:
+        # paths share their steps nearer the target so stop
+        # at the first symbol that has been visited before
+        symbol = asset.symbol
+        while symbol not in visited:
+            visited.add(symbol)
+            parent = tree.get_parent(symbol)
+            if parent is None:
+                break
+            symbol, edge = parent
+            needed.add(edge.ref)
+    return frozenset(needed)
+
+
+select_needed_rates = create_selector((
+    select_rates,
+    select_assets,
+    select_target_symbol_uuid,
+), _select_needed_rates)
+
+
+def get_needed_rates(state: State, excluded: frozenset[UUID]) -> frozenset[UUID]:
+    # the rates needed to value the assets without the excluded rates,
+    # eg. to find other paths for the assets when rates fail to load
+    return _select_needed_rates(select_rates(state),
+                                select_assets(state),
+                                select_target_symbol_uuid(state),
+                                excluded)
+
+
 def _select_new_snapshot_asset(asset_with_rate: tuple[Asset, Decimal | None]) -> SnapshotAsset:
     asset, rate = asset_with_rate
     return SnapshotAsset(
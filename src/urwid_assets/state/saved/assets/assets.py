@@ -17,6 +17,8 @@ ADD_ASSET = ACTION_TYPE_FACTORY.create('ADD_ASSET')
 DELETE_ASSET = ACTION_TYPE_FACTORY.create('DELETE_ASSET')
 MOVE_ASSET_DOWN = ACTION_TYPE_FACTORY.create('MOVE_ASSET_DOWN')
 MOVE_ASSET_UP = ACTION_TYPE_FACTORY.create('MOVE_ASSET_UP')
+DELETE_ASSETS = ACTION_TYPE_FACTORY.create('DELETE_ASSETS')
+MOVE_ASSETS_TO = ACTION_TYPE_FACTORY.create('MOVE_ASSETS_TO')
 
 
 @serializable()
@@ -32,4 +34,6 @@ reducer = create_list_reducer(Asset,
                               update=UPDATE_ASSET,
                               delete=DELETE_ASSET,
                               move_up=MOVE_ASSET_UP,
-                              move_down=MOVE_ASSET_DOWN)
+                              move_down=MOVE_ASSET_DOWN,
+                              delete_many=DELETE_ASSETS,
+                              move_to=MOVE_ASSETS_TO)
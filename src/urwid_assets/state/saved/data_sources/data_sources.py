@@ -16,6 +16,8 @@ UPDATE_DATA_SOURCE = ACTION_TYPE_FACTORY.create('UPDATE_DATA_SOURCE')
 DELETE_DATA_SOURCE = ACTION_TYPE_FACTORY.create('DELETE_DATA_SOURCE')
 MOVE_DATA_SOURCE_DOWN = ACTION_TYPE_FACTORY.create('MOVE_DATA_SOURCE_DOWN')
 MOVE_DATA_SOURCE_UP = ACTION_TYPE_FACTORY.create('MOVE_DATA_SOURCE_UP')
+DELETE_DATA_SOURCES = ACTION_TYPE_FACTORY.create('DELETE_DATA_SOURCES')
+MOVE_DATA_SOURCES_TO = ACTION_TYPE_FACTORY.create('MOVE_DATA_SOURCES_TO')
 
 
 @serializable()
@@ -31,4 +33,6 @@ reducer = create_list_reducer(DataSourceInstance,
                               update=UPDATE_DATA_SOURCE,
                               delete=DELETE_DATA_SOURCE,
                               move_up=MOVE_DATA_SOURCE_UP,
-                              move_down=MOVE_DATA_SOURCE_DOWN)
+                              move_down=MOVE_DATA_SOURCE_DOWN,
+                              delete_many=DELETE_DATA_SOURCES,
+                              move_to=MOVE_DATA_SOURCES_TO)
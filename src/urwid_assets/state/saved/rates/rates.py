@@ -15,6 +15,8 @@ ADD_RATE = ACTION_TYPE_FACTORY.create('ADD_RATE')
 DELETE_RATE = ACTION_TYPE_FACTORY.create('DELETE_RATE')
 MOVE_RATE_DOWN = ACTION_TYPE_FACTORY.create('MOVE_RATE_DOWN')
 MOVE_RATE_UP = ACTION_TYPE_FACTORY.create('MOVE_RATE_UP')
+DELETE_RATES = ACTION_TYPE_FACTORY.create('DELETE_RATES')
+MOVE_RATES_TO = ACTION_TYPE_FACTORY.create('MOVE_RATES_TO')
 
 
 @serializable()
@@ -34,4 +36,6 @@ reducer = create_list_reducer(Rate,
                               update=UPDATE_RATE,
                               delete=DELETE_RATE,
                               move_up=MOVE_RATE_UP,
-                              move_down=MOVE_RATE_DOWN)
+                              move_down=MOVE_RATE_DOWN,
+                              delete_many=DELETE_RATES,
+                              move_to=MOVE_RATES_TO)
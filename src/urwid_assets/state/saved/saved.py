@@ -1,6 +1,7 @@
 import logging
 from dataclasses import dataclass
 
+from urwid_assets.lib.redux.list_reducer import EntityList
 from urwid_assets.lib.redux.reducer import combine_reducers, ReducerMapping, ActionTypeFactory, Action
 from urwid_assets.lib.serialization.serialization import serializable
 from urwid_assets.state.saved.assets.assets import Asset, reducer as assets_reducer
@@ -19,26 +20,26 @@ SET_SAVED = _ACTION_TYPE_FACTORY.create('SET_SAVED')
 @serializable()
 @dataclass(frozen=True)
 class Saved:
-    data_sources: tuple[DataSourceInstance, ...]
-    symbols: tuple[Symbol, ...]
-    rates: tuple[Rate, ...]
-    assets: tuple[Asset, ...]
-    snapshots: tuple[Snapshot, ...]
+    data_sources: EntityList[DataSourceInstance]
+    symbols: EntityList[Symbol]
+    rates: EntityList[Rate]
+    assets: EntityList[Asset]
+    snapshots: EntityList[Snapshot]
     version: int = 1
 
 
-_reducer = combine_reducers(Saved, (
+def _set_saved(_: Saved, action: Action) -> Saved:
+    saved = action.payload
+    assert isinstance(saved, Saved)
+    return saved
+
+
+reducer = combine_reducers(Saved, (
     ReducerMapping('data_sources', data_sources_reducer),
     ReducerMapping('symbols', symbols_reducer),
     ReducerMapping('rates', rates_reducer),
     ReducerMapping('assets', assets_reducer),
     ReducerMapping('snapshots', snapshots_reducer),
-))
-
-
-def reducer(saved: Saved, action: Action) -> Saved:
-    if action.type == SET_SAVED:
-        saved = action.payload
-        assert isinstance(saved, Saved)
-        return saved
-    return _reducer(saved, action)
+)).with_handlers({
+    SET_SAVED: _set_saved,
+})
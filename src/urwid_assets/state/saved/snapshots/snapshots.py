@@ -2,11 +2,12 @@ import logging
 from dataclasses import dataclass, replace
 from datetime import datetime
 from decimal import Decimal
+from typing import Callable
 from uuid import UUID
 
 from urwid_assets.lib.redux.list_reducer import ListItem, create_list_reducer, move_item_up, replace_item, \
-    move_item_down
-from urwid_assets.lib.redux.reducer import ActionTypeFactory, Action
+    move_item_down, EntityList, get_list_item
+from urwid_assets.lib.redux.reducer import ActionTypeFactory, Action, Reducer
 from urwid_assets.lib.serialization.serialization import serializable
 
 LOGGER = logging.getLogger(__name__)
@@ -17,6 +18,8 @@ UPDATE_SNAPSHOT = ACTION_TYPE_FACTORY.create('UPDATE_SNAPSHOT')
 DELETE_SNAPSHOT = ACTION_TYPE_FACTORY.create('DELETE_SNAPSHOT')
 MOVE_SNAPSHOT_DOWN = ACTION_TYPE_FACTORY.create('MOVE_SNAPSHOT_DOWN')
 MOVE_SNAPSHOT_UP = ACTION_TYPE_FACTORY.create('MOVE_SNAPSHOT_UP')
+DELETE_SNAPSHOTS = ACTION_TYPE_FACTORY.create('DELETE_SNAPSHOTS')
+MOVE_SNAPSHOTS_TO = ACTION_TYPE_FACTORY.create('MOVE_SNAPSHOTS_TO')
 MOVE_ASSET_SNAPSHOT_DOWN = ACTION_TYPE_FACTORY.create('MOVE_ASSET_SNAPSHOT_DOWN')
 MOVE_ASSET_SNAPSHOT_UP = ACTION_TYPE_FACTORY.create('MOVE_ASSET_SNAPSHOT_UP')
 
@@ -33,7 +36,7 @@ class SnapshotAsset(ListItem):
 @dataclass(frozen=True)
 class Snapshot(ListItem):
     name: str
-    assets: tuple[SnapshotAsset, ...]
+    assets: EntityList[SnapshotAsset]
     timestamp: datetime | None
 
 
@@ -50,44 +53,43 @@ class UnknownAssetSnapshot(Exception):
 
 
 def get_asset_snapshot(uuid: UUID, asset_snapshots: tuple[SnapshotAsset, ...]):
-    for asset_snapshot in asset_snapshots:
-        if asset_snapshot.uuid == uuid:
-            return asset_snapshot
-    raise UnknownAssetSnapshot(uuid)
+    asset_snapshot = get_list_item(asset_snapshots, uuid)
+    if asset_snapshot is None:
+        raise UnknownAssetSnapshot(uuid)
+    return asset_snapshot
 
 
 def get_snapshot(uuid: UUID, snapshots: tuple[Snapshot, ...]):
-    for snapshot in snapshots:
-        if snapshot.uuid == uuid:
-            return snapshot
-    raise UnknownSnapshot(uuid)
+    snapshot = get_list_item(snapshots, uuid)
+    if snapshot is None:
+        raise UnknownSnapshot(uuid)
+    return snapshot
 
 
-_reducer = create_list_reducer(Snapshot,
-                               add=ADD_SNAPSHOT,
-                               update=UPDATE_SNAPSHOT,
-                               delete=DELETE_SNAPSHOT,
-                               move_up=MOVE_SNAPSHOT_UP,
-                               move_down=MOVE_SNAPSHOT_DOWN)
-
-
-def reducer(snapshots: tuple[Snapshot, ...], action: Action) -> tuple[Snapshot, ...]:
-    if action.type == MOVE_ASSET_SNAPSHOT_UP:
-        (uuid, asset_snapshot) = action.payload
-        assert isinstance(uuid, UUID)
-        assert isinstance(asset_snapshot, SnapshotAsset)
-        try:
-            snapshot = get_snapshot(uuid, snapshots)
-            return replace_item(replace(snapshot, assets=move_item_up(asset_snapshot, snapshot.assets)), snapshots)
-        except UnknownSnapshot:
-            return snapshots
-    if action.type == MOVE_ASSET_SNAPSHOT_DOWN:
+def _create_move_asset_snapshot_reducer(
+        move: Callable[[SnapshotAsset, tuple[SnapshotAsset, ...]], tuple[SnapshotAsset, ...]]
+) -> Reducer[tuple[Snapshot, ...]]:
+    def move_asset_snapshot(snapshots: tuple[Snapshot, ...], action: Action) -> tuple[Snapshot, ...]:
         (uuid, asset_snapshot) = action.payload
         assert isinstance(uuid, UUID)
         assert isinstance(asset_snapshot, SnapshotAsset)
         try:
             snapshot = get_snapshot(uuid, snapshots)
-            return replace_item(replace(snapshot, assets=move_item_down(asset_snapshot, snapshot.assets)), snapshots)
+            return replace_item(replace(snapshot, assets=move(asset_snapshot, snapshot.assets)), snapshots)
         except UnknownSnapshot:
             return snapshots
-    return _reducer(snapshots, action)
+
+    return move_asset_snapshot
+
+
+reducer = create_list_reducer(Snapshot,
+                              add=ADD_SNAPSHOT,
+                              update=UPDATE_SNAPSHOT,
+                              delete=DELETE_SNAPSHOT,
+                              move_up=MOVE_SNAPSHOT_UP,
+                              move_down=MOVE_SNAPSHOT_DOWN,
+                              delete_many=DELETE_SNAPSHOTS,
+                              move_to=MOVE_SNAPSHOTS_TO).with_handlers({
+    MOVE_ASSET_SNAPSHOT_UP: _create_move_asset_snapshot_reducer(move_item_up),
+    MOVE_ASSET_SNAPSHOT_DOWN: _create_move_asset_snapshot_reducer(move_item_down),
+})
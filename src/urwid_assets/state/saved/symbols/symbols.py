@@ -2,7 +2,7 @@ import logging
 from dataclasses import dataclass
 from uuid import UUID
 
-from urwid_assets.lib.redux.list_reducer import ListItem, create_list_reducer
+from urwid_assets.lib.redux.list_reducer import ListItem, create_list_reducer, get_list_index
 from urwid_assets.lib.redux.reducer import ActionTypeFactory
 from urwid_assets.lib.serialization.serialization import serializable
 
@@ -14,6 +14,8 @@ ADD_SYMBOL = ACTION_TYPE_FACTORY.create('ADD_SYMBOL')
 DELETE_SYMBOL = ACTION_TYPE_FACTORY.create('DELETE_SYMBOL')
 MOVE_SYMBOL_DOWN = ACTION_TYPE_FACTORY.create('MOVE_SYMBOL_DOWN')
 MOVE_SYMBOL_UP = ACTION_TYPE_FACTORY.create('MOVE_SYMBOL_UP')
+DELETE_SYMBOLS = ACTION_TYPE_FACTORY.create('DELETE_SYMBOLS')
+MOVE_SYMBOLS_TO = ACTION_TYPE_FACTORY.create('MOVE_SYMBOLS_TO')
 
 
 @serializable()
@@ -29,10 +31,10 @@ class UnknownSymbol(Exception):
 
 
 def get_symbol_index(uuid: UUID, symbols: tuple[Symbol, ...]) -> int:
-    for index, symbol in enumerate(symbols):
-        if symbol.uuid == uuid:
-            return index
-    raise UnknownSymbol(uuid)
+    index = get_list_index(symbols, uuid)
+    if index is None:
+        raise UnknownSymbol(uuid)
+    return index
 
 
 def get_symbol(uuid: UUID, symbols: tuple[Symbol, ...]) -> Symbol:
@@ -44,4 +46,6 @@ reducer = create_list_reducer(Symbol,
                               update=UPDATE_SYMBOL,
                               delete=DELETE_SYMBOL,
                               move_up=MOVE_SYMBOL_UP,
-                              move_down=MOVE_SYMBOL_DOWN)
+                              move_down=MOVE_SYMBOL_DOWN,
+                              delete_many=DELETE_SYMBOLS,
+                              move_to=MOVE_SYMBOLS_TO)
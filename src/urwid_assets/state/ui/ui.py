@@ -4,7 +4,9 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-from urwid_assets.lib.redux.reducer import Action, ActionTypeFactory, INIT
+from urwid_assets.lib.redux.list_reducer import ListItem, EntityList, get_list_item, append_item, replace_item, \
+    get_list_index
+from urwid_assets.lib.redux.reducer import Action, ActionTypeFactory, INIT, create_reducer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,32 +26,22 @@ class UnknownLoadedRate(Exception):
 
 
 @dataclass(frozen=True)
-class LoadedRate:
-    uuid: UUID
+class LoadedRate(ListItem):
     rate: Decimal | None
     error: str | None
 
 
 def get_loaded_rate(uuid: UUID, loaded_rates: tuple[LoadedRate, ...]) -> LoadedRate | None:
-    for loaded_rate in loaded_rates:
-        if loaded_rate.uuid == uuid:
-            return loaded_rate
-    raise UnknownLoadedRate(uuid)
+    loaded_rate = get_list_item(loaded_rates, uuid)
+    if loaded_rate is None:
+        raise UnknownLoadedRate(uuid)
+    return loaded_rate
 
 
-def _get_index_of_loaded_rate(uuid: UUID, loaded_rates: tuple[LoadedRate, ...]) -> int:
-    for index, loaded_rate in enumerate(loaded_rates):
-        if loaded_rate.uuid == uuid:
-            return index
-    raise UnknownLoadedRate(uuid)
-
-
-def _set_loaded_rate(loaded_rate: LoadedRate, loaded_rates: tuple[LoadedRate, ...]) -> tuple[LoadedRate, ...]:
-    try:
-        index = _get_index_of_loaded_rate(loaded_rate.uuid, loaded_rates)
-    except UnknownLoadedRate:
-        return loaded_rates + (loaded_rate,)
-    return loaded_rate[:index] + (loaded_rate,) + loaded_rate[index + 1:]
+def _put_loaded_rate(loaded_rate: LoadedRate, loaded_rates: tuple[LoadedRate, ...]) -> EntityList[LoadedRate]:
+    if get_list_index(loaded_rates, loaded_rate.uuid) is None:
+        return append_item(loaded_rate, loaded_rates)
+    return replace_item(loaded_rate, loaded_rates)
 
 
 @dataclass(frozen=True)
@@ -57,28 +49,46 @@ class UI:
     target_symbol: UUID | None = None
     timestamp: datetime | None = None
     last_update_time: datetime | None = None
-    loaded_rates: tuple[LoadedRate, ...] = tuple()
-
-
-def reducer(ui: UI, action: Action) -> UI:
-    if action.type == INIT:
-        return UI()
-    if action.type == SET_TARGET_SYMBOL:
-        target_symbol = action.payload
-        assert isinstance(target_symbol, UUID)
-        return replace(ui, target_symbol=target_symbol)
-    if action.type == SET_TIMESTAMP:
-        timestamp = action.payload
-        assert isinstance(timestamp, datetime | None)
-        return replace(ui, timestamp=timestamp, loaded_rates=tuple())
-    if action.type == SET_LAST_UPDATE_TIME:
-        last_update_time = action.payload
-        assert isinstance(last_update_time, datetime | None)
-        return replace(ui, last_update_time=last_update_time)
-    if action.type == START_LOADING_RATES:
-        return replace(ui, loaded_rates=tuple())
-    if action.type == SET_LOADED_RATE:
-        loaded_rate = action.payload
-        assert isinstance(loaded_rate, LoadedRate)
-        return replace(ui, loaded_rates=_set_loaded_rate(loaded_rate, ui.loaded_rates))
-    return ui
+    loaded_rates: EntityList[LoadedRate] = EntityList()
+
+
+def _init(_: UI, __: Action) -> UI:
+    return UI()
+
+
+def _set_target_symbol(ui: UI, action: Action) -> UI:
+    target_symbol = action.payload
+    assert isinstance(target_symbol, UUID)
+    return replace(ui, target_symbol=target_symbol)
+
+
+def _set_timestamp(ui: UI, action: Action) -> UI:
+    timestamp = action.payload
+    assert isinstance(timestamp, datetime | None)
+    return replace(ui, timestamp=timestamp, loaded_rates=EntityList())
+
+
+def _set_last_update_time(ui: UI, action: Action) -> UI:
+    last_update_time = action.payload
+    assert isinstance(last_update_time, datetime | None)
+    return replace(ui, last_update_time=last_update_time)
+
+
+def _start_loading_rates(ui: UI, _: Action) -> UI:
+    return replace(ui, loaded_rates=EntityList())
+
+
+def _set_loaded_rate(ui: UI, action: Action) -> UI:
+    loaded_rate = action.payload
+    assert isinstance(loaded_rate, LoadedRate)
+    return replace(ui, loaded_rates=_put_loaded_rate(loaded_rate, ui.loaded_rates))
+
+
+reducer = create_reducer({
+    INIT: _init,
+    SET_TARGET_SYMBOL: _set_target_symbol,
+    SET_TIMESTAMP: _set_timestamp,
+    SET_LAST_UPDATE_TIME: _set_last_update_time,
+    START_LOADING_RATES: _start_loading_rates,
+    SET_LOADED_RATE: _set_loaded_rate,
+})
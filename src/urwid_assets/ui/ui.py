@@ -3,6 +3,10 @@ from asyncio import AbstractEventLoop
 from injector import inject
 from urwid import ExitMainLoop, MainLoop, AsyncioEventLoop
 
+from urwid_assets.lib.redux.offload import Offloader
+from urwid_assets.lib.redux.reselect import set_selector_offloader
+from urwid_assets.lib.redux.store import Store
+from urwid_assets.state.state import State
 from urwid_assets.ui.views.ui_view import UIView
 
 
@@ -10,15 +14,28 @@ class UI:
     @inject
     def __init__(self,
                  ui_view: UIView,
-                 loop: AbstractEventLoop) -> None:
-        ui_view.activate()
-        MainLoop(ui_view,
-                 event_loop=AsyncioEventLoop(loop=loop),
-                 palette=[
-                     ('reversed', 'standout', ''),
-                 ],
-                 unhandled_input=self._global_keys,
-                 pop_ups=True).run()
+                 store: Store[State],
+                 loop: AbstractEventLoop,
+                 offloader: Offloader) -> None:
+        # the selectors are created on import so they find
+        # the offloader through a global rather than injection
+        previous_offloader = set_selector_offloader(offloader)
+        try:
+            ui_view.activate()
+            MainLoop(ui_view,
+                     event_loop=AsyncioEventLoop(loop=loop),
+                     palette=[
+                         ('reversed', 'standout', ''),
+                         ('marked', 'bold', ''),
+                     ],
+                     unhandled_input=self._global_keys,
+                     pop_ups=True).run()
+            # the loop stops without running notifications that are still held
+            # back, eg. the one that persists an edit made just before quitting
+            store.flush()
+        finally:
+            set_selector_offloader(previous_offloader)
+            offloader.shutdown()
 
     def _global_keys(self, key: str) -> None:
         if key in ('q', 'Q'):
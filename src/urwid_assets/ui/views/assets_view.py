@@ -7,13 +7,15 @@ from injector import inject, singleton, ClassAssistedBuilder
 from urwid import Frame, Columns, Text, connect_signal, LineBox, RIGHT
 
 from urwid_assets.lib.data_sources.data_source_registry import DataSourceRegistry
-from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions
+from urwid_assets.lib.redux.history import History
+from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions, OffloadOptions
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
 from urwid_assets.lib.redux.store import Store, Action
 from urwid_assets.selectors.selectors import \
     select_assets_with_rates, select_target_symbol_uuid, select_timestamp, select_new_snapshot_assets, select_symbols, \
-    select_target_symbol_name, select_timestamp_text, select_resolved_timestamp
+    select_target_symbol_name, select_timestamp_text, select_resolved_timestamp, select_assets
 from urwid_assets.state.saved.assets.assets import MOVE_ASSET_DOWN, MOVE_ASSET_UP, Asset, UPDATE_ASSET, ADD_ASSET, \
-    DELETE_ASSET
+    DELETE_ASSET, DELETE_ASSETS, MOVE_ASSETS_TO
 from urwid_assets.state.saved.snapshots.snapshots import ADD_SNAPSHOT
 from urwid_assets.state.saved.symbols.symbols import get_symbol, Symbol, get_symbol_index
 from urwid_assets.state.state import State
@@ -22,6 +24,7 @@ from urwid_assets.ui.views.helpers.asset_dialog_config import DefaultAssetDialog
     apply_asset_to_asset_dialog_config, \
     asset_from_config_values
 from urwid_assets.ui.views.helpers.format import format_amount, format_currency, get_value_text, get_price_text
+from urwid_assets.ui.views.helpers.move_to_dialog import create_move_to_dialog
 from urwid_assets.ui.views.helpers.snapshot_dialog_config import create_snapshot_dialog_config, \
     snapshot_from_add_config_values
 from urwid_assets.ui.views.helpers.timestamp_dialog_config import create_timestamp_dialog_config, \
@@ -74,9 +77,11 @@ def _select_total_from_assets(assets_with_rate: tuple[tuple[Asset, Decimal | Non
     return 'Total: ' + format_currency(sum(values))
 
 
+# the total is summed over every asset so it is offloaded
+# to keep the UI responsive when there are a lot of them
 _select_total = create_selector((
     select_assets_with_rates,
-), _select_total_from_assets)
+), _select_total_from_assets, SelectorOptions(offload=OffloadOptions()))
 
 
 def _select_snapshot_name_from_timestamp(target_symbol_name: str,
@@ -95,11 +100,14 @@ class AssetsView(LinkedView):
     @inject
     def __init__(self,
                  store: Store[State],
+                 history: History,
+                 selector_graph: SelectorGraph,
                  view_manager: ViewManager,
                  default_asset_dialog_config_factory: DefaultAssetDialogConfigFactory,
                  data_source_registry: DataSourceRegistry,
                  config_dialog_builder: ClassAssistedBuilder[ConfigDialog]) -> None:
         self._store = store
+        self._history = history
         state = self._store.get_state()
         self._view_manager = view_manager
         self._default_asset_dialog_config_factory = default_asset_dialog_config_factory
@@ -113,13 +121,17 @@ class AssetsView(LinkedView):
             KeyHandler(('h', 'H'), self._show_help),
             KeyHandler(('enter',), self._table.with_current_row_data(self._edit_asset)),
             KeyHandler(('a', 'A'), self._add_asset),
-            KeyHandler(('backspace',), self._table.with_current_row_data(self._delete_asset)),
+            KeyHandler(('backspace',), self._table.with_marked_rows_data(self._delete_assets)),
             KeyHandler(('j', 'J'), self._table.with_current_row_data(self._move_asset_down)),
             KeyHandler(('k', 'K'), self._table.with_current_row_data(self._move_asset_up)),
             KeyHandler(('r', 'R'), self._refresh_rates),
             KeyHandler(('b', 'B'), self._set_base_symbol),
             KeyHandler(('t', 'T'), self._set_timestamp),
             KeyHandler(('s', 'S'), self._create_snapshot),
+            KeyHandler((' ',), self._table.toggle_marked),
+            KeyHandler(('m', 'M'), self._table.with_marked_rows_data(self._move_assets_to)),
+            KeyHandler(('u', 'U'), self._history.undo),
+            KeyHandler(('ctrl r',), self._history.redo),
         ))
         super().__init__(Frame(
             LineBox(self._table),
@@ -132,7 +144,12 @@ class AssetsView(LinkedView):
                 ('weight', 1, Text(u'h - Help')),
                 ('weight', 1, self._total_text),
             ))),
-        ), store)
+        ), store, (
+            _select_rows,
+            _select_total,
+            select_timestamp_text,
+            select_target_symbol_name,
+        ), selector_graph)
 
     def keypress(self, size: int, key: str) -> str | None:
         if super().keypress(size, key) is None:
@@ -208,13 +225,17 @@ class AssetsView(LinkedView):
                                      u'',
                                      u' a         - Add a new asset',
                                      u' enter     - Edit the selected asset',
-                                     u' backspace - Delete the selected asset',
+                                     u' space     - Mark the selected asset',
+                                     u' backspace - Delete the marked (or selected) assets',
                                      u' k         - Move the selected asset UP',
                                      u' j         - Move the selected asset DOWN',
                                      u' r         - Refresh rates',
                                      u' b         - Set base symbol',
                                      u' t         - Set timestamp',
                                      u' s         - Take a snapshot',
+                                     u' m         - Move the marked (or selected) assets before another',
+                                     u' u         - Undo',
+                                     u' ctrl r    - Redo',
                                      u'',
                                      u' q - quit',
                                  )
@@ -260,6 +281,35 @@ class AssetsView(LinkedView):
         self._store.dispatch(Action(DELETE_ASSET, asset))
         self._view_manager.close_dialog()
 
+    def _delete_assets(self, assets: tuple[Asset, ...]) -> None:
+        if len(assets) == 1:
+            self._delete_asset(assets[0])
+            return
+        confirm_dialog = MessageBox(u'Delete: %d assets' % len(assets),
+                                    u'Are you sure you wish to delete %d assets' % len(assets),
+                                    MessageBoxButtons.OK_CANCEL)
+        connect_signal(confirm_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(confirm_dialog, 'ok', self._dispatch_delete_assets, assets)
+        self._view_manager.open_dialog(confirm_dialog)
+
+    def _dispatch_delete_assets(self, _, assets: tuple[Asset, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(DELETE_ASSETS, assets))
+        self._view_manager.close_dialog()
+
+    def _move_assets_to(self, assets: tuple[Asset, ...]) -> None:
+        all_assets = select_assets(self._store.get_state())
+        move_to_dialog = create_move_to_dialog(all_assets, assets, lambda asset: asset.name)
+        connect_signal(move_to_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(move_to_dialog, 'select', self._dispatch_move_assets_to, assets)
+        self._view_manager.open_dialog(dialog=move_to_dialog,
+                                       height=('relative', 60))
+
+    def _dispatch_move_assets_to(self, _, index: int, assets: tuple[Asset, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(MOVE_ASSETS_TO, (assets, index)))
+        self._view_manager.close_dialog()
+
     def _update(self) -> None:
         state = self._store.get_state()
         self._table.update(_select_rows(state))
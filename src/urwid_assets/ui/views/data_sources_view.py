@@ -6,15 +6,19 @@ from injector import inject, singleton, ClassAssistedBuilder
 from urwid import Frame, Text, connect_signal, LineBox, WidgetWrap
 
 from urwid_assets.lib.data_sources.data_source_registry import DataSourceRegistry
+from urwid_assets.lib.redux.history import History
 from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
 from urwid_assets.lib.redux.store import Store, Action
 from urwid_assets.selectors.selectors import select_data_sources
 from urwid_assets.state.saved.data_sources.data_sources import DataSourceInstance, MOVE_DATA_SOURCE_UP, \
-    MOVE_DATA_SOURCE_DOWN, UPDATE_DATA_SOURCE, ADD_DATA_SOURCE, DELETE_DATA_SOURCE
+    MOVE_DATA_SOURCE_DOWN, UPDATE_DATA_SOURCE, ADD_DATA_SOURCE, DELETE_DATA_SOURCE, \
+    DELETE_DATA_SOURCES, MOVE_DATA_SOURCES_TO
 from urwid_assets.state.saved.saved import Saved
 from urwid_assets.state.state import State
 from urwid_assets.ui.views.helpers.data_source_dialog_config import DefaultDataSourceDialogConfigFactory, \
     apply_data_source_to_data_source_dialog_config, data_source_from_config_values
+from urwid_assets.ui.views.helpers.move_to_dialog import create_move_to_dialog
 from urwid_assets.ui.widgets.dialogs.config_dialog.config_dialog import ConfigDialog
 from urwid_assets.ui.widgets.dialogs.config_dialog.config_value import ConfigValue
 from urwid_assets.ui.widgets.dialogs.message_box import MessageBox, MessageBoxButtons
@@ -41,11 +45,14 @@ class DataSourcesView(LinkedView):
     @inject
     def __init__(self,
                  store: Store[State],
+                 history: History,
+                 selector_graph: SelectorGraph,
                  view_manager: ViewManager,
                  default_data_source_dialog_config_factory: DefaultDataSourceDialogConfigFactory,
                  data_source_registry: DataSourceRegistry,
                  config_dialog_builder: ClassAssistedBuilder[ConfigDialog]) -> None:
         self._store = store
+        self._history = history
         self._view_manager = view_manager
         self._default_data_source_dialog_config_factory = default_data_source_dialog_config_factory
         self._data_source_registry = data_source_registry
@@ -56,15 +63,21 @@ class DataSourcesView(LinkedView):
             KeyHandler(('h', 'H'), self._show_help),
             KeyHandler(('enter',), self._table.with_current_row_data(self._edit_data_source)),
             KeyHandler(('a', 'A'), self._add_data_source),
-            KeyHandler(('backspace',), self._table.with_current_row_data(self._delete_data_source)),
+            KeyHandler(('backspace',), self._table.with_marked_rows_data(self._delete_data_sources)),
             KeyHandler(('j', 'J'), self._table.with_current_row_data(self._move_data_source_down)),
             KeyHandler(('k', 'K'), self._table.with_current_row_data(self._move_data_source_up)),
+            KeyHandler((' ',), self._table.toggle_marked),
+            KeyHandler(('m', 'M'), self._table.with_marked_rows_data(self._move_data_sources_to)),
+            KeyHandler(('u', 'U'), self._history.undo),
+            KeyHandler(('ctrl r',), self._history.redo),
         ))
         super().__init__(Frame(
             LineBox(self._table),
             Header(),
             LineBox(Text(u'h - Help')),
-        ), store)
+        ), store, (
+            self._select_rows,
+        ), selector_graph)
 
     def _create_rows_selector(self) -> Callable[[Saved], tuple[Row[DataSourceInstance], ...]]:
         return create_selector((
@@ -99,9 +112,13 @@ class DataSourcesView(LinkedView):
                                      u'',
                                      u' a         - Add a new data source',
                                      u' enter     - Edit the selected data source',
-                                     u' backspace - Delete the selected data source',
+                                     u' space     - Mark the selected data source',
+                                     u' backspace - Delete the marked (or selected) data sources',
                                      u' k         - Move the selected data source UP',
                                      u' j         - Move the selected data source DOWN',
+                                     u' m         - Move the marked (or selected) data sources before another',
+                                     u' u         - Undo',
+                                     u' ctrl r    - Redo',
                                      u'',
                                      u' q - quit',
                                  )
@@ -151,5 +168,34 @@ class DataSourcesView(LinkedView):
         self._store.dispatch(Action(DELETE_DATA_SOURCE, data_source))
         self._view_manager.close_dialog()
 
+    def _delete_data_sources(self, data_sources: tuple[DataSourceInstance, ...]) -> None:
+        if len(data_sources) == 1:
+            self._delete_data_source(data_sources[0])
+            return
+        confirm_dialog = MessageBox(u'Delete: %d data sources' % len(data_sources),
+                                    u'Are you sure you wish to delete %d data sources' % len(data_sources),
+                                    MessageBoxButtons.OK_CANCEL)
+        connect_signal(confirm_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(confirm_dialog, 'ok', self._dispatch_delete_data_sources, data_sources)
+        self._view_manager.open_dialog(confirm_dialog)
+
+    def _dispatch_delete_data_sources(self, _, data_sources: tuple[DataSourceInstance, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(DELETE_DATA_SOURCES, data_sources))
+        self._view_manager.close_dialog()
+
+    def _move_data_sources_to(self, data_sources: tuple[DataSourceInstance, ...]) -> None:
+        all_data_sources = select_data_sources(self._store.get_state())
+        move_to_dialog = create_move_to_dialog(all_data_sources, data_sources, lambda data_source: data_source.name)
+        connect_signal(move_to_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(move_to_dialog, 'select', self._dispatch_move_data_sources_to, data_sources)
+        self._view_manager.open_dialog(dialog=move_to_dialog,
+                                       height=('relative', 60))
+
+    def _dispatch_move_data_sources_to(self, _, index: int, data_sources: tuple[DataSourceInstance, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(MOVE_DATA_SOURCES_TO, (data_sources, index)))
+        self._view_manager.close_dialog()
+
     def _update(self) -> None:
         self._table.update(self._select_rows(self._store.get_state()))
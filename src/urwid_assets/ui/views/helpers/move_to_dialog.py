@@ -0,0 +1,34 @@
+from typing import Callable
+
+from urwid_assets.lib.redux.list_reducer import LIST, LIST_ITEM
+from urwid_assets.ui.widgets.dialogs.list_dialog import ListDialog
+
+_END = u'[End]'
+
+
+def get_move_to_choices(all_items: LIST,
+                        items: tuple[LIST_ITEM, ...],
+                        get_name: Callable[[LIST_ITEM], str]) -> tuple[tuple[str, ...], int]:
+    # the items are moved as a block in to the list without them, so they
+    # are left out of the choices and the index of each choice is the index
+    # at which the block will start, ie. in front of the chosen item or at
+    # the end. The choice that leaves the first item in place is selected
+    uuids = set(item.uuid for item in items)
+    entries = []
+    selected = 0
+    for item in all_items:
+        if item.uuid == items[0].uuid:
+            selected = len(entries)
+        if item.uuid not in uuids:
+            entries.append(get_name(item))
+    entries.append(_END)
+    return tuple(entries), selected
+
+
+def create_move_to_dialog(all_items: LIST,
+                          items: tuple[LIST_ITEM, ...],
+                          get_name: Callable[[LIST_ITEM], str]) -> ListDialog:
+    entries, selected = get_move_to_choices(all_items, items, get_name)
+    return ListDialog(title=u'Move before',
+                      entries=entries,
+                      selected=selected)
@@ -2,6 +2,7 @@ from dataclasses import replace
 from datetime import datetime
 from uuid import UUID
 
+from urwid_assets.lib.redux.list_reducer import EntityList
 from urwid_assets.state.saved.snapshots.snapshots import SnapshotAsset, Snapshot
 from urwid_assets.ui.widgets.dialogs.config_dialog.config_field import ConfigField, StringConfigField
 from urwid_assets.ui.widgets.dialogs.config_dialog.config_value import ConfigValue, StringConfigValue
@@ -17,7 +18,7 @@ def snapshot_from_add_config_values(uuid: UUID,
         uuid=uuid,
         name=name.value,
         timestamp=timestamp,
-        assets=snapshot_assets,
+        assets=EntityList(snapshot_assets),
     )
 
 
@@ -1,9 +1,11 @@
 import logging
 import subprocess
 
-from injector import singleton
+from injector import singleton, inject
 from urwid import LineBox
 
+from urwid_assets.lib.redux.dispatch_timer import DispatchTimer
+from urwid_assets.lib.redux.selector_registry import SelectorRegistry
 from urwid_assets.ui.widgets.text_list import TextList
 from urwid_assets.ui.widgets.views.view import View
 
@@ -18,9 +20,15 @@ class _LoggingHandler(logging.Handler):
         self._text_list.append(self.format(record))
 
 
+_LOGGER = logging.getLogger(__name__)
+
+
 @singleton
 class LogView(View):
-    def __init__(self):
+    @inject
+    def __init__(self, dispatch_timer: DispatchTimer, selector_registry: SelectorRegistry):
+        self._dispatch_timer = dispatch_timer
+        self._selector_registry = selector_registry
         self._text_list = TextList()
         super().__init__(LineBox(self._text_list))
         logging.getLogger().addHandler(_LoggingHandler(self._text_list))
@@ -31,4 +39,24 @@ class LogView(View):
         if key in ('y', 'Y'):
             subprocess.run("pbcopy", text=True, input=self._text_list.get_selected_text())
             return None
+        if key in ('t', 'T'):
+            self._log_dispatch_timings()
+            return None
+        if key in ('s', 'S'):
+            self._log_selector_profile()
+            return None
         return key
+
+    def _log_dispatch_timings(self) -> None:
+        report = self._dispatch_timer.get_report()
+        if len(report) == 0:
+            _LOGGER.info(u'No dispatch timings recorded, start with --time-dispatch to record them')
+        for line in report:
+            _LOGGER.info(line)
+
+    def _log_selector_profile(self) -> None:
+        report = self._selector_registry.get_report()
+        if len(report) == 0:
+            _LOGGER.info(u'No selector profile recorded, start with --profile-selectors to record it')
+        for line in report:
+            _LOGGER.info(line)
@@ -6,14 +6,18 @@ from injector import inject, singleton, ClassAssistedBuilder
 from urwid import Frame, Text, connect_signal, LineBox, Columns, RIGHT
 
 from urwid_assets.lib.data_sources.data_source_registry import DataSourceRegistry
+from urwid_assets.lib.redux.history import History
 from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
 from urwid_assets.lib.redux.store import Store, Action
 from urwid_assets.selectors.selectors import select_symbols, select_rates, select_loaded_rates, select_timestamp_text
-from urwid_assets.state.saved.rates.rates import Rate, MOVE_RATE_UP, MOVE_RATE_DOWN, UPDATE_RATE, ADD_RATE, DELETE_RATE
+from urwid_assets.state.saved.rates.rates import Rate, MOVE_RATE_UP, MOVE_RATE_DOWN, UPDATE_RATE, ADD_RATE, DELETE_RATE, \
+    DELETE_RATES, MOVE_RATES_TO
 from urwid_assets.state.saved.symbols.symbols import Symbol, get_symbol
 from urwid_assets.state.state import State
 from urwid_assets.state.ui.ui import LoadedRate
 from urwid_assets.ui.views.helpers.format import get_loaded_rate_text
+from urwid_assets.ui.views.helpers.move_to_dialog import create_move_to_dialog
 from urwid_assets.ui.views.helpers.rate_dialog_config import DefaultRateDialogConfigFactory, \
     apply_rate_to_rate_dialog_config, rate_from_config_values
 from urwid_assets.ui.widgets.dialogs.config_dialog.config_dialog import ConfigDialog
@@ -63,11 +67,14 @@ class RatesView(LinkedView):
     @inject
     def __init__(self,
                  store: Store[State],
+                 history: History,
+                 selector_graph: SelectorGraph,
                  view_manager: ViewManager,
                  data_source_registry: DataSourceRegistry,
                  default_rate_dialog_config_factory: DefaultRateDialogConfigFactory,
                  config_dialog_builder: ClassAssistedBuilder[ConfigDialog]) -> None:
         self._store = store
+        self._history = history
         self._view_manager = view_manager
         self._data_source_registry = data_source_registry
         self._default_rate_dialog_config_factory = default_rate_dialog_config_factory
@@ -79,10 +86,14 @@ class RatesView(LinkedView):
             KeyHandler(('h', 'H'), self._show_help),
             KeyHandler(('a', 'A'), self._add_rate),
             KeyHandler(('enter',), self._table.with_current_row_data(self._edit_rate)),
-            KeyHandler(('backspace',), self._table.with_current_row_data(self._delete_rate)),
+            KeyHandler(('backspace',), self._table.with_marked_rows_data(self._delete_rates)),
             KeyHandler(('j', 'J'), self._table.with_current_row_data(self._move_rate_down)),
             KeyHandler(('k', 'K'), self._table.with_current_row_data(self._move_rate_up)),
             KeyHandler(('r', 'R'), self._refresh_rates),
+            KeyHandler((' ',), self._table.toggle_marked),
+            KeyHandler(('m', 'M'), self._table.with_marked_rows_data(self._move_rates_to)),
+            KeyHandler(('u', 'U'), self._history.undo),
+            KeyHandler(('ctrl r',), self._history.redo),
         ))
         super().__init__(Frame(
             LineBox(self._table),
@@ -91,7 +102,10 @@ class RatesView(LinkedView):
                 ('weight', 1, self._timestamp_text),
             ))),
             LineBox(Text(u'h - Help')),
-        ), store)
+        ), store, (
+            select_rows,
+            select_timestamp_text,
+        ), selector_graph)
 
     def keypress(self, size: int, key: str) -> str | None:
         if super().keypress(size, key) is None:
@@ -114,10 +128,14 @@ class RatesView(LinkedView):
                                      u'',
                                      u' a         - Add a new rate',
                                      u' enter     - Edit the selected rate',
-                                     u' backspace - Delete the selected rate',
+                                     u' space     - Mark the selected rate',
+                                     u' backspace - Delete the marked (or selected) rates',
                                      u' k         - Move the selected rate UP',
                                      u' j         - Move the selected rate DOWN',
                                      u' r         - Refresh rates',
+                                     u' m         - Move the marked (or selected) rates before another',
+                                     u' u         - Undo',
+                                     u' ctrl r    - Redo',
                                      u'',
                                      u' q - quit',
                                  )
@@ -164,6 +182,35 @@ class RatesView(LinkedView):
         self._store.dispatch(Action(DELETE_RATE, rate))
         self._view_manager.close_dialog()
 
+    def _delete_rates(self, rates: tuple[Rate, ...]) -> None:
+        if len(rates) == 1:
+            self._delete_rate(rates[0])
+            return
+        confirm_dialog = MessageBox(u'Delete: %d rates' % len(rates),
+                                    u'Are you sure you wish to delete %d rates' % len(rates),
+                                    MessageBoxButtons.OK_CANCEL)
+        connect_signal(confirm_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(confirm_dialog, 'ok', self._dispatch_delete_rates, rates)
+        self._view_manager.open_dialog(confirm_dialog)
+
+    def _dispatch_delete_rates(self, _, rates: tuple[Rate, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(DELETE_RATES, rates))
+        self._view_manager.close_dialog()
+
+    def _move_rates_to(self, rates: tuple[Rate, ...]) -> None:
+        all_rates = select_rates(self._store.get_state())
+        move_to_dialog = create_move_to_dialog(all_rates, rates, lambda rate: rate.name)
+        connect_signal(move_to_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(move_to_dialog, 'select', self._dispatch_move_rates_to, rates)
+        self._view_manager.open_dialog(dialog=move_to_dialog,
+                                       height=('relative', 60))
+
+    def _dispatch_move_rates_to(self, _, index: int, rates: tuple[Rate, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(MOVE_RATES_TO, (rates, index)))
+        self._view_manager.close_dialog()
+
     def _update(self) -> None:
         state = self._store.get_state()
         self._timestamp_text.set_text(select_timestamp_text(state))
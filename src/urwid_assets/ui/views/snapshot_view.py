@@ -1,4 +1,5 @@
 import logging
+from dataclasses import dataclass
 from decimal import Decimal
 from pathlib import Path
 from typing import Callable
@@ -7,11 +8,14 @@ from uuid import UUID
 from injector import inject, singleton, ClassAssistedBuilder
 from urwid import Frame, Text, connect_signal, LineBox, RIGHT, Columns
 
-from urwid_assets.lib.redux.reselect import SelectorOptions, create_selector
+from urwid_assets.lib.redux.history import History
+from urwid_assets.lib.redux.reselect import SelectorOptions, create_selector, create_parameterized_selector, \
+    OffloadOptions, SelectorCacheOptions
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
 from urwid_assets.lib.redux.store import Store, Action
 from urwid_assets.selectors.selectors import select_snapshots
 from urwid_assets.state.saved.snapshots.snapshots import Snapshot, get_snapshot, SnapshotAsset, MOVE_ASSET_SNAPSHOT_UP, \
-    MOVE_ASSET_SNAPSHOT_DOWN
+    MOVE_ASSET_SNAPSHOT_DOWN, UnknownSnapshot
 from urwid_assets.state.state import State
 from urwid_assets.ui.views.helpers.export_csv_dialog_config import create_export_csv_dialog_config, \
     get_csv_export_path
@@ -36,12 +40,26 @@ COLUMNS = (
 
 _DEFAULT_EXPORT_PATH = Path('export.csv')
 
+# number of snapshots for which the selectors are kept
+# so that they open instantly when viewed again
+_SNAPSHOT_SELECTORS_CAPACITY = 8
+# the selectors of snapshots that are not being viewed would otherwise
+# hold on to the snapshot lists of old states until they are viewed again
+_SNAPSHOT_CACHE = SelectorCacheOptions(weak=True)
 
-def _select_snapshot(snapshots: tuple[Snapshot, ...], uuid: UUID) -> Snapshot:
-    return get_snapshot(uuid, snapshots)
 
+def _select_snapshot(snapshots: tuple[Snapshot, ...], uuid: UUID) -> Snapshot | None:
+    # the snapshot can go while it is being viewed, eg. when
+    # the action that added it is undone
+    try:
+        return get_snapshot(uuid, snapshots)
+    except UnknownSnapshot:
+        return None
 
-def _select_assets_from_snapshot(snapshot: Snapshot) -> tuple[SnapshotAsset, ...]:
+
+def _select_assets_from_snapshot(snapshot: Snapshot | None) -> tuple[SnapshotAsset, ...]:
+    if snapshot is None:
+        return tuple()
     return snapshot.assets
 
 
@@ -80,33 +98,88 @@ def _select_csv_from_assets(snapshot_assets: tuple[SnapshotAsset, ...]) -> str:
     return u'\n'.join(u','.join(row) for row in rows) + u'\n'
 
 
-def _select_name_from_snapshot(snapshot: Snapshot) -> str:
+def _select_name_from_snapshot(snapshot: Snapshot | None) -> str:
+    if snapshot is None:
+        return u'[No Snapshot]'
     return u'Snapshot: %s' % snapshot.name
 
 
-def _select_timestamp_from_snapshot(snapshot: Snapshot) -> str:
+def _select_timestamp_from_snapshot(snapshot: Snapshot | None) -> str:
+    if snapshot is None:
+        return format_timestamp(None)
     return format_timestamp(snapshot.timestamp)
 
 
+@dataclass(frozen=True)
+class _SnapshotSelectors:
+    select_snapshot: Callable[[State], Snapshot | None]
+    select_rows: Callable[[State], tuple[Row[SnapshotAsset], ...]]
+    select_total: Callable[[State], str]
+    select_name: Callable[[State], str]
+    select_timestamp: Callable[[State], str]
+    select_csv: Callable[[State], str]
+
+
+def _create_snapshot_selectors(uuid: UUID) -> _SnapshotSelectors:
+    def select_uuid(_: State) -> UUID:
+        return uuid
+
+    select_snapshot = create_selector((
+        select_snapshots,
+        select_uuid,
+    ), _select_snapshot, SelectorOptions(cache=_SNAPSHOT_CACHE))
+    select_assets = create_selector((
+        select_snapshot,
+    ), _select_assets_from_snapshot, SelectorOptions(cache=_SNAPSHOT_CACHE))
+    return _SnapshotSelectors(
+        select_snapshot=select_snapshot,
+        select_rows=create_selector((
+            select_assets,
+        ), _select_row_from_snapshot_asset, SelectorOptions(cache=_SNAPSHOT_CACHE, dimensions=(1,))),
+        select_total=create_selector((
+            select_assets,
+        ), _select_total_from_assets, SelectorOptions(cache=_SNAPSHOT_CACHE, offload=OffloadOptions())),
+        select_name=create_selector((
+            select_snapshot,
+        ), _select_name_from_snapshot, SelectorOptions(cache=_SNAPSHOT_CACHE)),
+        select_timestamp=create_selector((
+            select_snapshot,
+        ), _select_timestamp_from_snapshot, SelectorOptions(cache=_SNAPSHOT_CACHE)),
+        # not offloaded as it is only selected on export, which
+        # needs the current csv straight away rather than a placeholder
+        select_csv=create_selector((
+            select_assets,
+        ), _select_csv_from_assets, SelectorOptions(cache=_SNAPSHOT_CACHE)),
+    )
+
+
+_select_snapshot_selectors = create_parameterized_selector(_create_snapshot_selectors, _SNAPSHOT_SELECTORS_CAPACITY)
+
+
 @singleton
 class SnapshotView(LinkedView):
     @inject
     def __init__(self,
                  store: Store[State],
+                 history: History,
+                 selector_graph: SelectorGraph,
                  view_manager: ViewManager,
                  config_dialog_builder: ClassAssistedBuilder[ConfigDialog],
-                 uuid: UUID) -> None:
+                 uuid: UUID,
+                 close: Callable[[], None]) -> None:
         self._store = store
+        self._history = history
         self._view_manager = view_manager
         self._config_dialog_builder = config_dialog_builder
         self._uuid = uuid
-        self._select_snapshot = self._create_snapshot_selector()
-        self._select_assets = self._create_assets_selector()
-        self._select_rows = self._create_rows_selector()
-        self._select_total = self._create_total_selector()
-        self._select_name = self._create_name_selector()
-        self._select_timestamp = self._create_timestamp_selector()
-        self._select_csv = self._create_csv_selector()
+        self._close = close
+        selectors = _select_snapshot_selectors(uuid)
+        self._select_snapshot = selectors.select_snapshot
+        self._select_rows = selectors.select_rows
+        self._select_total = selectors.select_total
+        self._select_name = selectors.select_name
+        self._select_timestamp = selectors.select_timestamp
+        self._select_csv = selectors.select_csv
         self._table = Table(COLUMNS, self._select_rows(store.get_state()))
         self._total_text = Text(self._select_total(store.get_state()), align=RIGHT)
         self._name_text = Text(self._select_name(store.get_state()))
@@ -116,6 +189,8 @@ class SnapshotView(LinkedView):
             KeyHandler(('e', 'E'), self._get_csv_export_path),
             KeyHandler(('j', 'J'), self._table.with_current_row_data(self._move_asset_snapshot_down)),
             KeyHandler(('k', 'K'), self._table.with_current_row_data(self._move_asset_snapshot_up)),
+            KeyHandler(('u', 'U'), self._history.undo),
+            KeyHandler(('ctrl r',), self._history.redo),
         ))
         super().__init__(Frame(
             LineBox(self._table),
@@ -127,46 +202,13 @@ class SnapshotView(LinkedView):
                 ('weight', 1, Text(u'h - Help')),
                 ('weight', 1, self._total_text),
             ))),
-        ), store)
-
-    def _select_uuid(self, _):
-        return self._uuid
-
-    def _create_snapshot_selector(self) -> Callable[[State], tuple[SnapshotAsset, ...]]:
-        return create_selector((
-            select_snapshots,
-            self._select_uuid,
-        ), _select_snapshot)
-
-    def _create_assets_selector(self) -> Callable[[State], tuple[SnapshotAsset, ...]]:
-        return create_selector((
-            self._select_snapshot,
-        ), _select_assets_from_snapshot)
-
-    def _create_rows_selector(self) -> Callable[[State], tuple[Row[SnapshotAsset], ...]]:
-        return create_selector((
-            self._select_assets,
-        ), _select_row_from_snapshot_asset, SelectorOptions(dimensions=(1,)))
-
-    def _create_name_selector(self) -> Callable[[State], str]:
-        return create_selector((
+        ), store, (
             self._select_snapshot,
-        ), _select_name_from_snapshot)
-
-    def _create_timestamp_selector(self) -> Callable[[State], str]:
-        return create_selector((
-            self._select_snapshot,
-        ), _select_timestamp_from_snapshot)
-
-    def _create_total_selector(self) -> Callable[[State], str]:
-        return create_selector((
-            self._select_assets,
-        ), _select_total_from_assets)
-
-    def _create_csv_selector(self) -> Callable[[State], str]:
-        return create_selector((
-            self._select_assets,
-        ), _select_csv_from_assets)
+            self._select_rows,
+            self._select_total,
+            self._select_name,
+            self._select_timestamp,
+        ), selector_graph)
 
     def keypress(self, size: int, key: str) -> str | None:
         if super().keypress(size, key) is None:
@@ -199,9 +241,11 @@ class SnapshotView(LinkedView):
                                  (
                                      u' h - Show this help',
                                      u'',
-                                     u' e - Export snapshot to CSV file',
-                                     u' k - Move the selected asset UP',
-                                     u' j - Move the selected asset DOWN',
+                                     u' e      - Export snapshot to CSV file',
+                                     u' k      - Move the selected asset UP',
+                                     u' j      - Move the selected asset DOWN',
+                                     u' u      - Undo',
+                                     u' ctrl r - Redo',
                                      u'',
                                      u' q - quit',
                                  )
@@ -210,6 +254,9 @@ class SnapshotView(LinkedView):
         self._view_manager.open_dialog(help_dialog)
 
     def _update(self) -> None:
+        if self._select_snapshot(self._store.get_state()) is None:
+            self._close()
+            return
         self._table.update(self._select_rows(self._store.get_state()))
         self._total_text.set_text(self._select_total(self._store.get_state()))
         self._name_text.set_text(self._select_name(self._store.get_state()))
@@ -5,13 +5,16 @@ from injector import inject, singleton, ClassAssistedBuilder
 from urwid import Frame, Text, connect_signal, LineBox, WidgetWrap, RIGHT
 
 from urwid_assets.cli.ui import ContentView
+from urwid_assets.lib.redux.history import History
 from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
 from urwid_assets.lib.redux.store import Store, Action
 from urwid_assets.selectors.selectors import select_snapshots
 from urwid_assets.state.saved.snapshots.snapshots import Snapshot, MOVE_SNAPSHOT_UP, MOVE_SNAPSHOT_DOWN, \
-    UPDATE_SNAPSHOT, DELETE_SNAPSHOT
+    UPDATE_SNAPSHOT, DELETE_SNAPSHOT, DELETE_SNAPSHOTS, MOVE_SNAPSHOTS_TO
 from urwid_assets.state.state import State
 from urwid_assets.ui.views.helpers.format import format_timestamp, format_currency
+from urwid_assets.ui.views.helpers.move_to_dialog import create_move_to_dialog
 from urwid_assets.ui.views.helpers.snapshot_dialog_config import create_snapshot_dialog_config, \
     snapshot_from_edit_config_values
 from urwid_assets.ui.views.snapshot_view import SnapshotView
@@ -61,11 +64,14 @@ class SnapshotsView(LinkedView):
     @inject
     def __init__(self,
                  store: Store[State],
+                 history: History,
+                 selector_graph: SelectorGraph,
                  view_manager: ViewManager,
                  content_view: ContentView,
                  snapshot_view_builder: ClassAssistedBuilder[SnapshotView],
                  config_dialog_builder: ClassAssistedBuilder[ConfigDialog]) -> None:
         self._store = store
+        self._history = history
         self._view_manager = view_manager
         self._content_view = content_view
         self._snapshot_view_builder = snapshot_view_builder
@@ -75,15 +81,21 @@ class SnapshotsView(LinkedView):
             KeyHandler(('h', 'H'), self._show_help),
             KeyHandler(('enter',), self._table.with_current_row_data(self._view_snapshot)),
             KeyHandler(('e', 'E'), self._table.with_current_row_data(self._edit_snapshot)),
-            KeyHandler(('backspace',), self._table.with_current_row_data(self._delete_snapshot)),
+            KeyHandler(('backspace',), self._table.with_marked_rows_data(self._delete_snapshots)),
             KeyHandler(('j', 'J'), self._table.with_current_row_data(self._move_snapshot_down)),
             KeyHandler(('k', 'K'), self._table.with_current_row_data(self._move_snapshot_up)),
+            KeyHandler((' ',), self._table.toggle_marked),
+            KeyHandler(('m', 'M'), self._table.with_marked_rows_data(self._move_snapshots_to)),
+            KeyHandler(('u', 'U'), self._history.undo),
+            KeyHandler(('ctrl r',), self._history.redo),
         ))
         super().__init__(Frame(
             LineBox(self._table),
             Header(),
             LineBox(Text(u'h - Help')),
-        ), store)
+        ), store, (
+            select_rows,
+        ), selector_graph)
 
     def keypress(self, size: int, key: str) -> str | None:
         if super().keypress(size, key) is None:
@@ -91,7 +103,11 @@ class SnapshotsView(LinkedView):
         return self._keys(key)
 
     def _view_snapshot(self, snapshot: Snapshot):
-        self._content_view.set_view(self._snapshot_view_builder.build(uuid=snapshot.uuid))
+        self._content_view.set_view(self._snapshot_view_builder.build(uuid=snapshot.uuid,
+                                                                      close=self._close_snapshot))
+
+    def _close_snapshot(self):
+        self._content_view.set_view(self)
 
     def _move_snapshot_up(self, snapshot: Snapshot):
         self._store.dispatch(Action(MOVE_SNAPSHOT_UP, snapshot))
@@ -106,9 +122,13 @@ class SnapshotsView(LinkedView):
                                      u'',
                                      u' enter     - View the selected snapshot',
                                      u' e         - Edit the selected snapshot',
-                                     u' backspace - Delete the selected snapshot',
+                                     u' space     - Mark the selected snapshot',
+                                     u' backspace - Delete the marked (or selected) snapshots',
                                      u' k         - Move the selected snapshot UP',
                                      u' j         - Move the selected snapshot DOWN',
+                                     u' m         - Move the marked (or selected) snapshots before another',
+                                     u' u         - Undo',
+                                     u' ctrl r    - Redo',
                                      u'',
                                      u' q - quit',
                                  )
@@ -142,5 +162,34 @@ class SnapshotsView(LinkedView):
         self._store.dispatch(Action(DELETE_SNAPSHOT, snapshot))
         self._view_manager.close_dialog()
 
+    def _delete_snapshots(self, snapshots: tuple[Snapshot, ...]) -> None:
+        if len(snapshots) == 1:
+            self._delete_snapshot(snapshots[0])
+            return
+        confirm_dialog = MessageBox(u'Delete: %d snapshots' % len(snapshots),
+                                    u'Are you sure you wish to delete %d snapshots' % len(snapshots),
+                                    MessageBoxButtons.OK_CANCEL)
+        connect_signal(confirm_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(confirm_dialog, 'ok', self._dispatch_delete_snapshots, snapshots)
+        self._view_manager.open_dialog(confirm_dialog)
+
+    def _dispatch_delete_snapshots(self, _, snapshots: tuple[Snapshot, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(DELETE_SNAPSHOTS, snapshots))
+        self._view_manager.close_dialog()
+
+    def _move_snapshots_to(self, snapshots: tuple[Snapshot, ...]) -> None:
+        all_snapshots = select_snapshots(self._store.get_state())
+        move_to_dialog = create_move_to_dialog(all_snapshots, snapshots, lambda snapshot: snapshot.name)
+        connect_signal(move_to_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(move_to_dialog, 'select', self._dispatch_move_snapshots_to, snapshots)
+        self._view_manager.open_dialog(dialog=move_to_dialog,
+                                       height=('relative', 60))
+
+    def _dispatch_move_snapshots_to(self, _, index: int, snapshots: tuple[Snapshot, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(MOVE_SNAPSHOTS_TO, (snapshots, index)))
+        self._view_manager.close_dialog()
+
     def _update(self) -> None:
         self._table.update(select_rows(self._store.get_state()))
@@ -4,12 +4,15 @@ from uuid import uuid1, UUID
 from injector import inject, singleton, ClassAssistedBuilder
 from urwid import Frame, Text, connect_signal, LineBox, WidgetWrap
 
+from urwid_assets.lib.redux.history import History
 from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
 from urwid_assets.lib.redux.store import Store, Action
 from urwid_assets.selectors.selectors import select_symbols
 from urwid_assets.state.saved.symbols.symbols import Symbol, MOVE_SYMBOL_UP, MOVE_SYMBOL_DOWN, UPDATE_SYMBOL, \
-    DELETE_SYMBOL, ADD_SYMBOL
+    DELETE_SYMBOL, ADD_SYMBOL, DELETE_SYMBOLS, MOVE_SYMBOLS_TO
 from urwid_assets.state.state import State
+from urwid_assets.ui.views.helpers.move_to_dialog import create_move_to_dialog
 from urwid_assets.ui.views.helpers.symbol_dialog_config import create_symbol_dialog_config, \
     symbol_from_config_values
 from urwid_assets.ui.widgets.dialogs.config_dialog.config_dialog import ConfigDialog
@@ -52,9 +55,12 @@ class SymbolsView(LinkedView):
     @inject
     def __init__(self,
                  store: Store[State],
+                 history: History,
+                 selector_graph: SelectorGraph,
                  view_manager: ViewManager,
                  config_dialog_builder: ClassAssistedBuilder[ConfigDialog]) -> None:
         self._store = store
+        self._history = history
         self._view_manager = view_manager
         self._config_dialog_builder = config_dialog_builder
         self._table = Table(COLUMNS, select_rows(self._store.get_state()))
@@ -62,15 +68,21 @@ class SymbolsView(LinkedView):
             KeyHandler(('h', 'H'), self._show_help),
             KeyHandler(('a', 'A'), self._add_symbol),
             KeyHandler(('enter',), self._table.with_current_row_data(self._edit_symbol)),
-            KeyHandler(('backspace',), self._table.with_current_row_data(self._delete_symbol)),
+            KeyHandler(('backspace',), self._table.with_marked_rows_data(self._delete_symbols)),
             KeyHandler(('j', 'J'), self._table.with_current_row_data(self._move_symbol_down)),
             KeyHandler(('k', 'K'), self._table.with_current_row_data(self._move_symbol_up)),
+            KeyHandler((' ',), self._table.toggle_marked),
+            KeyHandler(('m', 'M'), self._table.with_marked_rows_data(self._move_symbols_to)),
+            KeyHandler(('u', 'U'), self._history.undo),
+            KeyHandler(('ctrl r',), self._history.redo),
         ))
         super().__init__(Frame(
             LineBox(self._table),
             Header(),
             LineBox(Text(u'h - Help')),
-        ), store)
+        ), store, (
+            select_rows,
+        ), selector_graph)
 
     def keypress(self, size: int, key: str) -> str | None:
         if super().keypress(size, key) is None:
@@ -90,9 +102,13 @@ class SymbolsView(LinkedView):
                                      u'',
                                      u' a         - Add a new symbol',
                                      u' enter     - Edit the selected symbol',
-                                     u' backspace - Delete the selected symbol',
+                                     u' space     - Mark the selected symbol',
+                                     u' backspace - Delete the marked (or selected) symbols',
                                      u' k         - Move the selected symbol UP',
                                      u' j         - Move the selected symbol DOWN',
+                                     u' m         - Move the marked (or selected) symbols before another',
+                                     u' u         - Undo',
+                                     u' ctrl r    - Redo',
                                      u'',
                                      u' q - quit',
                                  )
@@ -139,5 +155,34 @@ class SymbolsView(LinkedView):
         self._store.dispatch(Action(DELETE_SYMBOL, symbol))
         self._view_manager.close_dialog()
 
+    def _delete_symbols(self, symbols: tuple[Symbol, ...]) -> None:
+        if len(symbols) == 1:
+            self._delete_symbol(symbols[0])
+            return
+        confirm_dialog = MessageBox(u'Delete: %d symbols' % len(symbols),
+                                    u'Are you sure you wish to delete %d symbols' % len(symbols),
+                                    MessageBoxButtons.OK_CANCEL)
+        connect_signal(confirm_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(confirm_dialog, 'ok', self._dispatch_delete_symbols, symbols)
+        self._view_manager.open_dialog(confirm_dialog)
+
+    def _dispatch_delete_symbols(self, _, symbols: tuple[Symbol, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(DELETE_SYMBOLS, symbols))
+        self._view_manager.close_dialog()
+
+    def _move_symbols_to(self, symbols: tuple[Symbol, ...]) -> None:
+        all_symbols = select_symbols(self._store.get_state())
+        move_to_dialog = create_move_to_dialog(all_symbols, symbols, lambda symbol: symbol.name)
+        connect_signal(move_to_dialog, 'cancel', lambda _: self._view_manager.close_dialog())
+        connect_signal(move_to_dialog, 'select', self._dispatch_move_symbols_to, symbols)
+        self._view_manager.open_dialog(dialog=move_to_dialog,
+                                       height=('relative', 60))
+
+    def _dispatch_move_symbols_to(self, _, index: int, symbols: tuple[Symbol, ...]) -> None:
+        self._table.clear_marked()
+        self._store.dispatch(Action(MOVE_SYMBOLS_TO, (symbols, index)))
+        self._view_manager.close_dialog()
+
     def _update(self) -> None:
         self._table.update(select_rows(self._store.get_state()))
@@ -41,7 +41,7 @@ def _create_cell_tuple(cell_data: tuple[_ColumnData, str]) -> tuple[str, int, Wi
 
 
 class _Row(WidgetWrap, Generic[DATA]):
-    def __init__(self, row: Row[DATA], column_params: tuple[_ColumnData, ...]):
+    def __init__(self, row: Row[DATA], column_params: tuple[_ColumnData, ...], marked: bool = False):
         self._row = row
         fields = row.fields
         diff = len(column_params) - len(fields)
@@ -50,7 +50,7 @@ class _Row(WidgetWrap, Generic[DATA]):
         cells = zip(column_params, fields)
         super().__init__(AttrMap(Columns(_create_cell_tuple(cell_data)
                                          for cell_data in cells),
-                                 None,
+                                 'marked' if marked else None,
                                  focus_map='reversed'))
 
     def get_row(self) -> Row[DATA]:
@@ -61,8 +61,8 @@ class _RowFactory(Generic[DATA]):
     def __init__(self, column_params: tuple[_ColumnData, ...]):
         self._column_params = column_params
 
-    def create(self, row: Row[DATA]) -> _Row[DATA]:
-        return _Row(row, self._column_params)
+    def create(self, row: Row[DATA], marked: bool = False) -> _Row[DATA]:
+        return _Row(row, self._column_params, marked)
 
 
 def _create_row_factory(columns: tuple[Column, ...]) -> _RowFactory[DATA]:
@@ -143,6 +143,7 @@ class Table(WidgetWrap, Generic[DATA]):
                  columns: tuple[Column, ...],
                  initial_rows: tuple[Row[DATA], ...]):
         self._rows = initial_rows
+        self._marked: frozenset[UUID] = frozenset()
         self._row_factory = _create_row_factory(columns)
         self._row_list = SimpleFocusListWalker([self._create_row(row)
                                                 for row in self._rows])
@@ -158,12 +159,45 @@ class Table(WidgetWrap, Generic[DATA]):
 
         return _with_current_row_data
 
+    def with_marked_rows_data(self, callback: Callable[[tuple[DATA, ...]], None]) -> Callable[[], None]:
+        # falls back to the focused row if no rows are marked
+        def _with_marked_rows_data() -> None:
+            data = self.get_marked_data()
+            if len(data) == 0:
+                row = self.get_focused()
+                if row is not None:
+                    callback((row.data,))
+            else:
+                callback(data)
+
+        return _with_marked_rows_data
+
+    def toggle_marked(self) -> None:
+        index = self._row_list.focus
+        if index is not None:
+            row = self._rows[index]
+            self._marked = self._marked ^ {row.uuid}
+            self._row_list[index] = self._create_row(row)
+            # move on to the next row so that a run of rows can be marked quickly
+            if index < len(self._row_list) - 1:
+                self._row_list.focus = index + 1
+
+    def clear_marked(self) -> None:
+        marked = self._marked
+        self._marked = frozenset()
+        for index, row in enumerate(self._rows):
+            if row.uuid in marked:
+                self._row_list[index] = self._create_row(row)
+
+    def get_marked_data(self) -> tuple[DATA, ...]:
+        return tuple(row.data for row in self._rows if row.uuid in self._marked)
+
     def _on_focus_changed(self, index: int):
         # LOGGER.info(u'TODO: _on_focus_changed: %s' % index)
         pass
 
     def _create_row(self, row: Row[DATA]) -> _Row:
-        return self._row_factory.create(row)
+        return self._row_factory.create(row, row.uuid in self._marked)
 
     def get_focused(self) -> Row[DATA] | None:
         index = self._row_list.focus
@@ -198,6 +232,7 @@ class Table(WidgetWrap, Generic[DATA]):
             deleted = diff.get_deleted()
             for indexed_row in reversed(deleted):
                 del self._row_list[indexed_row.index]
+            self._marked = self._marked.difference(indexed_row.row.uuid for indexed_row in deleted)
             # record the currently focused item
             focused = self._get_focused_widget()
             # as dicts are ordered the added list should be in index order so this
@@ -1,20 +1,39 @@
+from typing import Any, Callable
+
 from urwid import Widget
 
+from urwid_assets.lib.redux.equality import are_items_identical
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
 from urwid_assets.lib.redux.store import Store, Unsubscribe
 from urwid_assets.ui.widgets.views.view import View
 
 
 class LinkedView(View):
-    def __init__(self, widget: Widget, store: Store):
+    def __init__(self,
+                 widget: Widget,
+                 store: Store,
+                 selectors: tuple[Callable[[Any], Any], ...] | None = None,
+                 selector_graph: SelectorGraph | None = None):
         self._active: bool = False
         self._unsubscribe: Unsubscribe | None = None
         super().__init__(widget)
         self._store = store
+        self._selectors = selectors
+        self._selector_graph = selector_graph
 
     def activate(self) -> None:
         if not self._active:
             self._active = True
-            self._unsubscribe = self._store.subscribe(self._update)
+            if self._selectors is None:
+                self._unsubscribe = self._store.subscribe(self._update)
+            elif self._selector_graph is not None and self._selector_graph.is_attached():
+                # changes are pushed through the selector graph (see --push-selectors)
+                self._unsubscribe = self._selector_graph.subscribe(self._update, self._selectors)
+            else:
+                # only update when something the view renders has changed
+                self._unsubscribe = self._store.subscribe(self._update,
+                                                          self._select_all,
+                                                          are_items_identical)
             self._update()
 
     def deactivate(self) -> None:
@@ -22,5 +41,8 @@ class LinkedView(View):
             self._unsubscribe()
             self._active = False
 
+    def _select_all(self, state: Any) -> tuple[Any, ...]:
+        return tuple(selector(state) for selector in self._selectors)
+
     def _update(self) -> None:
         pass
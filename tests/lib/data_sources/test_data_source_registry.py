@@ -0,0 +1,117 @@
+from asyncio import Future, get_running_loop, run, sleep
+from decimal import Decimal
+from uuid import uuid1
+
+from urwid_assets.lib.data_sources.data_source import DataSource
+from urwid_assets.lib.data_sources.data_source_aggregate import DataSourceAggregate
+from urwid_assets.lib.data_sources.data_source_registry import DataSourceRegistry
+from urwid_assets.lib.data_sources.models import Query, QueryResult
+from urwid_assets.lib.redux.list_reducer import EntityList
+from urwid_assets.lib.redux.reducer import Action
+from urwid_assets.lib.redux.store import Store
+from urwid_assets.selectors.selectors import select_loaded_rates
+from urwid_assets.state.saved.assets.assets import Asset
+from urwid_assets.state.saved.data_sources.data_sources import DataSourceInstance
+from urwid_assets.state.saved.rates.rates import Rate
+from urwid_assets.state.saved.saved import SET_SAVED, Saved
+from urwid_assets.state.saved.symbols.symbols import Symbol
+from urwid_assets.state.state import reducer
+
+
+class _Aggregate(DataSourceAggregate):
+    def __init__(self, batches: list[tuple[str, ...]], failing: frozenset[str]) -> None:
+        self._batches = batches
+        self._failing = failing
+        self._queries: list[tuple[Query, Future[QueryResult]]] = []
+
+    async def select(self, query: Query) -> QueryResult:
+        future = get_running_loop().create_future()
+        self._queries.append((query, future))
+        return await future
+
+    async def run(self) -> None:
+        await sleep(0)
+        self._batches.append(tuple(query.endpoint for query, _ in self._queries))
+        for query, future in self._queries:
+            future.set_result(QueryResult(error=u'failed') if query.endpoint in self._failing
+                              else QueryResult(price=Decimal(2)))
+
+
+class _DataSource(DataSource):
+    def __init__(self, failing: frozenset[str] = frozenset()) -> None:
+        self.batches: list[tuple[str, ...]] = []
+        self._failing = failing
+
+    def get_name(self) -> str:
+        return u'test'
+
+    def create_aggregate(self, config) -> DataSourceAggregate:
+        return _Aggregate(self.batches, self._failing)
+
+
+def _create_store() -> Store:
+    # the asset is in euros and the target is dollars, there is a direct rate
+    # and a more expensive path through pounds, and a rate that is not needed
+    dollars, pounds, euros, yen = (Symbol(uuid=uuid1(), name=name) for name in (u'USD', u'GBP', u'EUR', u'JPY'))
+    data_source = DataSourceInstance(uuid=uuid1(), name=u'Test', type=u'test', config=tuple())
+
+    def create_rate(name: str, cost: int, from_symbol: Symbol, to_symbol: Symbol) -> Rate:
+        return Rate(uuid=uuid1(),
+                    name=name,
+                    cost=cost,
+                    from_symbol=from_symbol.uuid,
+                    to_symbol=to_symbol.uuid,
+                    data_source=data_source.uuid,
+                    endpoint=name,
+                    config=tuple())
+
+    store = Store(reducer)
+    store.dispatch(Action(SET_SAVED, Saved(
+        data_sources=EntityList((data_source,)),
+        symbols=EntityList((dollars, pounds, euros, yen)),
+        rates=EntityList((create_rate(u'yen', 1, yen, dollars),
+                          create_rate(u'pounds', 1, pounds, dollars),
+                          create_rate(u'euros to pounds', 1, euros, pounds),
+                          create_rate(u'euros', 1, euros, dollars))),
+        assets=EntityList((Asset(uuid=uuid1(), name=u'Euros', amount=Decimal(1), symbol=euros.uuid),)),
+        snapshots=EntityList(),
+    )))
+    return store
+
+
+def _refresh_rates(store: Store, data_source: _DataSource, skip_unneeded_rates: bool) -> None:
+    registry = DataSourceRegistry(store, skip_unneeded_rates)
+    registry.register(data_source)
+    run(registry.refresh_rates())
+
+
+def test_all_rates_are_fetched_in_one_batch_with_the_needed_rates_first() -> None:
+    store = _create_store()
+    data_source = _DataSource()
+    _refresh_rates(store, data_source, False)
+    assert data_source.batches == [(u'euros', u'yen', u'pounds', u'euros to pounds')]
+    assert len(select_loaded_rates(store.get_state())) == 4
+
+
+def test_only_the_needed_rates_are_fetched_when_skipping() -> None:
+    store = _create_store()
+    data_source = _DataSource()
+    _refresh_rates(store, data_source, True)
+    assert data_source.batches == [(u'euros',)]
+
+
+def test_the_next_cheapest_path_is_fetched_when_a_needed_rate_fails() -> None:
+    store = _create_store()
+    data_source = _DataSource(frozenset((u'euros',)))
+    _refresh_rates(store, data_source, True)
+    assert data_source.batches == [(u'euros',), (u'pounds', u'euros to pounds')]
+    assert tuple(loaded_rate.error for loaded_rate in select_loaded_rates(store.get_state())) == (u'failed',
+                                                                                                  None,
+                                                                                                  None)
+
+
+def test_fetching_stops_when_there_is_no_other_path() -> None:
+    store = _create_store()
+    data_source = _DataSource(frozenset((u'euros', u'pounds')))
+    _refresh_rates(store, data_source, True)
+    assert data_source.batches == [(u'euros',), (u'pounds', u'euros to pounds')]
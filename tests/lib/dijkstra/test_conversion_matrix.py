@@ -0,0 +1,96 @@
+from decimal import Decimal
+from random import Random
+
+import pytest
+
+from urwid_assets.lib.dijkstra import conversion_matrix
+from urwid_assets.lib.dijkstra.conversion_matrix import ConversionMatrix
+from urwid_assets.lib.dijkstra.dijkstra import Edge
+
+_UNIT = Decimal(1)
+_SYMBOLS = 15
+
+
+def _random_edge(random: Random) -> Edge:
+    return Edge(source=random.randrange(_SYMBOLS),
+                target=random.randrange(_SYMBOLS),
+                cost=random.choice((0, 1, 1, 2, 3)),
+                ref=Decimal(random.randint(1, 9)))
+
+
+def _change(random: Random, edges: tuple[Edge | None, ...]) -> tuple[Edge | None, ...]:
+    changed = list(edges)
+    for _ in range(random.randint(1, 3)):
+        key = random.randrange(len(changed))
+        edge = changed[key]
+        choice = random.random()
+        if choice < 0.3:
+            changed[key] = None
+        elif choice < 0.6 and edge is not None:
+            # a new rate for the same pair
+            changed[key] = Edge(source=edge.source, target=edge.target, cost=edge.cost,
+                                ref=Decimal(random.randint(1, 9)))
+        else:
+            changed[key] = _random_edge(random)
+    return tuple(changed)
+
+
+def test_factors_convert_to_the_target_along_the_shortest_path() -> None:
+    edges = (
+        Edge(source='BTC', target='USD', cost=1, ref=Decimal(20000)),
+        Edge(source='EUR', target='USD', cost=1, ref=Decimal(2)),
+        None,
+        Edge(source='BTC', target='EUR', cost=3, ref=Decimal(1)),
+    )
+    matrix = ConversionMatrix(edges, _UNIT)
+    assert matrix.get_factors('EUR') == {'EUR': _UNIT, 'USD': Decimal('0.5'), 'BTC': Decimal(10000)}
+    assert matrix.get_factor('BTC', 'USD') == Decimal(20000)
+    assert matrix.get_factor('GBP', 'USD') is None
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_updated_matrices_match_matrices_built_from_scratch(seed: int) -> None:
+    random = Random(seed)
+    edges = tuple(_random_edge(random) if random.random() < 0.7 else None for _ in range(30))
+    matrix = ConversionMatrix(edges, _UNIT)
+    targets = random.sample(range(_SYMBOLS), 3)
+    for _ in range(50):
+        previous = {target: matrix.get_factors(target) for target in targets}
+        copies = {target: dict(factors) for target, factors in previous.items()}
+        edges = _change(random, edges)
+        matrix = matrix.update(edges)
+        fresh = ConversionMatrix(edges, _UNIT)
+        for target in targets:
+            assert matrix.get_factors(target) == fresh.get_factors(target)
+            # the factors of the previous matrix are shared and left as they were
+            assert previous[target] == copies[target]
+
+
+def test_many_changes_start_again() -> None:
+    random = Random(1)
+    edges = tuple(_random_edge(random) for _ in range(100))
+    matrix = ConversionMatrix(edges, _UNIT)
+    matrix.get_factors(0)
+    edges = tuple(_random_edge(random) for _ in range(100))
+    assert matrix.update(edges).get_factors(0) == ConversionMatrix(edges, _UNIT).get_factors(0)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_vectorized_paths_match_dijkstra(seed: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip('numpy')
+    random = Random(seed)
+    edges = tuple(_random_edge(random) if random.random() < 0.9 else None for _ in range(40))
+    expected = {target: ConversionMatrix(edges, _UNIT).get_factors(target) for target in range(_SYMBOLS)}
+    monkeypatch.setattr(conversion_matrix, '_VECTORIZE_THRESHOLD', 0)
+    matrix = ConversionMatrix(edges, _UNIT)
+    for target in range(_SYMBOLS):
+        assert matrix.get_factors(target) == expected[target]
+    # trees that were built from the vectorized paths can still be repaired
+    for _ in range(20):
+        edges = _change(random, edges)
+        matrix = matrix.update(edges)
+        monkeypatch.setattr(conversion_matrix, '_VECTORIZE_THRESHOLD', len(edges) + 1)
+        fresh = ConversionMatrix(edges, _UNIT)
+        monkeypatch.setattr(conversion_matrix, '_VECTORIZE_THRESHOLD', 0)
+        for target in range(_SYMBOLS):
+            assert matrix.get_factors(target) == fresh.get_factors(target)
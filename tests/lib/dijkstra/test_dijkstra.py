@@ -0,0 +1,57 @@
+from random import Random
+
+from urwid_assets.lib.dijkstra.dijkstra import Queue, QueueEntry
+
+
+def _drain(queue: Queue) -> list[tuple[int, str]]:
+    popped = []
+    while queue.is_not_empty():
+        entry = queue.pop()
+        popped.append((entry.cost, entry.key))
+    return popped
+
+
+def test_entries_are_popped_cheapest_first() -> None:
+    queue = Queue()
+    for cost, key in ((3, 'c'), (1, 'a'), (2, 'b')):
+        queue.add(QueueEntry(cost, key))
+    assert _drain(queue) == [(1, 'a'), (2, 'b'), (3, 'c')]
+
+
+def test_ties_are_popped_last_in_first_out() -> None:
+    queue = Queue()
+    for key in ('a', 'b', 'c'):
+        queue.add(QueueEntry(1, key))
+    assert _drain(queue) == [(1, 'c'), (1, 'b'), (1, 'a')]
+
+
+def test_replaced_entries_are_skipped() -> None:
+    queue = Queue()
+    queue.add(QueueEntry(5, 'a'))
+    queue.add(QueueEntry(3, 'b'))
+    queue.replace(QueueEntry(1, 'a'))
+    queue.replace(QueueEntry(4, 'b'))
+    assert _drain(queue) == [(1, 'a'), (4, 'b')]
+    assert not queue.is_not_empty()
+
+
+def test_a_popped_key_can_be_added_again() -> None:
+    queue = Queue()
+    queue.add(QueueEntry(1, 'a'))
+    queue.pop()
+    queue.add(QueueEntry(2, 'a'))
+    assert _drain(queue) == [(2, 'a')]
+
+
+def test_random_replacements_match_a_sorted_list() -> None:
+    random = Random(1)
+    queue = Queue()
+    latest = {}
+    for _ in range(2000):
+        key = random.randrange(200)
+        cost = random.randrange(1000)
+        queue.replace(QueueEntry(cost, key))
+        latest[key] = cost
+    popped = _drain(queue)
+    assert sorted(cost for cost, _ in popped) == [cost for cost, _ in popped]
+    assert dict((key, cost) for cost, key in popped) == latest
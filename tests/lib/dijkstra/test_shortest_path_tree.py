@@ -0,0 +1,72 @@
+from random import Random
+
+import pytest
+
+from urwid_assets.lib.dijkstra.dijkstra import Edge
+from urwid_assets.lib.dijkstra.shortest_path_tree import Graph, ShortestPathTree
+
+_NODES = 12
+
+
+def _random_edge(random: Random, key: int) -> Edge:
+    return Edge(source=random.randrange(_NODES),
+                target=random.randrange(_NODES),
+                cost=random.choice((0, 1, 1, 2, 3)),
+                ref=key)
+
+
+def _assert_same_tree(tree: ShortestPathTree, graph: Graph, source: int) -> None:
+    fresh = ShortestPathTree(graph, source)
+    for node in range(_NODES):
+        assert tree.get_distance(node) == fresh.get_distance(node)
+        assert tree.get_parent(node) == fresh.get_parent(node)
+        assert tree.get_children(node) == fresh.get_children(node)
+
+
+def test_paths_are_found_by_cost_then_steps_then_edge_key() -> None:
+    graph = Graph()
+    graph.add(3, Edge(source=0, target=1, cost=2, ref='a'))
+    graph.add(2, Edge(source=0, target=2, cost=1, ref='b'))
+    graph.add(1, Edge(source=2, target=1, cost=1, ref='c'))
+    graph.add(0, Edge(source=1, target=0, cost=2, ref='d'))
+    tree = ShortestPathTree(graph, 0)
+    # both edges from 0 are one step with cost 2, so the lowest key wins
+    # over the two step path with the same cost
+    assert tree.get_distance(1) == (2, 1)
+    assert tree.get_parent(1) == (0, graph.get_edge(0))
+    assert tree.get_children(0) == {1, 2}
+    assert tree.get_distance(3) is None
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_repaired_trees_match_trees_built_from_scratch(seed: int) -> None:
+    random = Random(seed)
+    graph = Graph()
+    keys = []
+    for key in range(20):
+        graph.add(key, _random_edge(random, key))
+        keys.append(key)
+    trees = {source: ShortestPathTree(graph, source) for source in range(3)}
+    next_key = len(keys)
+    for _ in range(100):
+        choice = random.random()
+        if choice < 0.4 and len(keys) > 0:
+            key = keys.pop(random.randrange(len(keys)))
+            edge = graph.remove(key)
+            for tree in trees.values():
+                tree.removed(key, edge)
+        elif choice < 0.6 and len(keys) > 0:
+            key = random.choice(keys)
+            edge = graph.get_edge(key)
+            graph.replace(key, Edge(source=edge.target, target=edge.source, cost=edge.cost, ref=-key))
+            for tree in trees.values():
+                tree.replaced(key)
+        else:
+            key = next_key
+            next_key += 1
+            graph.add(key, _random_edge(random, key))
+            keys.append(key)
+            for tree in trees.values():
+                tree.added(key)
+        for source, tree in trees.items():
+            _assert_same_tree(tree, graph, source)
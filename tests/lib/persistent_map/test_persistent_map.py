@@ -0,0 +1,80 @@
+from random import Random
+
+from urwid_assets.lib.persistent_map.persistent_map import PersistentMap
+
+
+class _Key:
+    # keys with few distinct hashes so that some share the whole hash
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def __hash__(self) -> int:
+        return self.value % 7
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Key) and other.value == self.value
+
+    def __repr__(self) -> str:
+        return '_Key(%d)' % self.value
+
+
+def _assert_same(persistent_map: PersistentMap, model: dict) -> None:
+    assert len(persistent_map) == len(model)
+    assert dict(persistent_map.items()) == model
+    for key, value in model.items():
+        assert key in persistent_map
+        assert persistent_map.get(key) == value
+
+
+def test_reads_like_a_dict() -> None:
+    persistent_map = PersistentMap((('a', 1), ('b', 2), ('a', 3)))
+    assert len(persistent_map) == 2
+    assert persistent_map.get('a') == 3
+    assert persistent_map.get('c') is None
+    assert persistent_map.get('c', 4) == 4
+    assert 'b' in persistent_map
+    assert sorted(persistent_map) == ['a', 'b']
+
+
+def test_deleting_a_missing_key_returns_the_same_map() -> None:
+    persistent_map = PersistentMap((('a', 1),))
+    assert persistent_map.delete('b') is persistent_map
+
+
+def test_edits_match_a_dict_and_leave_earlier_versions_alone() -> None:
+    random = Random(1)
+    model = {}
+    persistent_map = PersistentMap()
+    versions = []
+    for step in range(5000):
+        key = random.randrange(1000)
+        if random.random() < 0.3:
+            model.pop(key, None)
+            persistent_map = persistent_map.delete(key)
+        else:
+            model[key] = step
+            persistent_map = persistent_map.set(key, step)
+        if step % 500 == 0:
+            versions.append((persistent_map, dict(model)))
+    _assert_same(persistent_map, model)
+    for version, version_model in versions:
+        _assert_same(version, version_model)
+
+
+def test_keys_with_the_same_hash() -> None:
+    random = Random(2)
+    model = {}
+    persistent_map = PersistentMap()
+    for step in range(2000):
+        key = _Key(random.randrange(50))
+        if random.random() < 0.4:
+            model.pop(key, None)
+            persistent_map = persistent_map.delete(key)
+        else:
+            model[key] = step
+            persistent_map = persistent_map.set(key, step)
+        _assert_same(persistent_map, model)
+    for key in list(model):
+        persistent_map = persistent_map.delete(key)
+    assert len(persistent_map) == 0
+    assert tuple(persistent_map.items()) == tuple()
@@ -0,0 +1,92 @@
+from bisect import bisect_left
+from random import Random
+
+import pytest
+
+from urwid_assets.lib.persistent_vector.persistent_vector import PersistentVector, _iter_leaves, _BRANCHING
+
+
+@pytest.mark.parametrize('length', (0, 1, _BRANCHING - 1, _BRANCHING, _BRANCHING + 1, 1000, _BRANCHING ** 3 + 1))
+def test_reads_like_a_tuple(length: int) -> None:
+    items = tuple(range(length))
+    vector = PersistentVector(items)
+    assert len(vector) == length
+    assert tuple(vector) == items
+    assert tuple(reversed(vector)) == tuple(reversed(items))
+    for index in (0, length // 3, length - 1, -1, -length):
+        if length > 0:
+            assert vector[index] == items[index]
+    with pytest.raises(IndexError):
+        _ = vector[length]
+    assert tuple(vector[1:length:3]) == items[1:length:3]
+    assert vector == PersistentVector(items)
+    assert hash(vector) == hash(PersistentVector(items))
+
+
+def test_edits_match_a_list_and_leave_earlier_versions_alone() -> None:
+    random = Random(1)
+    model = list(range(2000))
+    vector = PersistentVector(model)
+    versions = [(vector, tuple(model))]
+    for step in range(3000):
+        operation = random.choice(('set', 'insert', 'delete', 'append', 'move'))
+        if operation == 'set':
+            index = random.randrange(len(model))
+            model[index] = -step
+            vector = vector.set(index, -step)
+        elif operation == 'insert':
+            index = random.randint(0, len(model))
+            model.insert(index, -step)
+            vector = vector.insert(index, -step)
+        elif operation == 'delete':
+            index = random.randrange(len(model))
+            del model[index]
+            vector = vector.delete(index)
+        elif operation == 'append':
+            model.append(-step)
+            vector = vector.append(-step)
+        else:
+            index = random.randrange(len(model))
+            to = random.randrange(len(model))
+            model.insert(to, model.pop(index))
+            vector = vector.move(index, to)
+        if step % 100 == 0:
+            assert tuple(vector) == tuple(model)
+            versions.append((vector, tuple(model)))
+    assert tuple(vector) == tuple(model)
+    for version, items in versions:
+        assert tuple(version) == items
+
+
+def test_move_to_the_same_index_returns_the_same_vector() -> None:
+    vector = PersistentVector(range(100))
+    assert vector.move(10, 10) is vector
+    assert tuple(vector.move(-1, 0)) == (99,) + tuple(range(99))
+
+
+def test_deleting_everything_leaves_an_empty_vector() -> None:
+    vector = PersistentVector(range(_BRANCHING * 3))
+    while len(vector) > 0:
+        vector = vector.delete(len(vector) // 2)
+    assert tuple(vector) == tuple()
+    assert vector.append(1)[0] == 1
+
+
+def test_small_leaves_are_merged() -> None:
+    # delete all but 4 items from each of the full leaves, without merging
+    # there would still be as many (mostly empty) leaves
+    leaves = _BRANCHING
+    vector = PersistentVector(range(leaves * _BRANCHING))
+    for leaf in range(leaves):
+        for _ in range(_BRANCHING - 4):
+            vector = vector.delete(leaf * 4)
+    assert tuple(vector) == tuple(item for item in range(leaves * _BRANCHING) if item % _BRANCHING >= _BRANCHING - 4)
+    assert len(tuple(_iter_leaves(vector._root))) <= leaves * 4 // _BRANCHING + 1
+
+
+@pytest.mark.parametrize('length', (0, 1, _BRANCHING, _BRANCHING ** 2 + 5))
+def test_bisect_left_matches_the_bisect_module(length: int) -> None:
+    items = tuple(range(0, length * 3, 3))
+    vector = PersistentVector(items)
+    for value in range(-1, length * 3 + 2):
+        assert vector.bisect_left(value) == bisect_left(items, value)
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+
+import pytest
+
+from urwid_assets.lib.redux import dispatch_timer
+from urwid_assets.lib.redux.dispatch_timer import DispatchTimer
+from urwid_assets.lib.redux.reducer import Action, ActionTypeFactory, ReducerMapping, combine_reducers, \
+    create_reducer
+from urwid_assets.lib.redux.store import Store, StoreOptions
+
+_ACTION_TYPE_FACTORY = ActionTypeFactory(__name__)
+
+SET_A = _ACTION_TYPE_FACTORY.create('SET_A')
+SET_B = _ACTION_TYPE_FACTORY.create('SET_B')
+
+
+@dataclass(frozen=True)
+class _Inner:
+    b: int
+
+
+@dataclass(frozen=True)
+class _State:
+    a: int
+    inner: _Inner
+
+
+class _Clock:
+    # time only passes when the reducers and subscribers spend it
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def spend(self, elapsed: float) -> None:
+        self.now += elapsed
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(dispatch_timer, 'perf_counter', clock)
+    return clock
+
+
+def _create_store(clock: _Clock, timer: DispatchTimer) -> Store:
+    def set_a(_: int, action: Action) -> int:
+        clock.spend(0.001)
+        return action.payload
+
+    def set_b(_: int, action: Action) -> int:
+        clock.spend(0.003)
+        return action.payload
+
+    reducer = combine_reducers(_State, (
+        ReducerMapping('a', create_reducer({SET_A: set_a})),
+        ReducerMapping('inner', combine_reducers(_Inner, (
+            ReducerMapping('b', create_reducer({SET_B: set_b})),
+        ))),
+    ))
+    return Store(reducer, _State(0, _Inner(0)), StoreOptions(middleware=(timer,)))
+
+
+def test_reducers_are_timed_by_their_field_path(clock: _Clock) -> None:
+    timer = DispatchTimer()
+    store = _create_store(clock, timer)
+    store.dispatch(Action(SET_A, 1))
+    store.dispatch(Action(SET_A, 2))
+    store.dispatch(Action(SET_B, 3))
+    assert store.get_state() == _State(2, _Inner(3))
+    assert timer.get_report() == (
+        u'%s.SET_B: 1 dispatches, reduce 3.000ms, 1 notifications, fan out 0.000ms' % __name__,
+        u'  reducer inner.b 3.000ms',
+        u'  reducer inner 3.000ms',
+        u'%s.SET_A: 2 dispatches, reduce 2.000ms, 2 notifications, fan out 0.000ms' % __name__,
+        u'  reducer a 2.000ms',
+    )
+
+
+def test_subscribers_are_timed_against_the_action_that_notified_them(clock: _Clock) -> None:
+    timer = DispatchTimer()
+    store = _create_store(clock, timer)
+
+    def render() -> None:
+        clock.spend(0.004)
+
+    def log() -> None:
+        clock.spend(0.001)
+
+    store.subscribe(render)
+    store.subscribe(log, lambda state: state.inner)
+    store.dispatch(Action(SET_A, 1))
+    store.dispatch(Action(SET_B, 2))
+    assert timer.get_report() == (
+        u'%s.SET_B: 1 dispatches, reduce 3.000ms, 1 notifications, fan out 5.000ms' % __name__,
+        u'  reducer inner.b 3.000ms',
+        u'  reducer inner 3.000ms',
+        u'  subscriber %s 4.000ms' % render.__qualname__,
+        u'  subscriber %s 1.000ms' % log.__qualname__,
+        u'%s.SET_A: 1 dispatches, reduce 1.000ms, 1 notifications, fan out 4.000ms' % __name__,
+        u'  reducer a 1.000ms',
+        u'  subscriber %s 4.000ms' % render.__qualname__,
+        # the selected value did not change so log was not called
+        u'  subscriber %s 0.000ms' % log.__qualname__,
+    )
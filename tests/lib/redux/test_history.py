@@ -0,0 +1,86 @@
+from decimal import Decimal
+from uuid import uuid1
+
+from urwid_assets.lib.redux.history import History
+from urwid_assets.lib.redux.list_reducer import EntityList
+from urwid_assets.lib.redux.reducer import Action
+from urwid_assets.lib.redux.store import Store, StoreOptions
+from urwid_assets.selectors.selectors import select_saved, select_snapshots
+from urwid_assets.state.saved.saved import SET_SAVED, Saved
+from urwid_assets.state.saved.snapshots.snapshots import ADD_SNAPSHOT, DELETE_SNAPSHOT, Snapshot, SnapshotAsset
+from urwid_assets.state.state import reducer
+
+_BUDGET = 1024 * 1024
+
+
+def _create_snapshot(assets: int) -> Snapshot:
+    return Snapshot(uuid=uuid1(),
+                    name=u'Snapshot',
+                    assets=EntityList(SnapshotAsset(uuid=uuid1(),
+                                                    name=u'Asset %d' % index,
+                                                    amount=Decimal(index),
+                                                    rate=Decimal('1.5')) for index in range(assets)),
+                    timestamp=None)
+
+
+def _create_store(history: History, snapshots: int, assets: int) -> Store:
+    store = Store(reducer, options=StoreOptions(middleware=(history,)))
+    store.dispatch(Action(SET_SAVED, Saved(data_sources=EntityList(),
+                                           symbols=EntityList(),
+                                           rates=EntityList(),
+                                           assets=EntityList(),
+                                           snapshots=EntityList(_create_snapshot(assets)
+                                                                for _ in range(snapshots)))))
+    return store
+
+
+def _create_history(budget: int = _BUDGET) -> History:
+    return History(select_saved, lambda saved: Action(SET_SAVED, saved), budget, barriers=(SET_SAVED,))
+
+
+def test_small_edits_to_a_large_state_are_all_kept() -> None:
+    # the state is many times the budget but the edits only change a little of it
+    history = _create_history()
+    store = _create_store(history, 10, 5000)
+    for _ in range(50):
+        store.dispatch(Action(ADD_SNAPSHOT, _create_snapshot(1)))
+    assert history.get_undo_depth() == 50
+    assert history.get_retained_size() < _BUDGET // 10
+
+
+def test_oldest_entries_are_dropped_to_fit_the_budget() -> None:
+    history = _create_history()
+    store = _create_store(history, 20, 1000)
+    # each entry is charged for the snapshot that has since been deleted
+    for snapshot in select_snapshots(store.get_state()):
+        store.dispatch(Action(DELETE_SNAPSHOT, snapshot))
+    assert 1 < history.get_undo_depth() < 20
+    assert history.get_retained_size() <= _BUDGET
+
+
+def test_the_latest_entry_is_kept_when_it_does_not_fit_the_budget() -> None:
+    history = _create_history(0)
+    store = _create_store(history, 0, 0)
+    store.dispatch(Action(ADD_SNAPSHOT, _create_snapshot(1)), Action(ADD_SNAPSHOT, _create_snapshot(1)))
+    assert history.get_undo_depth() == 1
+    history.undo()
+    assert len(select_snapshots(store.get_state())) == 1
+
+
+def test_undo_and_redo_move_the_charge_between_the_stacks() -> None:
+    history = _create_history()
+    store = _create_store(history, 1, 100)
+    saved = select_saved(store.get_state())
+    store.dispatch(Action(ADD_SNAPSHOT, _create_snapshot(100)))
+    edited = select_saved(store.get_state())
+    charged = history.get_retained_size()
+    history.undo()
+    assert select_saved(store.get_state()) is saved
+    assert history.get_undo_depth() == 0
+    # the redo entry holds the added snapshot that the current value does not
+    assert history.get_retained_size() > charged
+    history.redo()
+    assert select_saved(store.get_state()) is edited
+    assert history.get_retained_size() == charged
+    history.clear()
+    assert history.get_retained_size() == 0
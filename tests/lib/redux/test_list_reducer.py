@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from random import Random
+from uuid import uuid1
+
+from urwid_assets.lib.redux.list_reducer import ListItem, EntityList, move_items_to, move_item_up, move_item_down, \
+    remove_item, replace_item, append_item, get_list_index
+
+
+@dataclass(frozen=True)
+class _Item(ListItem):
+    name: str
+
+
+def _create_items(count: int) -> tuple[_Item, ...]:
+    return tuple(_Item(uuid=uuid1(), name=str(index)) for index in range(count))
+
+
+def _get_names(items: EntityList[_Item]) -> tuple[str, ...]:
+    return tuple(item.name for item in items)
+
+
+def test_edits_by_position() -> None:
+    a, b, c, d = _create_items(4)
+    items = EntityList((a, b, c))
+    assert _get_names(items.append(d)) == ('0', '1', '2', '3')
+    assert _get_names(items.insert(1, d)) == ('0', '3', '1', '2')
+    assert _get_names(items.remove(0)) == ('1', '2')
+    assert _get_names(items.move(0, 2)) == ('1', '2', '0')
+    assert _get_names(items.replace(1, _Item(uuid=b.uuid, name='x'))) == ('0', 'x', '2')
+    assert _get_names(items) == ('0', '1', '2')
+    assert items.get_ids() == (a.uuid, b.uuid, c.uuid)
+    assert items == EntityList((a, b, c))
+    assert _get_names(items[1:]) == ('1', '2')
+
+
+def test_lookups_follow_the_edits() -> None:
+    a, b, c, d = _create_items(4)
+    items = EntityList((a, b, c))
+    assert items.get_index(c.uuid) == 2
+    # the index has been built so it is carried over to the derived lists
+    inserted = items.insert(0, d)
+    removed = items.remove(0)
+    moved = items.move(2, 0)
+    assert (inserted.get_index(d.uuid), inserted.get_index(c.uuid)) == (0, 3)
+    assert (removed.get_index(a.uuid), removed.get_index(c.uuid)) == (None, 1)
+    assert (moved.get_index(c.uuid), moved.get_index(a.uuid), moved.get_index(b.uuid)) == (0, 1, 2)
+    assert items.get_index(c.uuid) == 2
+    assert items.get_item(d.uuid) is None
+
+
+def test_lookups_after_many_edits() -> None:
+    # enough edits for the index to be rebuilt several times, and every
+    # version keeps answering for its own items
+    random = Random(1)
+    model = list(_create_items(500))
+    items = EntityList(model)
+    versions = []
+    for step in range(2000):
+        operation = random.choice(('append', 'insert', 'remove', 'move', 'replace'))
+        if operation == 'append':
+            item = _Item(uuid=uuid1(), name=str(step))
+            model.append(item)
+            items = items.append(item)
+        elif operation == 'insert':
+            item = _Item(uuid=uuid1(), name=str(step))
+            index = random.randint(0, len(model))
+            model.insert(index, item)
+            items = items.insert(index, item)
+        elif operation == 'remove':
+            index = random.randrange(len(model))
+            del model[index]
+            items = items.remove(index)
+        elif operation == 'move':
+            index = random.randrange(len(model))
+            to = random.randrange(len(model))
+            model.insert(to, model.pop(index))
+            items = items.move(index, to)
+        else:
+            index = random.randrange(len(model))
+            model[index] = _Item(uuid=model[index].uuid, name=str(step))
+            items = items.replace(index, model[index])
+        item = random.choice(model)
+        assert items.get_index(item.uuid) == model.index(item)
+        if step % 200 == 0:
+            versions.append((items, tuple(model)))
+    for version, version_model in versions:
+        for index, item in enumerate(version_model):
+            assert version.get_index(item.uuid) == index
+            assert version.get_item(item.uuid) is item
+
+
+def test_lookups_after_the_labels_run_out() -> None:
+    # inserting in the same place halves the gap between the labels each
+    # time until there is none left and the index has to be built again
+    model = list(_create_items(3))
+    items = EntityList(model)
+    assert items.get_index(model[2].uuid) == 2
+    for step in range(100):
+        item = _Item(uuid=uuid1(), name='new %d' % step)
+        model.insert(1, item)
+        items = items.insert(1, item)
+        assert items.get_index(item.uuid) == 1
+        assert items.get_index(model[-1].uuid) == len(model) - 1
+    replaced = _Item(uuid=model[50].uuid, name='replaced')
+    items = replace_item(replaced, items)
+    assert items.get_item(replaced.uuid) is replaced
+    for index, item in enumerate(model):
+        assert items.get_index(item.uuid) == index
+
+
+def test_item_helpers() -> None:
+    a, b, c = _create_items(3)
+    items = EntityList((a, b))
+    assert _get_names(append_item(c, items)) == ('0', '1', '2')
+    assert remove_item(c, items) is items
+    assert _get_names(remove_item(a, items)) == ('1',)
+    assert _get_names(replace_item(_Item(uuid=a.uuid, name='x'), items)) == ('x', '1')
+    assert _get_names(move_item_up(b, items)) == ('1', '0')
+    assert move_item_up(a, items) is items
+    assert _get_names(move_item_down(a, items)) == ('1', '0')
+    assert move_item_down(b, items) is items
+    # plain tuples are accepted too
+    assert get_list_index((a, b), b.uuid) == 1
+
+
+def test_move_items_to() -> None:
+    a, b, c, d, e = _create_items(5)
+    items = EntityList((a, b, c, d, e))
+    # the index is a position in the list without the moved items
+    assert _get_names(move_items_to((b, d), 0, items)) == ('1', '3', '0', '2', '4')
+    assert _get_names(move_items_to((b, d), 2, items)) == ('0', '2', '1', '3', '4')
+    assert _get_names(move_items_to((b, d), 3, items)) == ('0', '2', '4', '1', '3')
+    assert _get_names(move_items_to((d, b), 10, items)) == ('0', '2', '4', '3', '1')
+    assert _get_names(move_items_to((_Item(uuid=uuid1(), name='x'), a), 1, items)) == ('1', '0', '2', '3', '4')
@@ -0,0 +1,149 @@
+import logging
+from asyncio import new_event_loop, AbstractEventLoop
+from concurrent.futures import Executor, Future
+from typing import Any, Callable
+
+import pytest
+
+from urwid_assets.lib.redux.offload import Offloader
+from urwid_assets.lib.redux.reducer import Action
+from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions, OffloadOptions, set_selector_offloader
+from urwid_assets.lib.redux.store import Store, StoreOptions
+
+
+class _Executor(Executor):
+    # holds the submitted calls until the test runs them
+    def __init__(self) -> None:
+        self.pending: list[tuple[Future, Callable, tuple[Any, ...]]] = []
+        self.submitted = 0
+        self.cancelled = False
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        future = Future()
+        self.pending.append((future, fn, args))
+        self.submitted += 1
+        return future
+
+    def run(self) -> None:
+        pending = self.pending
+        self.pending = []
+        for future, fn, args in pending:
+            try:
+                future.set_result(fn(*args))
+            except Exception as error:
+                future.set_exception(error)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self.cancelled = cancel_futures
+
+
+def _reducer(state: int | None, action: Action) -> int:
+    return 0 if state is None else state
+
+
+def _double(value: int) -> int:
+    if value < 0:
+        raise ValueError(value)
+    return value * 2
+
+
+@pytest.fixture
+def executor() -> _Executor:
+    return _Executor()
+
+
+@pytest.fixture
+def loop() -> AbstractEventLoop:
+    loop = new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def store(executor: _Executor, loop: AbstractEventLoop) -> Store:
+    offloader = Offloader(executor)
+    previous = set_selector_offloader(offloader)
+    yield Store(_reducer, options=StoreOptions(middleware=(offloader,)), loop=loop)
+    set_selector_offloader(previous)
+
+
+def _create_selector():
+    return create_selector((lambda state: state,), _double,
+                           SelectorOptions(offload=OffloadOptions(placeholder=lambda _: u'loading')))
+
+
+def _run(loop: AbstractEventLoop, test: Callable[[], None]) -> None:
+    # the results are only offloaded while the store's loop is running
+    async def run() -> None:
+        test()
+
+    loop.run_until_complete(run())
+
+
+def test_the_placeholder_is_returned_until_the_result_is_applied(store: Store,
+                                                                 executor: _Executor,
+                                                                 loop: AbstractEventLoop) -> None:
+    select = _create_selector()
+    notified = []
+    store.subscribe(lambda: notified.append(True))
+
+    def test() -> None:
+        assert select(1) == u'loading'
+        # the same arguments are not offloaded again while they are pending
+        assert select(1) == u'loading'
+        assert executor.submitted == 1
+        executor.run()
+        # the result is applied by an action so the subscribers are notified
+        assert notified == [True]
+        assert select(1) == 2
+        assert executor.submitted == 1
+
+    _run(loop, test)
+
+
+def test_the_last_result_is_returned_while_the_next_is_pending(store: Store,
+                                                               executor: _Executor,
+                                                               loop: AbstractEventLoop) -> None:
+    select = _create_selector()
+
+    def test() -> None:
+        select(1)
+        executor.run()
+        assert select(2) == 2
+        executor.run()
+        assert select(2) == 4
+        assert executor.submitted == 2
+
+    _run(loop, test)
+
+
+def test_a_failure_is_logged_and_the_current_value_is_kept(store: Store,
+                                                           executor: _Executor,
+                                                           loop: AbstractEventLoop,
+                                                           caplog: pytest.LogCaptureFixture) -> None:
+    select = _create_selector()
+
+    def test() -> None:
+        select(1)
+        executor.run()
+        assert select(-1) == 2
+        executor.run()
+        assert [record.getMessage() for record in caplog.records] == ['offloaded selector failed']
+        # the arguments are not offloaded again until they change
+        assert select(-1) == 2
+        assert executor.submitted == 2
+
+    caplog.set_level(logging.ERROR, logger='urwid_assets.lib.redux.offload')
+    _run(loop, test)
+
+
+def test_results_are_computed_in_place_without_a_running_loop(store: Store, executor: _Executor) -> None:
+    select = _create_selector()
+    assert select(1) == 2
+    assert select(2) == 4
+    assert executor.submitted == 0
+
+
+def test_shutting_down_cancels_the_pending_results(executor: _Executor) -> None:
+    Offloader(executor).shutdown()
+    assert executor.cancelled
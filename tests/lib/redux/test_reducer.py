@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+
+from urwid_assets.lib.redux.reducer import Action, ActionTypeFactory, ReducerMapping, combine_reducers, \
+    create_reducer, INIT_ACTION
+
+_ACTION_TYPE_FACTORY = ActionTypeFactory(__name__)
+
+SET_A = _ACTION_TYPE_FACTORY.create('SET_A')
+SET_B = _ACTION_TYPE_FACTORY.create('SET_B')
+OTHER = _ACTION_TYPE_FACTORY.create('OTHER')
+
+
+@dataclass(frozen=True)
+class _State:
+    a: int
+    b: int
+    calls: tuple[str, ...]
+
+
+def _create_reducer():
+    calls = []
+
+    def reduce_a(state: int | None, action: Action) -> int:
+        calls.append('a')
+        if state is None:
+            return 0
+        if action.type == SET_A:
+            return action.payload
+        return state
+
+    reduce_b = create_reducer({
+        SET_B: lambda state, action: action.payload,
+    })
+    reducer = combine_reducers(_State, (
+        ReducerMapping('a', reduce_a),
+        ReducerMapping('b', reduce_b),
+        ReducerMapping('calls', lambda state, _: tuple() if state is None else state),
+    ))
+    return reducer, calls
+
+
+def test_the_state_is_kept_when_no_field_changes() -> None:
+    reducer, _ = _create_reducer()
+    state = reducer(None, INIT_ACTION)
+    assert reducer(state, Action(OTHER)) is state
+    assert reducer(state, Action(SET_A, 0)) is state
+
+
+def test_only_the_changed_fields_are_replaced() -> None:
+    reducer, _ = _create_reducer()
+    state = reducer(None, INIT_ACTION)
+    changed = reducer(state, Action(SET_B, 2))
+    assert changed is not state
+    assert (changed.a, changed.b) == (0, 2)
+    assert changed.calls is state.calls
+    assert reducer(changed, Action(SET_A, 1)) == _State(1, 2, tuple())
+
+
+def test_routed_reducers_only_see_their_own_actions() -> None:
+    reducer, calls = _create_reducer()
+    state = reducer(None, INIT_ACTION)
+    calls.clear()
+    reducer(state, Action(SET_B, 2))
+    reducer(state, Action(SET_A, 1))
+    # the plain function reducer sees everything
+    assert calls == ['a', 'a']
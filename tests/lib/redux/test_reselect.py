@@ -0,0 +1,278 @@
+import gc
+import logging
+import sys
+from weakref import ref
+
+import pytest
+
+from urwid_assets.lib.redux.equality import are_items_equal
+from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions, SelectorCacheOptions, \
+    create_parameterized_selector, set_selector_cache_budget
+
+
+class _Value:
+    # counts how many times it is hashed
+    def __init__(self, value: int) -> None:
+        self.value = value
+        self.hashes = 0
+
+    def __hash__(self) -> int:
+        self.hashes += 1
+        return hash(self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Value) and other.value == self.value
+
+
+def _create_counted_selector(options: SelectorOptions = SelectorOptions()):
+    calls = []
+
+    def select(value: _Value) -> int:
+        calls.append(value.value)
+        return value.value * 2
+
+    return create_selector((lambda state: state,), select, options), calls
+
+
+def test_arguments_are_matched_by_identity_without_hashing() -> None:
+    selector, calls = _create_counted_selector()
+    value = _Value(1)
+    assert selector(value) == 2
+    assert selector(value) == 2
+    assert value.hashes == 0
+    # equal but not the same object
+    assert selector(_Value(1)) == 2
+    assert calls == [1, 1]
+
+
+def test_arguments_can_be_matched_by_value() -> None:
+    selector, calls = _create_counted_selector(SelectorOptions(cache=SelectorCacheOptions(identity=False)))
+    assert selector(_Value(1)) == 2
+    assert selector(_Value(1)) == 2
+    assert calls == [1]
+
+
+def test_weak_caches_do_not_keep_arguments_alive() -> None:
+    selector, calls = _create_counted_selector(SelectorOptions(cache=SelectorCacheOptions(weak=True)))
+    value = _Value(1)
+    selector(value)
+    collected = []
+    value_ref = ref(value, lambda _: collected.append(True))
+    del value
+    gc.collect()
+    assert collected == [True]
+    assert value_ref() is None
+    # a new argument that happens to reuse the id is not a hit
+    assert selector(_Value(3)) == 6
+    assert calls == [1, 3]
+
+
+def test_the_level_1_cache_keeps_the_most_recently_used_results() -> None:
+    selector, calls = _create_counted_selector(SelectorOptions(cache=SelectorCacheOptions(capacity=2)))
+    a, b, c = _Value(1), _Value(2), _Value(3)
+    selector(a)
+    selector(b)
+    selector(a)
+    selector(c)
+    # b was least recently used so it was evicted
+    selector(a)
+    selector(c)
+    selector(b)
+    assert calls == [1, 2, 3, 2]
+    stats = selector.get_cache_stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (3, 4, 2)
+
+
+@pytest.mark.parametrize('options', ({'capacity': 0}, {'capacity': -1}, {'max_age': -1}))
+def test_a_cache_must_hold_at_least_one_result(options: dict) -> None:
+    with pytest.raises(AssertionError):
+        SelectorCacheOptions(**options)
+
+
+def test_a_cache_with_a_capacity_of_1_keeps_the_latest_result() -> None:
+    selector, calls = _create_counted_selector(SelectorOptions(cache=SelectorCacheOptions(max_age=2, capacity=1)))
+    a, b = _Value(1), _Value(2)
+    selector(a)
+    selector(a)
+    selector(b)
+    selector(b)
+    assert calls == [1, 2]
+    assert selector.get_cache_stats().evictions == 1
+
+
+def test_the_default_cache_only_keeps_the_latest_result() -> None:
+    selector, calls = _create_counted_selector()
+    a, b = _Value(1), _Value(2)
+    selector(a)
+    selector(b)
+    selector(a)
+    assert calls == [1, 2, 1]
+
+
+@pytest.mark.parametrize('max_age, recomputed', ((0, [1]), (1, [])))
+def test_mapped_results_are_kept_for_max_age_recomputations(max_age: int, recomputed: list[int]) -> None:
+    calls = []
+
+    def select(value: _Value) -> int:
+        calls.append(value.value)
+        return value.value
+
+    selector = create_selector((lambda state: state,), select,
+                               SelectorOptions(dimensions=(1,), cache=SelectorCacheOptions(max_age=max_age)))
+    a, b, c = _Value(1), _Value(2), _Value(3)
+    assert selector((a, b)) == (1, 2)
+    assert selector((b, c)) == (2, 3)
+    # a was last used in the computation before last
+    assert selector((a, b, c)) == (1, 2, 3)
+    assert calls == [1, 2, 3] + recomputed
+
+
+def _create_mapped_selectors():
+    # the same selection through the fast path for mapping over the first
+    # argument and through the general arguments tree (mapping the second)
+    calls = {'map': [], 'tree': []}
+
+    def create_select(name: str):
+        def select(item: _Value, offset: int) -> int:
+            calls[name].append(item.value)
+            return item.value + offset
+
+        return select
+
+    select_map = create_selector((lambda state: state[0], lambda state: state[1]), create_select('map'),
+                                 SelectorOptions(dimensions=(1,)))
+    select_tree_reversed = create_selector((lambda state: state[1], lambda state: state[0]),
+                                           lambda offset, item: create_select('tree')(item, offset),
+                                           SelectorOptions(dimensions=(0, 1)))
+    return select_map, select_tree_reversed, calls
+
+
+def test_mapping_the_first_argument_matches_the_general_path() -> None:
+    select_map, select_tree, calls = _create_mapped_selectors()
+    items = tuple(_Value(index) for index in range(5))
+    states = (
+        (items, 10),
+        (items[:2] + (_Value(7),) + items[3:], 10),
+        (items[1:], 10),
+        (tuple(), 10),
+        (items, 20),
+    )
+    for state in states:
+        assert select_map(state) == select_tree(state)
+    # only the changed item is recomputed, then the item that was dropped
+    # the time before and then everything when the offset changes
+    assert calls['map'] == calls['tree'] == [0, 1, 2, 3, 4, 7, 2, 0, 1, 2, 3, 4]
+
+
+def test_mapping_two_dimensions() -> None:
+    selector = create_selector((lambda state: state[0], lambda state: state[1]),
+                               lambda a, b: a * b,
+                               SelectorOptions(dimensions=(1, 1)))
+    assert selector(((1, 2), (3, 4, 5))) == ((3, 4, 5), (6, 8, 10))
+
+
+def test_equal_results_are_cut_off() -> None:
+    select_map = create_selector((lambda state: state,), lambda item: item.value,
+                                 SelectorOptions(dimensions=(1,), equality=are_items_equal))
+    select = create_selector((lambda state: state,), lambda items: tuple(item.value for item in items),
+                             SelectorOptions(equality=are_items_equal))
+    for selector in (select_map, select):
+        first = selector((_Value(1), _Value(2)))
+        # new arguments but the same values, so the same result
+        assert selector((_Value(1), _Value(2))) is first
+        changed = selector((_Value(1), _Value(3)))
+        assert changed == (1, 3)
+        assert changed is not first
+
+
+def _create_parameterized_selector(capacity: int):
+    created = []
+
+    def create(index: int):
+        created.append(index)
+        return create_selector((lambda state: state[index],), lambda item: (index, item.value))
+
+    return create_parameterized_selector(create, capacity), created
+
+
+def test_a_parameterized_selector_is_created_once_per_key() -> None:
+    select, created = _create_parameterized_selector(2)
+    assert select(0) is select(0)
+    assert select(1) is not select(0)
+    assert created == [0, 1]
+
+
+def test_the_least_recently_used_parameterized_selector_is_dropped() -> None:
+    select, created = _create_parameterized_selector(2)
+    first = select(0)
+    select(1)
+    # using 0 again makes 1 the least recently used
+    assert select(0) is first
+    select(2)
+    assert select(0) is first
+    assert created == [0, 1, 2]
+    select(1)
+    assert created == [0, 1, 2, 1]
+
+
+def test_parameterized_selectors_keep_their_own_results() -> None:
+    select, _ = _create_parameterized_selector(2)
+    state = (_Value(1), _Value(2))
+    first = select(0)(state)
+    second = select(1)(state)
+    assert (first, second) == ((0, 1), (1, 2))
+    # each key has its own cache so selecting one does not replace the other
+    assert select(0)(state) is first
+    assert select(1)(state) is second
+    changed = (_Value(1), _Value(3))
+    assert select(1)(changed) == (1, 3)
+    assert select(0)(changed) == (0, 1)
+    assert select(0)(changed) is select(0)(changed)
+
+
+@pytest.fixture
+def no_budget() -> None:
+    yield
+    set_selector_cache_budget(None)
+
+
+def test_the_budget_evicts_the_least_recently_used_results(no_budget: None,
+                                                           caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.DEBUG, logger='urwid_assets.lib.redux.reselect')
+    # evict whatever other tests have left so that only these results are counted
+    set_selector_cache_budget(0)
+    caplog.clear()
+    selector, calls = _create_counted_selector(SelectorOptions(cache=SelectorCacheOptions(capacity=4)))
+    set_selector_cache_budget(None)
+    a, b, c = _Value(1), _Value(2), _Value(3)
+    for value in (a, b, c, a, b, c):
+        selector(value)
+    assert calls == [1, 2, 3]
+    set_selector_cache_budget(0)
+    assert [record.getMessage() for record in caplog.records] == [
+        'evicted 2 selector cache entries (%d bytes) to stay within 0 bytes' % (sys.getsizeof(2) + sys.getsizeof(4)),
+    ]
+    # the latest result is in use and is kept whatever the budget
+    selector(c)
+    assert calls == [1, 2, 3]
+    selector(a)
+    selector(b)
+    assert calls == [1, 2, 3, 1, 2]
+
+
+class _Result:
+    pass
+
+
+def test_weak_caches_release_the_results_of_collected_arguments() -> None:
+    selector = create_selector((lambda state: state,), lambda _: _Result(),
+                               SelectorOptions(cache=SelectorCacheOptions(capacity=4, weak=True)))
+    a, b = _Value(1), _Value(2)
+    result_ref = ref(selector(a))
+    selector(b)
+    assert result_ref() is not None
+    del a
+    gc.collect()
+    # the result is released the next time that the cache is used
+    selector(b)
+    assert result_ref() is None
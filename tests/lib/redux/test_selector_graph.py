@@ -0,0 +1,70 @@
+from urwid_assets.lib.redux.dispatch_timer import DispatchTimer
+from urwid_assets.lib.redux.reducer import Action, ActionTypeFactory
+from urwid_assets.lib.redux.reselect import create_selector
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
+from urwid_assets.lib.redux.store import Store, StoreOptions, Middleware, NextNotify
+
+_ACTION_TYPE_FACTORY = ActionTypeFactory(__name__)
+
+INCREMENT = _ACTION_TYPE_FACTORY.create('INCREMENT')
+
+
+def _reducer(state: int | None, action: Action) -> int:
+    if state is None:
+        return 0
+    if action.type == INCREMENT:
+        return state + 1
+    return state
+
+
+def _select_state(state: int) -> int:
+    return state
+
+
+_select_even = create_selector((_select_state,), lambda state: state % 2 == 0)
+
+
+class _Recorder(Middleware):
+    def __init__(self) -> None:
+        self.names: list[str] = []
+
+    def notify_subscriber(self, name: str, next_notify: NextNotify) -> None:
+        self.names.append(name)
+        next_notify()
+
+
+def _update() -> None:
+    pass
+
+
+def test_subscribers_are_only_notified_of_changes() -> None:
+    selector_graph = SelectorGraph()
+    store = Store(_reducer, options=StoreOptions(middleware=(selector_graph,)))
+    notified = []
+    unsubscribe = selector_graph.subscribe(lambda: notified.append(store.get_state()), (_select_even,))
+    store.dispatch(Action(INCREMENT))
+    store.dispatch(Action(INCREMENT))
+    assert notified == [1, 2]
+    unsubscribe()
+    assert selector_graph.get_node_count() == 0
+    store.dispatch(Action(INCREMENT))
+    assert notified == [1, 2]
+
+
+def test_subscribers_are_notified_through_the_middleware() -> None:
+    recorder = _Recorder()
+    selector_graph = SelectorGraph()
+    store = Store(_reducer, options=StoreOptions(middleware=(recorder, selector_graph)))
+    selector_graph.subscribe(_update, (_select_even,))
+    store.subscribe(_update)
+    store.dispatch(Action(INCREMENT))
+    assert recorder.names == [_update.__qualname__, _update.__qualname__]
+
+
+def test_subscriber_time_is_reported_by_the_dispatch_timer() -> None:
+    dispatch_timer = DispatchTimer()
+    selector_graph = SelectorGraph()
+    store = Store(_reducer, options=StoreOptions(middleware=(dispatch_timer, selector_graph)))
+    selector_graph.subscribe(_update, (_select_even,))
+    store.dispatch(Action(INCREMENT))
+    assert any(line.startswith(u'  subscriber %s ' % _update.__qualname__) for line in dispatch_timer.get_report())
@@ -0,0 +1,74 @@
+import pytest
+
+from urwid_assets.lib.redux import reselect
+from urwid_assets.lib.redux.reselect import create_selector, SelectorOptions, set_selector_tracer
+from urwid_assets.lib.redux.selector_registry import SelectorRegistry
+
+
+class _Clock:
+    # time only passes when the selectors spend it
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def spend(self, elapsed: float) -> None:
+        self.now += elapsed
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(reselect, 'perf_counter', clock)
+    return clock
+
+
+@pytest.fixture
+def selector_registry() -> SelectorRegistry:
+    selector_registry = SelectorRegistry()
+    previous = set_selector_tracer(selector_registry)
+    yield selector_registry
+    set_selector_tracer(previous)
+
+
+def test_calls_hit_rates_and_compute_time_are_reported(clock: _Clock, selector_registry: SelectorRegistry) -> None:
+    def double(value: int) -> int:
+        clock.spend(0.002)
+        return value * 2
+
+    def total(values: tuple[int, ...]) -> int:
+        clock.spend(0.001)
+        return sum(values)
+
+    select_doubled = create_selector((lambda state: state,), double,
+                                     SelectorOptions(dimensions=(1,), name=u'doubled'))
+    select_total = create_selector((select_doubled,), total, SelectorOptions(name=u'total'))
+    state = (1, 2, 3)
+    assert select_total(state) == 12
+    assert select_total(state) == 12
+    # one item changes so only it is doubled again
+    assert select_total((1, 2, 4)) == 14
+    assert selector_registry.get_report() == (
+        u'doubled: 3 calls, level 1 hits 33%, level 2 hits 33%, compute 8.000ms, last size 3',
+        u'total: 3 calls, level 1 hits 33%, level 2 hits 0%, compute 2.000ms, last size -',
+    )
+
+
+def test_selectors_with_the_same_name_are_reported_together(clock: _Clock,
+                                                            selector_registry: SelectorRegistry) -> None:
+    def create() -> reselect.MemoizedSelector:
+        def name(value: str) -> str:
+            clock.spend(0.003)
+            return value.upper()
+
+        return create_selector((lambda state: state,), name)
+
+    first = create()
+    second = create()
+    first(u'a')
+    second(u'a')
+    second(u'a')
+    report = selector_registry.get_report()
+    assert len(report) == 1
+    assert report[0].endswith(u'3 calls, level 1 hits 33%, level 2 hits 0%, compute 6.000ms, last size -')
@@ -0,0 +1,210 @@
+import logging
+from asyncio import new_event_loop, sleep
+from threading import get_ident
+
+import pytest
+
+from urwid_assets.lib.redux.equality import is_equal
+from urwid_assets.lib.redux.reducer import Action, ActionTypeFactory
+from urwid_assets.lib.redux.store import Store, StoreOptions, CoalesceOptions, Middleware, NextReduce, NextNotify
+
+_ACTION_TYPE_FACTORY = ActionTypeFactory(__name__)
+
+INCREMENT = _ACTION_TYPE_FACTORY.create('INCREMENT')
+SET = _ACTION_TYPE_FACTORY.create('SET')
+FAIL = _ACTION_TYPE_FACTORY.create('FAIL')
+
+
+def _reducer(state: int | None, action: Action) -> int:
+    if state is None:
+        return 0
+    if action.type == INCREMENT:
+        return state + 1
+    if action.type == SET:
+        return action.payload
+    if action.type == FAIL:
+        raise ValueError(action.payload)
+    return state
+
+
+def test_flush_delivers_a_notification_held_back_when_the_loop_stops() -> None:
+    loop = new_event_loop()
+    store = Store(_reducer, options=StoreOptions(coalesce=CoalesceOptions(window=60.0)))
+    notified = []
+    store.subscribe(lambda: notified.append(store.get_state()))
+
+    async def edit_and_exit() -> None:
+        store.dispatch(Action(INCREMENT))
+        store.dispatch(Action(INCREMENT))
+
+    loop.run_until_complete(edit_and_exit())
+    assert notified == []
+    store.flush()
+    assert notified == [2]
+    # nothing is left to be run when the loop next runs
+    loop.run_until_complete(sleep(0))
+    store.flush()
+    assert notified == [2]
+    loop.close()
+
+
+def test_dispatches_in_one_iteration_are_coalesced() -> None:
+    loop = new_event_loop()
+    store = Store(_reducer, options=StoreOptions(coalesce=CoalesceOptions()))
+    notified = []
+    store.subscribe(lambda: notified.append(store.get_state()))
+
+    async def edit() -> None:
+        for _ in range(3):
+            store.dispatch(Action(INCREMENT))
+        assert notified == []
+        await sleep(0.01)
+        assert notified == [3]
+        store.dispatch(Action(INCREMENT))
+        await sleep(0.01)
+
+    loop.run_until_complete(edit())
+    assert notified == [3, 4]
+    assert store.get_folded_notifications() == 2
+    loop.close()
+
+
+def test_without_a_running_loop_coalesced_notifications_are_immediate() -> None:
+    store = Store(_reducer, options=StoreOptions(coalesce=CoalesceOptions()))
+    notified = []
+    store.subscribe(lambda: notified.append(store.get_state()))
+    store.dispatch(Action(INCREMENT))
+    store.dispatch(Action(INCREMENT))
+    assert notified == [1, 2]
+
+
+def _create_ordering_store(options: StoreOptions) -> tuple[Store, list[str]]:
+    # the first subscriber dispatches another action the first time it is
+    # notified, every subscriber should see the first action before the
+    # second is reduced
+    store = Store(_reducer, options=options)
+    events = []
+
+    def first() -> None:
+        events.append('first %d' % store.get_state())
+        if store.get_state() == 1:
+            store.dispatch(Action(INCREMENT))
+            events.append('dispatched')
+
+    store.subscribe(first)
+    store.subscribe(lambda: events.append('second %d' % store.get_state()))
+    return store, events
+
+
+def test_actions_dispatched_by_subscribers_are_queued() -> None:
+    store, events = _create_ordering_store(StoreOptions(queue=True))
+    store.dispatch(Action(INCREMENT))
+    assert events == ['first 1', 'dispatched', 'second 1', 'first 2', 'second 2']
+
+
+def test_actions_dispatched_by_subscribers_are_queued_when_coalescing() -> None:
+    loop = new_event_loop()
+    store, events = _create_ordering_store(StoreOptions(queue=True, coalesce=CoalesceOptions()))
+
+    async def edit() -> None:
+        store.dispatch(Action(INCREMENT))
+        await sleep(0.01)
+
+    loop.run_until_complete(edit())
+    assert events == ['first 1', 'dispatched', 'second 1', 'first 2', 'second 2']
+    loop.close()
+
+
+def test_actions_dispatched_by_middleware_while_reducing_are_queued() -> None:
+    class Echo(Middleware):
+        def __init__(self) -> None:
+            self.store = None
+            self.reduced = []
+
+        def attach(self, store: Store) -> None:
+            self.store = store
+
+        def reduce(self, action: Action, next_reduce: NextReduce) -> None:
+            next_reduce(action)
+            self.reduced.append(action.payload)
+            if action.payload == 'first':
+                self.store.dispatch(Action(INCREMENT, 'second'))
+
+        def notify(self, actions: tuple[Action, ...], next_notify: NextNotify) -> None:
+            self.reduced.append(tuple(action.payload for action in actions))
+            next_notify()
+
+    echo = Echo()
+    store = Store(_reducer, options=StoreOptions(queue=True, middleware=(echo,)))
+    store.dispatch(Action(INCREMENT, 'first'))
+    assert store.get_state() == 2
+    # both are reduced before a single notification
+    assert echo.reduced == ['first', 'second', ('first', 'second')]
+
+
+def test_actions_dispatched_from_other_threads_are_reduced_on_the_loop() -> None:
+    loop = new_event_loop()
+    store = Store(_reducer, options=StoreOptions(queue=True), loop=loop)
+    threads = []
+    store.subscribe(lambda: threads.append(get_ident()))
+
+    async def edit() -> None:
+        await loop.run_in_executor(None, store.dispatch, Action(INCREMENT))
+        await sleep(0)
+
+    loop.run_until_complete(edit())
+    assert store.get_state() == 1
+    assert threads == [get_ident()]
+    loop.close()
+
+
+def _select_parity(state: int) -> list[str]:
+    # a new (equal but not identical) value each time
+    return [u'odd' if state % 2 else u'even']
+
+
+def test_selector_subscriptions_are_only_notified_when_the_selected_value_changes() -> None:
+    store = Store(_reducer)
+    notified = []
+    store.subscribe(lambda: notified.append(store.get_state()), _select_parity, is_equal)
+    for action in (Action(INCREMENT), Action(SET, 3), Action(SET, 5), Action(SET, 6), Action(SET, 8)):
+        store.dispatch(action)
+    assert notified == [1, 6]
+
+
+def test_selector_subscriptions_compare_by_identity_by_default() -> None:
+    store = Store(_reducer)
+    notified = []
+    store.subscribe(lambda: notified.append(store.get_state()), _select_parity)
+    store.dispatch(Action(SET, 2))
+    store.dispatch(Action(SET, 4))
+    assert notified == [2, 4]
+
+
+def test_selector_subscriptions_start_from_the_value_when_subscribed() -> None:
+    store = Store(_reducer, initial_state=2)
+    store.dispatch(Action(SET, 3))
+    notified = []
+    store.subscribe(lambda: notified.append(store.get_state()), _select_parity, is_equal)
+    # the value was already odd when subscribed
+    store.dispatch(Action(SET, 5))
+    assert notified == []
+    store.dispatch(Action(SET, 4))
+    assert notified == [4]
+
+
+def test_a_failing_action_is_dropped_and_the_rest_of_the_queue_is_reduced(caplog: pytest.LogCaptureFixture) -> None:
+    store = Store(_reducer, options=StoreOptions(queue=True))
+    notified = []
+    store.subscribe(lambda: notified.append(store.get_state()))
+    with caplog.at_level(logging.ERROR), pytest.raises(ValueError, match='first'):
+        store.dispatch(Action(INCREMENT), Action(FAIL, 'first'), Action(INCREMENT), Action(FAIL, 'second'))
+    assert store.get_state() == 2
+    assert notified == [2]
+    assert [record.getMessage() for record in caplog.records] == [
+        'dropped action %s.FAIL, 2 actions still queued' % __name__,
+        'dropped action %s.FAIL, 0 actions still queued' % __name__,
+    ]
+    # the store is left ready for the next dispatch
+    store.dispatch(Action(INCREMENT))
+    assert notified == [2, 3]
@@ -0,0 +1,120 @@
+from dataclasses import replace
+from decimal import Decimal
+from uuid import uuid1
+
+import pytest
+
+from urwid_assets.lib.dijkstra.conversion_matrix import ConversionMatrix
+from urwid_assets.lib.redux.list_reducer import EntityList
+from urwid_assets.selectors.selectors import select_assets_with_rates, select_conversion_factors, \
+    select_conversion_matrix
+from urwid_assets.state.saved.assets.assets import Asset
+from urwid_assets.state.saved.rates.rates import Rate
+from urwid_assets.state.saved.saved import Saved
+from urwid_assets.state.saved.symbols.symbols import Symbol
+from urwid_assets.state.state import State
+from urwid_assets.state.ui.ui import UI, LoadedRate
+
+GBP = Symbol(uuid=uuid1(), name=u'GBP')
+EUR = Symbol(uuid=uuid1(), name=u'EUR')
+USD = Symbol(uuid=uuid1(), name=u'USD')
+BTC = Symbol(uuid=uuid1(), name=u'BTC')
+JPY = Symbol(uuid=uuid1(), name=u'JPY')
+XAU = Symbol(uuid=uuid1(), name=u'XAU')
+CHF = Symbol(uuid=uuid1(), name=u'CHF')
+
+
+def _create_rate(from_symbol: Symbol, to_symbol: Symbol, cost: int = 1) -> Rate:
+    return Rate(uuid=uuid1(),
+                name=u'%s/%s' % (from_symbol.name, to_symbol.name),
+                cost=cost,
+                from_symbol=from_symbol.uuid,
+                to_symbol=to_symbol.uuid,
+                data_source=uuid1(),
+                endpoint=u'',
+                config=tuple())
+
+
+def _create_state(btc_usd: Decimal = Decimal('30000.5')) -> State:
+    rates = (
+        (_create_rate(BTC, USD), btc_usd),
+        (_create_rate(USD, EUR), Decimal('0.9')),
+        (_create_rate(EUR, GBP), Decimal('0.85')),
+        # a direct rate that costs more than the three hops
+        (_create_rate(BTC, GBP, 10), Decimal('1')),
+        # the rate is inverted when converting from the target symbol
+        (_create_rate(GBP, JPY), Decimal('190')),
+        # CHF is not reachable as its rate failed to load
+        (_create_rate(CHF, GBP), None),
+    )
+    assets = tuple(Asset(uuid=uuid1(), name=symbol.name, amount=Decimal(1), symbol=symbol.uuid)
+                   for symbol in (GBP, EUR, USD, BTC, JPY, XAU, CHF))
+    return State(
+        saved=Saved(
+            data_sources=EntityList(),
+            symbols=EntityList((GBP, EUR, USD, BTC, JPY, XAU, CHF)),
+            rates=EntityList(rate for rate, _ in rates),
+            assets=EntityList(assets),
+            snapshots=EntityList(),
+        ),
+        ui=UI(
+            target_symbol=GBP.uuid,
+            loaded_rates=EntityList(LoadedRate(uuid=rate.uuid, rate=value, error=None if value else u'failed')
+                                    for rate, value in rates),
+        ),
+    )
+
+
+def test_assets_are_valued_along_the_cheapest_paths_to_the_target_symbol() -> None:
+    state = _create_state()
+    # worked out by hand, the products are exact but 1/190
+    # is rounded to the 28 significant digits of the context
+    assert select_conversion_factors(state) == {
+        GBP.uuid: Decimal('1'),
+        EUR.uuid: Decimal('0.85'),
+        USD.uuid: Decimal('0.765'),
+        BTC.uuid: Decimal('22950.3825'),
+        JPY.uuid: Decimal('0.005263157894736842105263157895'),
+    }
+    assert tuple((asset.name, factor) for asset, factor in select_assets_with_rates(state)) == (
+        (u'GBP', Decimal('1')),
+        (u'EUR', Decimal('0.85')),
+        (u'USD', Decimal('0.765')),
+        (u'BTC', Decimal('22950.3825')),
+        (u'JPY', Decimal('0.005263157894736842105263157895')),
+        # no rates lead to these so they have no value
+        (u'XAU', None),
+        (u'CHF', None),
+    )
+
+
+def _set_loaded_rate(state: State, index: int, value: Decimal) -> State:
+    loaded_rates = state.ui.loaded_rates
+    loaded_rate = replace(loaded_rates[index], rate=value)
+    return replace(state, ui=replace(state.ui, loaded_rates=loaded_rates.replace(index, loaded_rate)))
+
+
+def test_each_store_updates_its_own_conversion_matrix(monkeypatch: pytest.MonkeyPatch) -> None:
+    updated_from = []
+    update = ConversionMatrix.update
+
+    def record_update(matrix: ConversionMatrix, edges: tuple) -> ConversionMatrix:
+        updated_from.append(matrix)
+        return update(matrix, edges)
+
+    monkeypatch.setattr(ConversionMatrix, 'update', record_update)
+    # the states of two stores with different rates
+    first = _create_state()
+    second = _create_state(Decimal('40000'))
+    first_matrix = select_conversion_matrix(first)
+    second_matrix = select_conversion_matrix(second)
+    # switching back finds the matrix for the first store's edges
+    assert select_conversion_matrix(first) is first_matrix
+    # a rate is reloaded in the first store
+    first = _set_loaded_rate(first, 1, Decimal('0.95'))
+    assert select_conversion_factors(first)[USD.uuid] == Decimal('0.8075')
+    assert updated_from[-1] is first_matrix
+    # the second store carries on from its own matrix
+    second = _set_loaded_rate(second, 1, Decimal('0.8'))
+    assert select_conversion_factors(second)[BTC.uuid] == Decimal('27200')
+    assert updated_from[-1] is second_matrix
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from urwid_assets.lib.redux.reducer import Action, INIT_ACTION, ActionTypeFactory
+from urwid_assets.state.state import reducer
+from urwid_assets.state.ui.ui import SET_LAST_UPDATE_TIME
+
+_UNHANDLED = ActionTypeFactory(__name__).create('UNHANDLED')
+
+
+def test_ui_actions_keep_the_saved_state() -> None:
+    state = reducer(None, INIT_ACTION)
+    changed = reducer(state, Action(SET_LAST_UPDATE_TIME, datetime.now()))
+    assert changed is not state
+    assert changed.saved is state.saved
+    assert reducer(changed, Action(_UNHANDLED)) is changed
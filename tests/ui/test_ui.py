@@ -0,0 +1,68 @@
+from asyncio import new_event_loop
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid1
+
+import pytest
+
+from urwid_assets.lib.redux.offload import Offloader
+from urwid_assets.lib.redux.reducer import Action
+from urwid_assets.lib.redux.reselect import set_selector_offloader
+from urwid_assets.lib.redux.store import Store, StoreOptions, CoalesceOptions
+from urwid_assets.state.saved.symbols.symbols import ADD_SYMBOL, Symbol
+from urwid_assets.state.state import reducer
+
+# the UI is imported through the CLI, which needs the (untracked) API keys for the data sources
+pytest.importorskip('urwid_assets.cli')
+from urwid_assets.ui import ui  # noqa: E402
+
+
+class _UIView:
+    def activate(self) -> None:
+        pass
+
+
+def test_an_edit_made_just_before_quitting_is_notified(monkeypatch: pytest.MonkeyPatch) -> None:
+    loop = new_event_loop()
+    store = Store(reducer, options=StoreOptions(coalesce=CoalesceOptions()))
+    notified = []
+    store.subscribe(lambda: notified.append(store.get_state()))
+
+    class MainLoop:
+        def __init__(self, *_, **__) -> None:
+            pass
+
+        def run(self) -> None:
+            async def edit_and_quit() -> None:
+                store.dispatch(Action(ADD_SYMBOL, Symbol(uuid=uuid1(), name=u'Symbol')))
+
+            loop.run_until_complete(edit_and_quit())
+
+    monkeypatch.setattr(ui, 'MainLoop', MainLoop)
+    ui.UI(_UIView(), store, loop, Offloader(ThreadPoolExecutor(max_workers=1)))
+    assert notified == [store.get_state()]
+    loop.close()
+
+
+def test_the_offloader_is_only_installed_while_the_ui_runs(monkeypatch: pytest.MonkeyPatch) -> None:
+    loop = new_event_loop()
+    store = Store(reducer)
+    executor = ThreadPoolExecutor(max_workers=1)
+    offloader = Offloader(executor)
+    installed = []
+
+    class MainLoop:
+        def __init__(self, *_, **__) -> None:
+            pass
+
+        def run(self) -> None:
+            installed.append(set_selector_offloader(None))
+            set_selector_offloader(installed[0])
+
+    monkeypatch.setattr(ui, 'MainLoop', MainLoop)
+    ui.UI(_UIView(), store, loop, offloader)
+    assert installed == [offloader]
+    assert set_selector_offloader(None) is None
+    # the executor has been shut down so nothing more can be offloaded
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+    loop.close()
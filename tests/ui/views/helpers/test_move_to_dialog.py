@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+
+import pytest
+
+from uuid import uuid1
+
+from urwid_assets.lib.redux.list_reducer import ListItem, EntityList, move_items_to
+from urwid_assets.ui.views.helpers.move_to_dialog import get_move_to_choices
+
+
+@dataclass(frozen=True)
+class _Item(ListItem):
+    name: str
+
+
+def _create_items(names: str) -> EntityList[_Item]:
+    return EntityList(tuple(_Item(uuid=uuid1(), name=name) for name in names))
+
+
+def _get_name(item: _Item) -> str:
+    return item.name
+
+
+def _get_names(items: EntityList[_Item]) -> str:
+    return u''.join(item.name for item in items)
+
+
+def test_the_moved_items_are_left_out_of_the_choices() -> None:
+    items = _create_items(u'abcde')
+    assert get_move_to_choices(items, (items[3], items[1]), _get_name) == ((u'a', u'c', u'e', u'[End]'), 2)
+    assert get_move_to_choices(items, (items[4],), _get_name) == ((u'a', u'b', u'c', u'd', u'[End]'), 4)
+
+
+@pytest.mark.parametrize('marked, choice, expected', (
+        # moving down
+        (u'a', u'd', u'bcade'),
+        (u'a', u'[End]', u'bcdea'),
+        (u'ab', u'e', u'cdabe'),
+        (u'ab', u'[End]', u'cdeab'),
+        (u'bd', u'e', u'acbde'),
+        # moving up
+        (u'd', u'a', u'dabce'),
+        (u'de', u'b', u'adebc'),
+        (u'eb', u'a', u'ebacd'),
+        # staying put
+        (u'c', u'd', u'abcde'),
+        (u'ce', u'd', u'abced'),
+))
+def test_the_chosen_index_moves_the_items_in_front_of_the_choice(marked: str, choice: str, expected: str) -> None:
+    items = _create_items(u'abcde')
+    by_name = dict((item.name, item) for item in items)
+    marked_items = tuple(by_name[name] for name in marked)
+    entries, selected = get_move_to_choices(items, marked_items, _get_name)
+    index = entries.index(choice)
+    assert _get_names(move_items_to(marked_items, index, items)) == expected
+
+
+@pytest.mark.parametrize('marked, expected', (
+        (u'a', u'abcde'),
+        (u'c', u'abcde'),
+        (u'e', u'abcde'),
+        (u'bd', u'abdce'),
+        (u'db', u'acdbe'),
+))
+def test_the_selected_choice_moves_the_first_item_nowhere(marked: str, expected: str) -> None:
+    items = _create_items(u'abcde')
+    by_name = dict((item.name, item) for item in items)
+    marked_items = tuple(by_name[name] for name in marked)
+    _, selected = get_move_to_choices(items, marked_items, _get_name)
+    assert _get_names(move_items_to(marked_items, selected, items)) == expected
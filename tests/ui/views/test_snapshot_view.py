@@ -0,0 +1,73 @@
+from decimal import Decimal
+from uuid import uuid1
+
+import pytest
+from urwid import Text
+
+from urwid_assets.lib.redux.history import History
+from urwid_assets.lib.redux.list_reducer import EntityList
+from urwid_assets.lib.redux.reducer import Action
+from urwid_assets.lib.redux.selector_graph import SelectorGraph
+from urwid_assets.lib.redux.store import Store, StoreOptions
+from urwid_assets.selectors.selectors import select_saved, select_snapshots
+from urwid_assets.state.saved.saved import SET_SAVED
+from urwid_assets.state.saved.snapshots.snapshots import ADD_SNAPSHOT, Snapshot, SnapshotAsset
+from urwid_assets.state.state import reducer
+from urwid_assets.ui.views.snapshot_view import SnapshotView
+from urwid_assets.ui.widgets.views.view import View
+from urwid_assets.ui.widgets.views.view_manager import ViewManager
+
+_SIZE = (80, 24)
+
+
+def _create_snapshot() -> Snapshot:
+    return Snapshot(uuid=uuid1(),
+                    name=u'Snapshot',
+                    assets=EntityList((SnapshotAsset(uuid=uuid1(),
+                                                     name=u'Asset',
+                                                     amount=Decimal(2),
+                                                     rate=Decimal(3)),)),
+                    timestamp=None)
+
+
+@pytest.mark.parametrize('push_selectors', (False, True))
+def test_undoing_add_snapshot_while_it_is_viewed_closes_the_view(push_selectors: bool) -> None:
+    history = History(select_saved, lambda saved: Action(SET_SAVED, saved), 1024 * 1024, barriers=(SET_SAVED,))
+    selector_graph = SelectorGraph()
+    store = Store(reducer,
+                  options=StoreOptions(middleware=(history,) + ((selector_graph,) if push_selectors else tuple())))
+    snapshot = _create_snapshot()
+    store.dispatch(Action(ADD_SNAPSHOT, snapshot))
+    closed = []
+    view = SnapshotView(store,
+                        history,
+                        selector_graph,
+                        ViewManager(View(Text(u''))),
+                        None,
+                        snapshot.uuid,
+                        lambda: closed.append(True))
+    view.activate()
+    assert view.keypress(_SIZE, 'u') is None
+    assert len(select_snapshots(store.get_state())) == 0
+    assert closed == [True]
+    view.deactivate()
+
+
+def test_undoing_other_changes_leaves_the_view_open() -> None:
+    history = History(select_saved, lambda saved: Action(SET_SAVED, saved), 1024 * 1024, barriers=(SET_SAVED,))
+    store = Store(reducer, options=StoreOptions(middleware=(history,)))
+    snapshot = _create_snapshot()
+    store.dispatch(Action(ADD_SNAPSHOT, snapshot), Action(ADD_SNAPSHOT, _create_snapshot()))
+    closed = []
+    view = SnapshotView(store,
+                        history,
+                        SelectorGraph(),
+                        ViewManager(View(Text(u''))),
+                        None,
+                        snapshot.uuid,
+                        lambda: closed.append(True))
+    view.activate()
+    history.undo()
+    assert tuple(item.uuid for item in select_snapshots(store.get_state())) == (snapshot.uuid,)
+    assert closed == []
+    view.deactivate()